@@ -391,6 +391,17 @@ fi
 # Create data directory
 mkdir -p "$INSTALL_DIR/data"
 
+# Bundle Chart.js locally so the dashboard charts also work offline
+CHART_JS_URL="https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js"
+VENDOR_DIR="$INSTALL_DIR/src/static/vendor"
+mkdir -p "$VENDOR_DIR"
+if curl -sSfL "$CHART_JS_URL" -o "$VENDOR_DIR/chart.umd.min.js.tmp"; then
+    mv "$VENDOR_DIR/chart.umd.min.js.tmp" "$VENDOR_DIR/chart.umd.min.js"
+else
+    rm -f "$VENDOR_DIR/chart.umd.min.js.tmp"
+    echo -e "${YELLOW}Warning: Could not download Chart.js, the dashboard will load it from the CDN${NC}"
+fi
+
 # Create systemd service
 echo -e "${BLUE}[6/7] Setting up classification service...${NC}"
 
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Timing trace analyser.
+
+Reads the service's trace log (--trace-file, including its rotated
+backups) and prints latency percentiles per stage, then per species, so
+a slow model load, a slow decode or a slow file lookup for one species
+stands out. Uses only the standard library.
+
+Usage:
+    python analyze_trace.py [/opt/birdnet-vocalization/data/trace.jsonl] [--species "Turdus merula"] [--top 20]
+"""
+
+import argparse
+import json
+import math
+import sys
+from collections import Counter
+from pathlib import Path
+
+DEFAULT_TRACE = Path("/opt/birdnet-vocalization/data/trace.jsonl")
+# Pipeline order; other stages are listed after these
+STAGE_ORDER = [
+    "file_resolution", "cache_lookup", "throttle", "decode", "mel", "resize",
+    "model_load", "inference", "classify", "db_write", "total",
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def trace_files(path: Path) -> list[Path]:
+    """The trace file and its rotated backups, oldest first."""
+    backups = sorted(
+        (p for p in path.parent.glob(path.name + ".*") if p.suffix[1:].isdigit()),
+        key=lambda p: int(p.suffix[1:]), reverse=True
+    )
+    return backups + ([path] if path.exists() else [])
+
+
+def read_records(path: Path, species: str | None = None) -> list[dict]:
+    records = []
+    for file in trace_files(path):
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # partial line from a crash or rotation
+                if species is None or record.get("species", "").lower() == species.lower():
+                    records.append(record)
+    return records
+
+
+def stage_table(records: list[dict]):
+    values = {}
+    for record in records:
+        for stage, seconds in record.get("timings", {}).items():
+            if isinstance(seconds, (int, float)):
+                values.setdefault(stage, []).append(seconds)
+    stages = [s for s in STAGE_ORDER if s in values] + sorted(s for s in values if s not in STAGE_ORDER)
+
+    print(f"  {'stage':<16} {'n':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} {'total s':>9}")
+    for stage in stages:
+        v = values[stage]
+        print(
+            f"  {stage:<16} {len(v):>7} {percentile(v, 50) * 1000:>9.1f} {percentile(v, 90) * 1000:>9.1f} "
+            f"{percentile(v, 99) * 1000:>9.1f} {max(v) * 1000:>9.1f} {sum(v):>9.1f}"
+        )
+
+
+def species_table(records: list[dict], top: int):
+    by_species = {}
+    for record in records:
+        by_species.setdefault(record.get("species") or "?", []).append(record)
+
+    rows = []
+    for name, entries in by_species.items():
+        totals = [e["timings"]["total"] for e in entries if "total" in e.get("timings", {})]
+        loads = [e["timings"]["model_load"] for e in entries if "model_load" in e.get("timings", {})]
+        inference = [e["timings"]["inference"] for e in entries if "inference" in e.get("timings", {})]
+        cached = sum(1 for e in entries if e.get("cache") == "hit")
+        rows.append((sum(totals), name, len(entries), cached, loads, inference, totals))
+    rows.sort(reverse=True)
+
+    print(f"  {'species':<28} {'n':>6} {'cache':>6} {'loads':>6} {'load p50':>9} "
+          f"{'infer p50':>10} {'p50 ms':>9} {'p99 ms':>9} {'total s':>9}")
+    for total, name, n, cached, loads, inference, totals in rows[:top]:
+        print(
+            f"  {name[:28]:<28} {n:>6} {cached / n:>6.0%} {len(loads):>6} "
+            f"{percentile(loads, 50) * 1000:>9.1f} {percentile(inference, 50) * 1000:>10.1f} "
+            f"{percentile(totals, 50) * 1000:>9.1f} {percentile(totals, 99) * 1000:>9.1f} {total:>9.1f}"
+        )
+    if len(rows) > top:
+        print(f"  ... {len(rows) - top} more species (--top)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise the vocalization service's timing trace")
+    parser.add_argument("trace", nargs="?", type=Path, default=DEFAULT_TRACE,
+                        help=f"Trace file written by --trace-file (default: {DEFAULT_TRACE})")
+    parser.add_argument("--species", help="Only this species (scientific name)")
+    parser.add_argument("--top", type=int, default=20, help="Species to list, slowest in total first")
+    args = parser.parse_args()
+
+    records = read_records(args.trace, args.species)
+    if not records:
+        print(f"No trace records in {args.trace}")
+        sys.exit(1)
+
+    outcomes = Counter(record.get("outcome") for record in records)
+    model_cache = Counter(record.get("model_cache") for record in records if record.get("model_cache"))
+    print(f"{len(records)} detections from {records[0].get('at')} to {records[-1].get('at')}")
+    print("  " + ", ".join(f"{outcome}: {count}" for outcome, count in outcomes.most_common()))
+    if model_cache:
+        lookups = sum(model_cache.values())
+        print(f"  model cache: {model_cache['hit']}/{lookups} hits ({model_cache['hit'] / lookups:.0%})")
+
+    print("\nPer stage")
+    stage_table(records)
+    print("\nPer species")
+    species_table(records, args.top)
+
+
+if __name__ == "__main__":
+    main()
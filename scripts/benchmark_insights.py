@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the Behavior Insights engine.
+
+Builds a synthetic one-year vocalization.db (migrated schema, rollups
+rebuilt) and times three ways of answering /api/behavior:
+
+    raw table    the original eight aggregate queries over vocalizations
+    per-query    the same queries against the rollup tables
+    engine       insights.compute(): one conditional-aggregate scan of the
+                 daily rollup, one hour-of-day aggregate, NumPy post-processing,
+                 plus the active alerts the service's anomaly detector keeps
+
+The per-query and engine results are compared on the same fixed "now",
+except for the alerts (now materialised at ingestion time, not computed
+here); the script fails (exit code 1) if they differ.
+
+Usage:
+    python benchmark_insights.py [--per-day 400] [--species 120] [--runs 20]
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import database  # noqa: E402
+import insights  # noqa: E402
+import rollups  # noqa: E402
+
+
+def build_database(path: Path, now: datetime, days: int, per_day: int, species: int):
+    """Create a migrated database with a year of synthetic detections."""
+    conn = sqlite3.connect(path)
+    database.migrate(conn)
+
+    rng = random.Random(0)
+    weights = [1 / (i + 1) for i in range(species)]  # a few common species, a long tail
+    data = []
+    for i in range(days * per_day):
+        ts = (now - timedelta(seconds=rng.randrange(days * 86400))).strftime(database.TIMESTAMP_FORMAT)
+        n = rng.choices(range(species), weights)[0]
+        data.append((
+            i + 1, f"clip_{i}.mp3", f"Species {n}", f"Genus species{n}",
+            rng.choices(["song", "call", "alarm"], [6, 3, 1])[0], "song", rng.random(), "{}", ts, ts
+        ))
+    conn.executemany("""
+        INSERT INTO vocalizations
+        (birdnet_id, file_name, common_name, scientific_name, vocalization_type,
+         vocalization_type_display, confidence, probabilities, classified_at, detected_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, data)
+    conn.commit()
+    rollups.rebuild(conn)
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+
+
+RAW_TABLE_QUERIES = [
+    """SELECT common_name, vocalization_type, COUNT(*) FROM vocalizations
+       WHERE classified_at >= date(:now, '-30 days') GROUP BY common_name, vocalization_type ORDER BY common_name""",
+    """SELECT strftime('%H', classified_at) as hour, vocalization_type, COUNT(*) FROM vocalizations
+       WHERE classified_at >= date(:now, '-7 days') GROUP BY hour, vocalization_type ORDER BY hour""",
+    """SELECT common_name, COUNT(*) FROM vocalizations
+       WHERE vocalization_type = 'alarm' AND classified_at >= datetime(:now, '-24 hours') GROUP BY common_name""",
+    """SELECT common_name, COUNT(*) * 1.0 / 7 FROM vocalizations
+       WHERE vocalization_type = 'alarm' AND classified_at >= date(:now, '-8 days')
+       AND classified_at < date(:now, '-1 days') GROUP BY common_name""",
+    """SELECT common_name, COUNT(*) as count FROM vocalizations
+       WHERE classified_at >= date(:now, '-8 days') AND classified_at < date(:now, '-1 days')
+       GROUP BY common_name HAVING count >= 7""",
+    """SELECT common_name, COUNT(*) FROM vocalizations
+       WHERE classified_at >= date(:now, '-1 days') GROUP BY common_name""",
+    """SELECT vocalization_type, COUNT(*) FROM vocalizations
+       WHERE classified_at >= date(:now, '-7 days') GROUP BY vocalization_type""",
+    """SELECT vocalization_type, COUNT(*) FROM vocalizations
+       WHERE classified_at >= date(:now, '-14 days') AND classified_at < date(:now, '-7 days')
+       GROUP BY vocalization_type""",
+]
+
+
+def raw_table_queries(conn: sqlite3.Connection, now: datetime):
+    """The original /api/behavior queries over the raw vocalizations table.
+
+    Only the SQL is timed; its Python post-processing is the same as
+    per_query_insights().
+    """
+    p = {"now": now.strftime(database.TIMESTAMP_FORMAT)}
+    for sql in RAW_TABLE_QUERIES:
+        conn.execute(sql, p).fetchall()
+
+
+def per_query_insights(conn: sqlite3.Connection, now: datetime) -> dict:
+    """The previous /api/behavior implementation: one rollup query per window."""
+    cursor = conn.cursor()
+    p = {"now": now.strftime(database.TIMESTAMP_FORMAT)}
+
+    cursor.execute("""
+        SELECT common_name, vocalization_type, SUM(count) as count
+        FROM rollup_daily
+        WHERE day >= date(:now, '-30 days')
+        GROUP BY common_name, vocalization_type
+        ORDER BY common_name
+    """, p)
+    species_data = {}
+    for name, vtype, count in cursor.fetchall():
+        if name not in species_data:
+            species_data[name] = {"song": 0, "call": 0, "alarm": 0, "total": 0}
+        species_data[name][vtype] = count
+        species_data[name]["total"] += count
+
+    species_breakdown = []
+    for name, data in sorted(species_data.items(), key=lambda x: x[1]["total"], reverse=True)[:15]:
+        total = data["total"]
+        if total > 0:
+            species_breakdown.append({
+                "species": name,
+                "total": total,
+                "song_pct": round(data["song"] / total * 100),
+                "call_pct": round(data["call"] / total * 100),
+                "alarm_pct": round(data["alarm"] / total * 100)
+            })
+
+    cursor.execute("""
+        SELECT substr(hour, 12, 2) as hour_of_day, vocalization_type, SUM(count) as count
+        FROM rollup_hourly
+        WHERE hour >= date(:now, '-7 days')
+        GROUP BY hour_of_day, vocalization_type
+        ORDER BY hour_of_day
+    """, p)
+    hourly_data = {str(h).zfill(2): {"song": 0, "call": 0, "alarm": 0} for h in range(24)}
+    for hour, vtype, count in cursor.fetchall():
+        if hour in hourly_data:
+            hourly_data[hour][vtype] = count
+    hourly_patterns = {
+        "labels": [f"{h}:00" for h in range(24)],
+        "song": [hourly_data[str(h).zfill(2)]["song"] for h in range(24)],
+        "call": [hourly_data[str(h).zfill(2)]["call"] for h in range(24)],
+        "alarm": [hourly_data[str(h).zfill(2)]["alarm"] for h in range(24)]
+    }
+
+    alerts = []
+    cursor.execute("""
+        SELECT common_name, SUM(count) as recent_count
+        FROM rollup_hourly
+        WHERE hour >= strftime('%Y-%m-%d %H', :now, '-24 hours')
+        AND vocalization_type = 'alarm'
+        GROUP BY common_name
+    """, p)
+    recent_alarms = {row[0]: row[1] for row in cursor.fetchall()}
+    cursor.execute("""
+        SELECT common_name, SUM(count) * 1.0 / 7 as avg_daily
+        FROM rollup_daily
+        WHERE day >= date(:now, '-8 days')
+        AND day < date(:now, '-1 days')
+        AND vocalization_type = 'alarm'
+        GROUP BY common_name
+    """, p)
+    avg_alarms = {row[0]: row[1] for row in cursor.fetchall()}
+    for species, count in recent_alarms.items():
+        avg = avg_alarms.get(species, 0)
+        if avg > 0 and count > avg * 3:
+            increase_pct = round((count - avg) / avg * 100)
+            alerts.append({
+                "type": "alarm_spike",
+                "species": species,
+                "message": f"{species}: {count} alarm calls in 24h (+{increase_pct}% vs normal)",
+                "severity": "warning" if count > avg * 5 else "info"
+            })
+
+    cursor.execute("""
+        SELECT common_name, SUM(count) as total
+        FROM rollup_daily
+        WHERE day >= date(:now, '-8 days')
+        AND day < date(:now, '-1 days')
+        GROUP BY common_name
+        HAVING total >= 7
+    """, p)
+    normally_active = {row[0]: row[1] / 7 for row in cursor.fetchall()}
+    cursor.execute("""
+        SELECT common_name, SUM(count) as total
+        FROM rollup_daily
+        WHERE day >= date(:now, '-1 days')
+        GROUP BY common_name
+    """, p)
+    today_active = {row[0]: row[1] for row in cursor.fetchall()}
+    for species, avg in normally_active.items():
+        if avg >= 3 and today_active.get(species, 0) == 0:
+            alerts.append({
+                "type": "silence",
+                "species": species,
+                "message": f"{species}: No detections today (usually ~{round(avg)}/day)",
+                "severity": "info"
+            })
+
+    cursor.execute("""
+        SELECT vocalization_type, SUM(count) as count
+        FROM rollup_daily
+        WHERE day >= date(:now, '-7 days')
+        GROUP BY vocalization_type
+    """, p)
+    this_week = {row[0]: row[1] for row in cursor.fetchall()}
+    cursor.execute("""
+        SELECT vocalization_type, SUM(count) as count
+        FROM rollup_daily
+        WHERE day >= date(:now, '-14 days')
+        AND day < date(:now, '-7 days')
+        GROUP BY vocalization_type
+    """, p)
+    last_week = {row[0]: row[1] for row in cursor.fetchall()}
+    trends = []
+    for vtype in ["song", "call", "alarm"]:
+        this_count = this_week.get(vtype, 0)
+        last_count = last_week.get(vtype, 0)
+        trends.append({
+            "type": vtype,
+            "this_week": this_count,
+            "last_week": last_count,
+            "change_pct": round((this_count - last_count) / last_count * 100) if last_count > 0 else 0
+        })
+
+    return {
+        "species_breakdown": species_breakdown,
+        "hourly_patterns": hourly_patterns,
+        "alerts": alerts,
+        "trends": trends
+    }
+
+
+def time_runs(func, runs: int) -> list[float]:
+    """Wall time in milliseconds of each call."""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Behavior Insights engine")
+    parser.add_argument("--days", type=int, default=365, help="Days of synthetic history")
+    parser.add_argument("--per-day", type=int, default=400, help="Detections per day")
+    parser.add_argument("--species", type=int, default=120, help="Number of species")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per implementation")
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "vocalization.db"
+        print(f"Building {args.days} days x {args.per_day} detections ({args.species} species)...")
+        build_database(db_path, now, args.days, args.per_day, args.species)
+
+        conn = sqlite3.connect(db_path)
+        before = per_query_insights(conn, now)
+        after = insights.compute(conn, now)
+        before.pop("alerts")
+        after.pop("alerts")
+        if before != after:
+            print("FAIL: insights.compute() differs from the per-query implementation")
+            for key in before:
+                if before[key] != after[key]:
+                    print(f"  {key}:\n    before {before[key]}\n    after  {after[key]}")
+            return 1
+
+        results = {
+            "raw table (8 queries)": time_runs(lambda: raw_table_queries(conn, now), args.runs),
+            "per-query rollups (8 queries)": time_runs(lambda: per_query_insights(conn, now), args.runs),
+            "engine (3 queries + NumPy)": time_runs(lambda: insights.compute(conn, now), args.runs),
+        }
+        conn.close()
+
+    print(f"\n{'implementation':<36} {'median':>9} {'min':>9}")
+    for name, times in results.items():
+        print(f"{name:<36} {statistics.median(times):>7.1f}ms {min(times):>7.1f}ms")
+    raw, per_query, engine = (statistics.median(t) for t in results.values())
+    print(f"\nEngine vs raw table: {raw / engine:.0f}x, vs per-query rollups: {per_query / engine:.1f}x "
+          f"(results identical)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for the web viewer.
+
+Builds a scratch vocalization.db with the current schema migrations, calls
+every dashboard API route in-process, records each SQL statement the
+handlers execute, and runs EXPLAIN QUERY PLAN on it. Fails (exit code 1) if
+any statement does a full scan of a table that grows with history. On
+filtered routes a full walk of an index (SCAN ... USING INDEX) also fails:
+it only serves ORDER BY, and checks every row when few of them match.
+
+Usage:
+    python check_query_plans.py [--rows 5000] [--verbose]
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import database  # noqa: E402
+import rollups  # noqa: E402
+import webviewer  # noqa: E402
+
+# Tables whose size grows with history; small lookup tables may be scanned
+GROWING_TABLES = {"vocalizations", "rollup_hourly", "rollup_daily", "feedback"}
+# Query parameters that are not filters (an index walk is fine for a plain newest-first page)
+PAGING_PARAMS = {"limit", "cursor"}
+
+# Dashboard routes (GET path and query string)
+ROUTES = [
+    ("/api/vocalizations", "limit=100"),
+    ("/api/vocalizations", "limit=100&type=alarm"),
+    ("/api/vocalizations", "limit=100&common=Species%203"),
+    ("/api/vocalizations", "limit=100&common_prefix=spec"),
+    ("/api/vocalizations", "limit=100&scientific=genus%20species7&since=2026-01-01"),
+    ("/api/vocalizations", "limit=100&scientific_prefix=Genus&min_confidence=0.5"),
+    ("/api/vocalizations", "limit=100&since=2026-01-01&until=2026-02-01"),
+    ("/api/vocalizations", "limit=100&cursor=MjAyNi0wMS0wMSAwMDowMDowMHw1MDA"),
+    ("/api/stats", ""),
+    ("/api/charts", ""),
+    ("/api/behavior", ""),
+    ("/api/vocalizations", "limit=100&species=cies%203"),
+    ("/api/species/search", "q=enus%20species1"),
+    ("/api/species/search", "q=sp"),
+    ("/api/audio", "file=clip_1.mp3"),
+    ("/api/peaks", "ids=1,2,3,500"),
+]
+
+
+def build_database(path: Path, rows: int):
+    """Create a migrated database with synthetic vocalizations and rollups."""
+    conn = sqlite3.connect(path)
+    database.migrate(conn)
+
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    data = []
+    for i in range(rows):
+        ts = (now - timedelta(minutes=rng.randrange(60 * 24 * 60))).strftime(database.TIMESTAMP_FORMAT)
+        species = rng.randrange(40)
+        data.append((
+            i + 1, f"clip_{i}.mp3", f"Species {species}", f"Genus species{species}",
+            rng.choice(["song", "call", "alarm"]), "song", rng.random(), "{}", ts, ts
+        ))
+    conn.executemany("""
+        INSERT INTO vocalizations
+        (birdnet_id, file_name, common_name, scientific_name, vocalization_type,
+         vocalization_type_display, confidence, probabilities, classified_at, detected_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, data)
+    conn.commit()
+    rollups.rebuild(conn)
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+
+
+def capture_statements(data_dir: Path) -> dict[str, list[str]]:
+    """Run each route through the real handler methods and collect its SQL."""
+    handler = webviewer.VocalizationHandler.__new__(webviewer.VocalizationHandler)
+    handler.data_dir = data_dir
+    handler.models_dir = None
+    handler.birdnet_dir = data_dir
+    handler.audio_index = webviewer.AudioIndex([])
+    handler.send_json = lambda data: None
+    handler.send_error = lambda code, message=None: None
+    # Bypass the response cache so every route runs its queries
+    handler.send_cached_json = lambda parsed, compute: compute()
+    handler.send_cached_body = lambda parsed, compute: compute()
+
+    conn = handler.get_db()
+    statements = []
+    conn.set_trace_callback(statements.append)
+
+    captured = {}
+    for path, query in ROUTES:
+        statements.clear()
+        handler.path = f"{path}?{query}" if query else path
+        handler.headers = {}
+        handler.do_GET()
+        captured[handler.path] = [s for s in statements if s.lstrip().upper().startswith(("SELECT", "WITH"))]
+
+    conn.set_trace_callback(None)
+    return captured
+
+
+def is_filtered(route: str) -> bool:
+    """True if the route's query string has parameters besides paging."""
+    return any(key not in PAGING_PARAMS for key in parse_qs(urlparse(route).query))
+
+
+def full_scans(conn: sqlite3.Connection, sql: str, filtered: bool = False) -> list[str]:
+    """Return the plan lines that scan a growing table without an index.
+
+    With filtered, a scan through an index (rather than a SEARCH on it)
+    counts as a full scan too.
+    """
+    problems = []
+    for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+        detail = row[3]
+        words = detail.split()
+        if len(words) >= 2 and words[0] == "SCAN" and words[1] in GROWING_TABLES:
+            if filtered or ("INDEX" not in detail and "PRIMARY KEY" not in detail):
+                problems.append(detail)
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check dashboard queries for full table scans")
+    parser.add_argument("--rows", type=int, default=5000, help="Synthetic rows to generate")
+    parser.add_argument("--verbose", action="store_true", help="Print every query plan")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        db_path = data_dir / "vocalization.db"
+        build_database(db_path, args.rows)
+
+        captured = capture_statements(data_dir)
+        conn = sqlite3.connect(db_path)
+
+        failures = 0
+        checked = 0
+        for route, statements in captured.items():
+            for sql in statements:
+                checked += 1
+                problems = full_scans(conn, sql, is_filtered(route))
+                if args.verbose or problems:
+                    print(f"{route}:\n  {' '.join(sql.split())}")
+                    for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+                        print(f"    {row[3]}")
+                for detail in problems:
+                    print(f"  FULL SCAN: {detail}")
+                    failures += 1
+        conn.close()
+
+    print(f"\nChecked {checked} queries on {len(captured)} routes: "
+          f"{'OK' if not failures else f'{failures} full scan(s)'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Distill the shared cascade gatekeeper model from the species models.
+
+The gatekeeper is a tiny species-independent CNN (one conv block + global
+pooling). It is trained to mimic the soft predictions of each species'
+VocalizationCNN on clips already classified by the service, so no labels
+are needed. The result is written to <models-dir>/gatekeeper.pt and picked
+up by the service when started with --cascade-threshold.
+
+Usage:
+    python distill_gatekeeper.py --models-dir /opt/birdnet-vocalization/models \\
+        --data-dir /opt/birdnet-vocalization/data --birdnet-dir /home/pi/BirdNET-Pi
+"""
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from classifier import (  # noqa: E402
+    GATEKEEPER_FILE, VocalizationClassifier, create_gatekeeper_model, get_torch
+)
+
+
+def find_clips(data_dir: Path, birdnet_dir: Path, max_clips: int) -> list[tuple[str, Path]]:
+    """Return (scientific_name, audio_path) pairs for already classified clips."""
+    conn = sqlite3.connect(data_dir / "vocalization.db")
+    rows = conn.execute("""
+        SELECT scientific_name, file_name FROM vocalizations
+        ORDER BY id DESC LIMIT ?
+    """, (max_clips,)).fetchall()
+    conn.close()
+
+    # One directory walk instead of a search per clip
+    index = {}
+    for root in (birdnet_dir / "BirdSongs", birdnet_dir.parent / "BirdSongs"):
+        if root.exists():
+            for path in root.rglob("*.mp3"):
+                index.setdefault(path.name, path)
+
+    clips = []
+    for scientific_name, file_name in rows:
+        path = index.get(Path(file_name or "").name)
+        if path:
+            clips.append((scientific_name, path))
+    return clips
+
+
+def build_dataset(classifier: VocalizationClassifier, clips: list[tuple[str, Path]]):
+    """Compute spectrograms and teacher probabilities for each clip."""
+    from skimage.transform import resize
+
+    inputs, targets = [], []
+    for i, (scientific_name, path) in enumerate(clips, 1):
+        model_path = classifier._find_model(scientific_name)
+        if not model_path:
+            continue
+        loaded = classifier._load_model(model_path)
+        spectrogram = classifier._audio_to_spectrogram(path)
+        if loaded is None or spectrogram is None:
+            continue
+        if spectrogram.shape != (128, 128):
+            spectrogram = resize(spectrogram, (128, 128), anti_aliasing=True)
+
+        model, class_names = loaded
+        if class_names != ['song', 'call', 'alarm']:
+            continue
+        inputs.append(spectrogram.astype(np.float32))
+        targets.append(classifier._predict(model, spectrogram))
+        if i % 100 == 0:
+            print(f"  {i}/{len(clips)} clips")
+
+    if not inputs:
+        return None, None
+    return np.stack(inputs), np.stack(targets).astype(np.float32)
+
+
+def distill(inputs: np.ndarray, targets: np.ndarray, epochs: int, batch_size: int):
+    """Train the gatekeeper on teacher soft labels (KL divergence)."""
+    torch = get_torch()
+    model = create_gatekeeper_model(num_classes=targets.shape[1])
+    optimizer = torch.optim.Adam(model.parameters(), lr=1e-3)
+    kl = torch.nn.KLDivLoss(reduction='batchmean')
+
+    x_all = torch.from_numpy(inputs).unsqueeze(1)
+    y_all = torch.from_numpy(targets)
+
+    for epoch in range(1, epochs + 1):
+        model.train()
+        order = torch.randperm(len(x_all))
+        total = 0.0
+        for start in range(0, len(order), batch_size):
+            idx = order[start:start + batch_size]
+            optimizer.zero_grad()
+            log_probas = torch.log_softmax(model(x_all[idx]), dim=1)
+            loss = kl(log_probas, y_all[idx])
+            loss.backward()
+            optimizer.step()
+            total += loss.item() * len(idx)
+        print(f"  Epoch {epoch}/{epochs}: loss {total / len(order):.4f}")
+
+    model.eval()
+    return model
+
+
+def report(model, inputs: np.ndarray, targets: np.ndarray, thresholds=(0.7, 0.8, 0.9, 0.95)):
+    """Print early-exit rate and agreement with the species models per threshold."""
+    torch = get_torch()
+    with torch.no_grad():
+        probas = torch.softmax(model(torch.from_numpy(inputs).unsqueeze(1)), dim=1).numpy()
+
+    agree = probas.argmax(axis=1) == targets.argmax(axis=1)
+    confidence = probas.max(axis=1)
+    print(f"\nOverall agreement: {agree.mean():.1%} on {len(agree)} clips")
+    print("  threshold  early-exit  agreement")
+    for t in thresholds:
+        exits = confidence >= t
+        rate = exits.mean()
+        agreement = agree[exits].mean() if exits.any() else float('nan')
+        print(f"  {t:9.2f}  {rate:10.1%}  {agreement:9.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill the cascade gatekeeper model")
+    parser.add_argument("--models-dir", type=Path, required=True, help="Species models directory")
+    parser.add_argument("--data-dir", type=Path, required=True, help="Directory with vocalization.db")
+    parser.add_argument("--birdnet-dir", type=Path, default=Path("/home/pi/BirdNET-Pi"),
+                        help="BirdNET-Pi installation directory (for audio files)")
+    parser.add_argument("--max-clips", type=int, default=5000, help="Maximum clips to use")
+    parser.add_argument("--epochs", type=int, default=20, help="Training epochs")
+    parser.add_argument("--batch-size", type=int, default=64, help="Batch size")
+    args = parser.parse_args()
+
+    print("Collecting clips...")
+    clips = find_clips(args.data_dir, args.birdnet_dir, args.max_clips)
+    print(f"  Found {len(clips)} clips")
+    if not clips:
+        print("No classified clips with audio found; run the service first.")
+        return
+
+    classifier = VocalizationClassifier(args.models_dir, max_cached_models=20)
+    print("Computing teacher predictions...")
+    inputs, targets = build_dataset(classifier, clips)
+    if inputs is None:
+        print("No clips matched a species model; nothing to distill.")
+        return
+
+    print("Distilling...")
+    model = distill(inputs, targets, args.epochs, args.batch_size)
+    report(model, inputs, targets)
+
+    torch = get_torch()
+    out_path = args.models_dir / GATEKEEPER_FILE
+    torch.save({
+        'model_state_dict': model.state_dict(),
+        'num_classes': targets.shape[1],
+        'class_names': ['song', 'call', 'alarm'],
+    }, out_path)
+    print(f"\nSaved: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Load test for the web viewer API.
+
+Runs N concurrent clients against the viewer's read-only API routes and
+prints p50/p99 latency per route. Uses only the standard library, so it
+can run on the Pi itself or from another machine on the network.
+
+Usage:
+    python loadtest_viewer.py --url http://localhost:8088 --clients 20 --requests 50
+"""
+
+import argparse
+import math
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_ROUTES = [
+    "/api/vocalizations?limit=100",
+    "/api/stats",
+    "/api/charts",
+    "/api/behavior",
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def run_client(base_url: str, routes: list[str], requests: int, results: dict, lock: threading.Lock):
+    """One client: cycle through the routes, recording latency per request."""
+    for i in range(requests):
+        route = routes[i % len(routes)]
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(base_url + route, timeout=60) as response:
+                response.read()
+            ok = True
+        except (urllib.error.URLError, OSError):
+            ok = False
+        elapsed = time.perf_counter() - started
+        with lock:
+            entry = results.setdefault(route, {'latencies': [], 'errors': 0})
+            if ok:
+                entry['latencies'].append(elapsed)
+            else:
+                entry['errors'] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the vocalization web viewer")
+    parser.add_argument("--url", default="http://localhost:8088", help="Viewer base URL")
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per client")
+    parser.add_argument("--route", action="append", dest="routes",
+                        help="Route to test (repeatable, default: all API routes)")
+    args = parser.parse_args()
+
+    routes = args.routes or DEFAULT_ROUTES
+    results = {}
+    lock = threading.Lock()
+
+    print(f"Load testing {args.url} with {args.clients} clients x {args.requests} requests")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        for _ in range(args.clients):
+            pool.submit(run_client, args.url.rstrip("/"), routes, args.requests, results, lock)
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(r['latencies']) + r['errors'] for r in results.values())
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)\n")
+    print(f"  {'route':<32} {'n':>6} {'err':>5} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    for route in routes:
+        entry = results.get(route, {'latencies': [], 'errors': 0})
+        latencies = entry['latencies']
+        mean = statistics.mean(latencies) * 1000 if latencies else float('nan')
+        print(
+            f"  {route:<32} {len(latencies):>6} {entry['errors']:>5} "
+            f"{percentile(latencies, 50) * 1000:>9.1f} {percentile(latencies, 99) * 1000:>9.1f} {mean:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
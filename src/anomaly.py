@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Ingestion-Time Anomaly Detector
+
+Keeps streaming per-species counters in the service and writes alarm-spike
+and unusual-silence alerts to the alerts table as soon as a threshold is
+crossed, so the dashboard only reads the active alerts. Each stored result
+is O(1) work: one bucket of a sliding 24-hour alarm window and today's
+counters. Daily baselines are exponentially weighted moving averages
+(EWMA, ~7 day span) of each species' alarm and total counts, folded in
+once per UTC day.
+
+    alarm_spike  alarms in the last 24h > 3x the daily alarm baseline (warning above 5x)
+    silence      daily baseline >= 3 detections, none since yesterday 00:00 UTC
+
+An alert stays active (resolved_at NULL) until its condition clears. The
+counters are seeded from the rollup tables at startup, so a restart
+picks up where the previous run left off.
+
+    alerts (id, type, species, severity, message, value, baseline,
+            raised_at, updated_at, resolved_at)
+
+Usage:
+    detector = AnomalyDetector()
+    detector.load(conn)
+    detector.record(cursor, detected_at, common_name, vocalization_type)
+    if detector.due():
+        changes = detector.tick(cursor)
+"""
+
+import logging
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import database
+
+logger = logging.getLogger(__name__)
+
+SPIKE_FACTOR = 3         # alarms in 24h vs daily baseline that raise an alert
+WARNING_FACTOR = 5       # ... that make it a warning
+SILENCE_MIN_DAILY = 3    # daily baseline above which silence is reported
+BASELINE_DAYS = 7        # EWMA span and seeding window
+ALPHA = 2 / (BASELINE_DAYS + 1)
+
+ALARM_SPIKE = "alarm_spike"
+SILENCE = "silence"
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS alerts (
+        id INTEGER PRIMARY KEY,
+        type TEXT NOT NULL,
+        species TEXT NOT NULL,
+        severity TEXT NOT NULL,
+        message TEXT NOT NULL,
+        value REAL,
+        baseline REAL,
+        raised_at TIMESTAMP NOT NULL,
+        updated_at TIMESTAMP NOT NULL,
+        resolved_at TIMESTAMP
+    )
+    """,
+    # At most one active alert per type and species; also the dashboard's read path
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_alerts_active
+    ON alerts(type, species) WHERE resolved_at IS NULL
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_alerts_raised
+    ON alerts(raised_at)
+    """,
+]
+
+
+def create_tables(cursor: sqlite3.Cursor):
+    """Create the alerts table and its indexes."""
+    for statement in SCHEMA:
+        cursor.execute(statement)
+
+
+def active_alerts(conn: sqlite3.Connection) -> list[dict]:
+    """Unresolved alerts, spikes before silences, by species."""
+    try:
+        rows = conn.execute("""
+            SELECT type, species, message, severity
+            FROM alerts
+            WHERE resolved_at IS NULL
+            ORDER BY type, species
+        """).fetchall()
+    except sqlite3.OperationalError:
+        return []  # service not yet upgraded to the alerts schema
+    return [dict(zip(("type", "species", "message", "severity"), row)) for row in rows]
+
+
+def hour_key(moment: datetime) -> str:
+    """Rollup hour key 'YYYY-MM-DD HH'."""
+    return moment.strftime("%Y-%m-%d %H")
+
+
+class SpeciesCounters:
+    """Streaming counters of one species."""
+
+    def __init__(self):
+        self.alarm_hours = {}       # hour key -> alarms, inside the 24h window
+        self.alarms_24h = 0
+        self.today_alarms = 0
+        self.today_total = 0
+        self.alarm_baseline = 0.0   # EWMA of daily alarms
+        self.total_baseline = 0.0   # EWMA of daily detections
+        self.last_day = None        # last 'YYYY-MM-DD' with a detection
+
+
+class AnomalyDetector:
+    """Per-species sliding-window counts and EWMA baselines that materialise alerts."""
+
+    def __init__(self):
+        self.species = {}
+        self.active = {}            # (type, species) -> (alert id, message)
+        self.day = None             # current UTC day
+        self.hour = None            # hour of the last tick
+        self.window_start = None    # first hour key inside the 24h window
+        self.stats = {'raised': 0, 'resolved': 0}
+
+    def _counters(self, name: str) -> SpeciesCounters:
+        counters = self.species.get(name)
+        if counters is None:
+            counters = self.species[name] = SpeciesCounters()
+        return counters
+
+    def load(self, conn: sqlite3.Connection, now: datetime | None = None):
+        """Seed the counters from the rollups and pick up the active alerts."""
+        now = now or datetime.now(timezone.utc)
+        self.species = {}
+        self.day = now.date().isoformat()
+        self.window_start = hour_key(now - timedelta(hours=24))
+        self.hour = None  # evaluate everything on the first tick
+        seed_start = (now.date() - timedelta(days=BASELINE_DAYS)).isoformat()
+
+        for day, name, vtype, count in conn.execute("""
+            SELECT day, common_name, vocalization_type, count
+            FROM rollup_daily
+            WHERE day >= ?
+        """, (seed_start,)):
+            counters = self._counters(name)
+            if day < self.day:
+                # Seed value: plain average of the last full week (summed here, divided below)
+                counters.total_baseline += count
+                if vtype == "alarm":
+                    counters.alarm_baseline += count
+            else:
+                counters.today_total += count
+                if vtype == "alarm":
+                    counters.today_alarms += count
+            if count > 0 and (counters.last_day is None or day > counters.last_day):
+                counters.last_day = day
+        for counters in self.species.values():
+            counters.total_baseline /= BASELINE_DAYS
+            counters.alarm_baseline /= BASELINE_DAYS
+
+        for hour, name, count in conn.execute("""
+            SELECT hour, common_name, count
+            FROM rollup_hourly
+            WHERE hour >= ? AND vocalization_type = 'alarm'
+        """, (self.window_start,)):
+            counters = self._counters(name)
+            counters.alarm_hours[hour] = counters.alarm_hours.get(hour, 0) + count
+            counters.alarms_24h += count
+
+        self.active = {
+            (alert_type, name): (alert_id, message)
+            for alert_id, alert_type, name, message in conn.execute(
+                "SELECT id, type, species, message FROM alerts WHERE resolved_at IS NULL"
+            )
+        }
+        logger.info(f"Anomaly detector: {len(self.species)} species, {len(self.active)} active alerts")
+
+    def record(self, cursor: sqlite3.Cursor, detected_at: str, common_name: str,
+               vocalization_type: str, delta: int = 1) -> int:
+        """Count one stored result (delta=-1 takes it back). Returns alert changes."""
+        counters = self._counters(common_name)
+        day, hour = detected_at[:10], detected_at[:13]
+        if day == self.day:
+            counters.today_total += delta
+            if vocalization_type == "alarm":
+                counters.today_alarms += delta
+        if delta > 0 and (counters.last_day is None or day > counters.last_day):
+            counters.last_day = day
+
+        changes = 0
+        if vocalization_type == "alarm" and self.window_start is not None and hour >= self.window_start:
+            counters.alarm_hours[hour] = counters.alarm_hours.get(hour, 0) + delta
+            counters.alarms_24h += delta
+            changes += self._check_spike(cursor, common_name, counters)
+        if delta > 0:
+            changes += self._check_silence(cursor, common_name, counters)
+        return changes
+
+    def due(self, now: datetime | None = None) -> bool:
+        """True when the hour changed since the last tick."""
+        return hour_key(now or datetime.now(timezone.utc)) != self.hour
+
+    def tick(self, cursor: sqlite3.Cursor, now: datetime | None = None) -> int:
+        """Hourly upkeep: slide the 24h window, fold baselines at midnight, re-check alerts.
+
+        Returns the number of alerts raised, updated or resolved.
+        """
+        now = now or datetime.now(timezone.utc)
+        self.hour = hour_key(now)
+        self.window_start = hour_key(now - timedelta(hours=24))
+
+        today = now.date()
+        if self.day is not None and today.isoformat() != self.day:
+            # Fold the finished day(s) into the baselines; days without a tick count as zero
+            missed = (today - datetime.strptime(self.day, "%Y-%m-%d").date()).days
+            for counters in self.species.values():
+                for _ in range(missed):
+                    counters.alarm_baseline += ALPHA * (counters.today_alarms - counters.alarm_baseline)
+                    counters.total_baseline += ALPHA * (counters.today_total - counters.total_baseline)
+                    counters.today_alarms = counters.today_total = 0
+        self.day = today.isoformat()
+
+        changes = 0
+        for name, counters in self.species.items():
+            expired = [hour for hour in counters.alarm_hours if hour < self.window_start]
+            for hour in expired:
+                counters.alarms_24h -= counters.alarm_hours.pop(hour)
+            changes += self._check_spike(cursor, name, counters)
+            changes += self._check_silence(cursor, name, counters)
+        return changes
+
+    def _check_spike(self, cursor: sqlite3.Cursor, name: str, counters: SpeciesCounters) -> int:
+        avg = counters.alarm_baseline
+        count = counters.alarms_24h
+        if avg > 0 and count > avg * SPIKE_FACTOR:
+            increase_pct = round((count - avg) / avg * 100)
+            return self._raise(
+                cursor, ALARM_SPIKE, name,
+                f"{name}: {count} alarm calls in 24h (+{increase_pct}% vs normal)",
+                "warning" if count > avg * WARNING_FACTOR else "info", count, avg
+            )
+        return self._resolve(cursor, ALARM_SPIKE, name)
+
+    def _check_silence(self, cursor: sqlite3.Cursor, name: str, counters: SpeciesCounters) -> int:
+        avg = counters.total_baseline
+        yesterday = (datetime.strptime(self.day, "%Y-%m-%d").date() - timedelta(days=1)).isoformat()
+        if avg >= SILENCE_MIN_DAILY and (counters.last_day is None or counters.last_day < yesterday):
+            return self._raise(
+                cursor, SILENCE, name,
+                f"{name}: No detections today (usually ~{round(avg)}/day)",
+                "info", 0, avg
+            )
+        return self._resolve(cursor, SILENCE, name)
+
+    def _raise(self, cursor: sqlite3.Cursor, alert_type: str, name: str, message: str,
+               severity: str, value: float, baseline: float) -> int:
+        """Insert a new alert or update the active one; 0 if nothing changed."""
+        key = (alert_type, name)
+        now = database.utc_now()
+        current = self.active.get(key)
+        if current is not None:
+            if current[1] == message:
+                return 0
+            cursor.execute("""
+                UPDATE alerts SET message = ?, severity = ?, value = ?, baseline = ?, updated_at = ?
+                WHERE id = ?
+            """, (message, severity, value, baseline, now, current[0]))
+            self.active[key] = (current[0], message)
+            return 1
+
+        cursor.execute("""
+            INSERT INTO alerts (type, species, severity, message, value, baseline, raised_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (alert_type, name, severity, message, value, baseline, now, now))
+        self.active[key] = (cursor.lastrowid, message)
+        self.stats['raised'] += 1
+        logger.info(f"Alert: {message}")
+        return 1
+
+    def _resolve(self, cursor: sqlite3.Cursor, alert_type: str, name: str) -> int:
+        current = self.active.pop((alert_type, name), None)
+        if current is None:
+            return 0
+        now = database.utc_now()
+        cursor.execute("UPDATE alerts SET resolved_at = ?, updated_at = ? WHERE id = ?",
+                       (now, now, current[0]))
+        self.stats['resolved'] += 1
+        logger.info(f"Alert resolved: {alert_type} for {name}")
+        return 1
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Web Viewer Static Assets
+
+Loads the viewer's page, stylesheet and scripts from src/static once at
+startup, names them by content hash (viewer.3f2a9c1d.js) so browsers can
+cache them forever, and precompresses every variant with gzip (and brotli,
+when the optional brotli package is installed).
+
+Chart.js is served from static/vendor/ (downloaded by install.sh) so the
+dashboard works on Pis without internet; the CDN is only used if the local
+copy is missing.
+
+Usage:
+    assets = StaticAssets(STATIC_DIR)
+    asset = assets.get("/static/viewer.3f2a9c1d.js")
+    body, encoding = asset.negotiate(handler.headers.get("Accept-Encoding"))
+"""
+
+import gzip
+import hashlib
+import logging
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+STATIC_PREFIX = "/static/"
+INDEX_FILE = "index.html"
+CHART_JS = "vendor/chart.umd.min.js"
+CHART_JS_CDN = "https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js"
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+    ".json": "application/json",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".ico": "image/x-icon",
+}
+COMPRESSIBLE = {".html", ".css", ".js", ".json", ".svg"}
+MIN_COMPRESS_SIZE = 1024  # smaller bodies aren't worth the extra header
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+def compress(body: bytes, level: int = 9, use_brotli: bool = True) -> dict[str, bytes]:
+    """Compressed variants of body, keyed by Content-Encoding.
+
+    Only variants that are actually smaller are returned. Brotli at full
+    quality is slow, so it is meant for static files compressed once.
+    """
+    if len(body) < MIN_COMPRESS_SIZE:
+        return {}
+    variants = {"gzip": gzip.compress(body, compresslevel=level, mtime=0)}
+    if use_brotli and brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return {name: data for name, data in variants.items() if len(data) < len(body)}
+
+
+def choose_encoding(accept_encoding: str | None, available) -> str | None:
+    """Pick the best Content-Encoding the client accepts (brotli first)."""
+    if not accept_encoding or not available:
+        return None
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q=") and params[2:] in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    for name in ("br", "gzip"):
+        if name in available and (name in accepted or "*" in accepted):
+            return name
+    return None
+
+
+class Asset:
+    """One static file with its precompressed variants."""
+
+    def __init__(self, name: str, url: str, body: bytes, cache_control: str):
+        self.name = name
+        self.url = url
+        self.body = body
+        self.cache_control = cache_control
+        suffix = Path(name).suffix
+        self.content_type = CONTENT_TYPES.get(suffix, "application/octet-stream")
+        self.etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        self.variants = compress(body) if suffix in COMPRESSIBLE else {}
+
+    def negotiate(self, accept_encoding: str | None) -> tuple[bytes, str | None]:
+        """Return (body, content encoding or None) for the client."""
+        encoding = choose_encoding(accept_encoding, self.variants)
+        return (self.variants[encoding], encoding) if encoding else (self.body, None)
+
+
+class StaticAssets:
+    """Content-hashed static files of the web viewer, held in memory."""
+
+    def __init__(self, static_dir: Path = STATIC_DIR):
+        self.static_dir = static_dir
+        self._by_url = {}
+        self._urls = {}
+
+        for path in sorted(static_dir.rglob("*")):
+            name = path.relative_to(static_dir).as_posix()
+            if not path.is_file() or name == INDEX_FILE:
+                continue
+            body = path.read_bytes()
+            digest = hashlib.blake2b(body, digest_size=4).hexdigest()
+            stem, dot, suffix = name.rpartition(".")
+            url = f"{STATIC_PREFIX}{stem}.{digest}.{suffix}" if dot else f"{STATIC_PREFIX}{name}.{digest}"
+            asset = Asset(name, url, body, IMMUTABLE)
+            self._by_url[url] = asset
+            self._urls[name] = url
+
+        if CHART_JS not in self._urls:
+            logger.warning(f"{static_dir / CHART_JS} not found, charts will load from {CHART_JS_CDN}")
+            self._urls[CHART_JS] = CHART_JS_CDN
+
+        self.index = Asset(INDEX_FILE, "/", self._render_index(), REVALIDATE)
+
+        total = sum(len(a.body) for a in self._by_url.values()) + len(self.index.body)
+        logger.info(f"Loaded {len(self._by_url) + 1} static assets ({total / 1024:.0f} KB, "
+                    f"brotli {'on' if brotli is not None else 'off'})")
+
+    def _render_index(self) -> bytes:
+        """index.html with {{name}} placeholders replaced by hashed URLs."""
+        html = (self.static_dir / INDEX_FILE).read_text(encoding="utf-8")
+        for name, url in self._urls.items():
+            html = html.replace("{{" + name + "}}", url)
+        return html.encode("utf-8")
+
+    def url(self, name: str) -> str | None:
+        """Hashed URL of a static file, e.g. 'viewer.js' -> '/static/viewer.3f2a9c1d.js'."""
+        return self._urls.get(name)
+
+    def get(self, url_path: str) -> Asset | None:
+        """Asset served at url_path, or None."""
+        return self._by_url.get(url_path)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+BirdNET-Pi Audio File Index
+
+Maps clip file names to their location under BirdSongs/Extracted without
+walking the whole tree per request. The index is built once and refreshed
+incrementally, at most once per rescan interval: on a miss every known
+directory is stat()ed, but only directories whose mtime changed since the
+previous scan are re-listed; the others are descended through their cached
+subdirectory lists. Rescans run outside the index lock, so lookups of
+clips already in the index never wait for one.
+
+Usage:
+    index = AudioIndex(audio_roots(Path("/home/pi/BirdNET-Pi")))
+    path = index.resolve("Eurasian_Wren-78-2026-05-01-birdnet-06:12:44.mp3")
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+AUDIO_TYPES = {
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+    ".flac": "audio/flac",
+    ".ogg": "audio/ogg",
+}
+RESCAN_INTERVAL = 30.0  # seconds between rescans triggered by misses
+
+
+def audio_roots(birdnet_dir: Path) -> list[Path]:
+    """Existing BirdSongs/Extracted directories of a BirdNET-Pi install.
+
+    Same locations the service searches: inside the BirdNET-Pi directory
+    or next to it in the user's home.
+    """
+    candidates = [
+        birdnet_dir / "BirdSongs" / "Extracted",
+        birdnet_dir.parent / "BirdSongs" / "Extracted",
+    ]
+    return [root for root in candidates if root.is_dir()]
+
+
+def is_within(path: Path, roots: list[Path]) -> bool:
+    """True if path (symlinks resolved) lies inside one of roots."""
+    try:
+        resolved = path.resolve()
+    except OSError:
+        return False
+    return any(resolved.is_relative_to(root.resolve()) for root in roots)
+
+
+class AudioIndex:
+    """File name -> path index of the extracted audio clips."""
+
+    def __init__(self, roots: list[Path], rescan_interval: float = RESCAN_INTERVAL):
+        self.roots = roots
+        self.rescan_interval = rescan_interval
+        self._paths = {}
+        self._dirs = {}  # directory -> (mtime_ns, subdirectories, audio file names)
+        self._last_scan = 0.0
+        self._lock = threading.Lock()
+        self._scanning = threading.Lock()
+        self.stats = {'scans': 0, 'dirs_listed': 0, 'hits': 0, 'misses': 0}
+
+    def _walk(self, previous: dict) -> tuple[dict, int]:
+        """Directory listings of the tree, reusing previous ones whose mtime is unchanged.
+
+        Returns the new listings and the number of directories re-listed.
+        """
+        dirs = {}
+        listed = 0
+        stack = [str(root) for root in self.roots]
+        while stack:
+            directory = stack.pop()
+            if directory in dirs:
+                continue
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            known = previous.get(directory)
+            if known is not None and known[0] == mtime:
+                dirs[directory] = known
+            else:
+                subdirs, files = [], []
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.path)
+                            elif Path(entry.name).suffix.lower() in AUDIO_TYPES:
+                                files.append(entry.name)
+                except OSError:
+                    continue
+                dirs[directory] = (mtime, tuple(subdirs), frozenset(files))
+                listed += 1
+            stack.extend(dirs[directory][1])
+        return dirs, listed
+
+    def _scan(self):
+        """Re-list changed directories (outside the lock), then apply the difference."""
+        started = time.monotonic()
+        with self._lock:
+            previous = self._dirs
+        dirs, listed = self._walk(previous)
+
+        with self._lock:
+            for directory, (_, _, old_files) in previous.items():
+                current = dirs.get(directory)
+                if current is not None and current[2] is old_files:
+                    continue
+                # Changed or removed (e.g. by BirdNET-Pi's disk cleanup): drop files that are gone
+                new_files = current[2] if current is not None else frozenset()
+                for name in old_files - new_files:
+                    path = self._paths.get(name)
+                    if path is not None and str(path.parent) == directory:
+                        del self._paths[name]
+            for directory, (_, _, files) in dirs.items():
+                old = previous.get(directory)
+                if old is None or old[2] is not files:
+                    for name in files:
+                        self._paths[name] = Path(directory) / name
+            self._dirs = dirs
+            self._last_scan = time.monotonic()
+            self.stats['scans'] += 1
+            self.stats['dirs_listed'] += listed
+            count = len(self._paths)
+        logger.debug(f"Audio index: {count} files, {listed} directories listed, "
+                     f"scan took {time.monotonic() - started:.2f}s")
+
+    def _scan_due(self) -> bool:
+        with self._lock:
+            return self._last_scan == 0.0 or time.monotonic() - self._last_scan >= self.rescan_interval
+
+    def resolve(self, file_name: str) -> Path | None:
+        """Path of the clip called file_name, or None if it does not exist."""
+        with self._lock:
+            path = self._paths.get(file_name)
+        if path is not None:
+            if path.exists():
+                with self._lock:
+                    self.stats['hits'] += 1
+                return path
+            with self._lock:
+                if self._paths.get(file_name) == path:
+                    del self._paths[file_name]
+
+        # One rescan at a time; concurrent misses do not queue behind it
+        if self._scanning.acquire(blocking=False):
+            try:
+                if self._scan_due():
+                    self._scan()
+            finally:
+                self._scanning.release()
+            with self._lock:
+                path = self._paths.get(file_name)
+                if path is not None:
+                    self.stats['hits'] += 1
+                    return path
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
@@ -13,12 +13,16 @@ Usage:
         # Output: song (87%)
 """
 
+import base64
 import re
 import logging
+import time
 from pathlib import Path
 
 import numpy as np
 
+from model_manifest import GATEKEEPER_FILE, species_key
+
 # Lazy imports for faster startup
 _torch = None
 _librosa = None
@@ -50,6 +54,27 @@ HOP_LENGTH = 512
 FMIN = 500
 FMAX = 8000
 SEGMENT_DURATION = 3.0
+PEAK_BUCKETS = 100  # waveform preview: min/max pairs over the decoded segment
+
+# Quality tiers, from most to least accurate. Lower tiers trade a little
+# accuracy for speed when the service is behind on its backlog.
+TIER_FULL = 'full'            # fp32 model, full sample rate input
+TIER_QUANTIZED = 'quantized'  # int8 dynamic-quantized linear layers, full input
+TIER_REDUCED = 'reduced'      # int8 model on reduced sample rate input (cheaper decode + mel)
+TIERS = [TIER_FULL, TIER_QUANTIZED, TIER_REDUCED]
+REDUCED_SAMPLE_RATE = 16000   # still covers FMAX (8 kHz Nyquist)
+
+# Cascade: a tiny shared model answers easy clips before the species model
+DEFAULT_CASCADE_THRESHOLD = 0.9
+DEFAULT_CASCADE_AUDIT_RATE = 0.05  # fraction of early exits re-checked with the full model
+
+# Signal gate: skip clips that would only produce confident garbage
+MIN_AUDIO_SECONDS = 0.5       # shorter decodes are treated as empty
+SILENCE_DBFS = -60.0          # RMS level below which a clip is silence
+CLIP_LEVEL = 0.999            # sample magnitude counted as clipped
+MAX_CLIPPED_FRACTION = 0.01   # more clipped samples than this is distorted
+SNR_FRAME_SECONDS = 0.05      # frame length for the energy-percentile SNR estimate
+MIN_SNR_DB = 3.0              # loud vs quiet frames below this is flat noise
 
 # Translations for vocalization types
 TRANSLATIONS = {
@@ -148,6 +173,32 @@ TRANSLATIONS = {
 logger = logging.getLogger(__name__)
 
 
+def waveform_peaks(audio: np.ndarray, buckets: int = PEAK_BUCKETS) -> bytes:
+    """Min/max waveform summary: buckets interleaved (min, max) int8 pairs.
+
+    Scaled to the clip's own peak (+-127), so quiet clips still draw a
+    visible waveform.
+    """
+    if len(audio) < buckets:
+        audio = np.pad(audio, (0, buckets - len(audio)))
+    frames = audio[:len(audio) // buckets * buckets].reshape(buckets, -1)
+    peak = float(np.max(np.abs(frames)))
+    scale = 127 / peak if peak > 0 else 0.0
+    pairs = np.stack([frames.min(axis=1), frames.max(axis=1)], axis=1) * scale
+    return np.clip(np.round(pairs), -127, 127).astype(np.int8).tobytes()
+
+
+def model_bytes(model) -> int:
+    """Memory held by a model's tensors (parameters, buffers and packed int8 weights)."""
+    def size(value) -> int:
+        if hasattr(value, 'element_size'):
+            return value.element_size() * value.nelement()
+        if isinstance(value, (tuple, list)):
+            return sum(size(item) for item in value)
+        return 0
+    return sum(size(value) for value in model.state_dict().values())
+
+
 def create_cnn_model(num_classes=3):
     """Create CNN model matching trained architecture."""
     torch = get_torch()
@@ -196,6 +247,38 @@ def create_cnn_model(num_classes=3):
     return VocalizationCNN(num_classes=num_classes)
 
 
+def create_gatekeeper_model(num_classes=3):
+    """Create the tiny shared gatekeeper model (one conv block + global pooling)."""
+    torch = get_torch()
+    nn = torch.nn
+
+    class GatekeeperCNN(nn.Module):
+        """Species-independent vocalization classifier used as cascade stage 1."""
+
+        def __init__(self, num_classes=3):
+            super().__init__()
+
+            self.features = nn.Sequential(
+                nn.Conv2d(1, 16, kernel_size=3, padding=1),
+                nn.BatchNorm2d(16),
+                nn.ReLU(),
+                nn.MaxPool2d(4),
+                nn.AdaptiveAvgPool2d(1),
+            )
+
+            self.classifier = nn.Sequential(
+                nn.Flatten(),
+                nn.Linear(16, num_classes)
+            )
+
+        def forward(self, x):
+            x = self.features(x)
+            x = self.classifier(x)
+            return x
+
+    return GatekeeperCNN(num_classes=num_classes)
+
+
 class VocalizationClassifier:
     """
     Classifier for vocalization types (song/call/alarm).
@@ -207,15 +290,56 @@ class VocalizationClassifier:
             print(f"{result['type']} ({result['confidence']:.0%})")
     """
 
-    def __init__(self, models_dir: str | Path, max_cached_models: int = 5, language: str = 'en'):
+    def __init__(self, models_dir: str | Path, max_cached_models: int = 5, language: str = 'en',
+                 cascade_threshold: float | None = None,
+                 cascade_audit_rate: float = DEFAULT_CASCADE_AUDIT_RATE,
+                 signal_gate: bool = True, profile: bool = False):
         self.models_dir = Path(models_dir)
         self.models_cache = {}
         self.cache_order = []  # LRU tracking
         self.max_cached_models = max_cached_models
+        self.model_cache_stats = {'hits': 0, 'misses': 0}
         self.available_models = {}
         self._initialized = False
         self.language = language if language in TRANSLATIONS else 'en'
 
+        # Signal gate: skipped inferences per species and reason
+        self.signal_gate = signal_gate
+        self.gate_stats = {}
+
+        # Cascade mode (disabled when threshold is None or no gatekeeper model exists)
+        self.cascade_threshold = cascade_threshold
+        self.cascade_audit_rate = cascade_audit_rate
+        self._gatekeeper = None
+        self._gatekeeper_loaded = False
+        self._rng = np.random.default_rng()
+        self.cascade_stats = {
+            'runs': 0,          # clips seen by the gatekeeper
+            'early_exits': 0,   # confident clips answered by the gatekeeper alone
+            'audited': 0,       # confident clips re-checked with the species model
+            'agreed': 0,        # audited clips where both models agree
+            'fallthrough': 0,   # uncertain clips answered by the species model
+            'fallthrough_agreed': 0,  # uncertain clips where the gatekeeper still agreed
+        }
+
+        # Per-stage timing hook, stage_hook(stage, seconds): decode, mel, resize,
+        # model_load (cache misses only) and inference
+        self.stage_hook = None
+
+        # Profiling mode: classify() results carry the timings of their stages
+        self.profile = profile
+        self._timings = None       # timings of the classify() call in progress
+        self.last_timings = None   # timings of the last classify() call, also without a result
+
+    def _observe(self, stage: str, started: float):
+        """Report the time since started (perf_counter) for a stage to the hook and profile."""
+        seconds = time.perf_counter() - started
+        if self.stage_hook is not None:
+            self.stage_hook(stage, seconds)
+        if self._timings is not None:
+            # Summed: a cascade runs inference twice
+            self._timings[stage] = self._timings.get(stage, 0.0) + seconds
+
     def _init_lazy(self):
         """Lazy initialization - only load when needed."""
         if self._initialized:
@@ -234,17 +358,11 @@ class VocalizationClassifier:
             return
 
         for model_file in self.models_dir.glob("*.pt"):
-            name = model_file.stem
-            # New format: Scientific_name.pt (e.g., Turdus_merula.pt)
-            # Old format: species_name_cnn_v1.pt (deprecated)
-
-            # Remove any _cnn_v1 suffix (for backwards compatibility)
-            species_name = re.sub(r'_cnn_v\d+$', '', name)
-
+            if model_file.name == GATEKEEPER_FILE:
+                continue
             # Store by scientific name (normalized: lowercase, spaces)
             # e.g., "Turdus_merula" -> "turdus merula"
-            key = species_name.replace('_', ' ').lower()
-            self.available_models[key] = model_file
+            self.available_models[species_key(model_file)] = model_file
 
         logger.info(f"Vocalization classifier: {len(self.available_models)} models loaded")
 
@@ -275,17 +393,28 @@ class VocalizationClassifier:
         logger.debug(f"No model found for '{normalized}'. Available models sample: {list(self.available_models.keys())[:5]}")
         return None
 
-    def _load_model(self, model_path: Path):
-        """Load model with LRU caching. Returns (model, class_names)."""
-        path_str = str(model_path)
+    def _load_model(self, model_path: Path, tier: str = TIER_FULL):
+        """Load model with LRU caching. Returns (model, class_names).
+
+        Quantized tiers are derived from the fp32 checkpoint on load and
+        cached separately from the full model.
+        """
+        path_str = str(model_path) if tier == TIER_FULL else f"{model_path}#{tier}"
 
         # Cache hit
         if path_str in self.models_cache:
+            self.model_cache_stats['hits'] += 1
+            if self._timings is not None:
+                self._timings['model_cache'] = 'hit'
             if path_str in self.cache_order:
                 self.cache_order.remove(path_str)
             self.cache_order.append(path_str)
             return self.models_cache[path_str]
 
+        self.model_cache_stats['misses'] += 1
+        if self._timings is not None:
+            self._timings['model_cache'] = 'miss'
+        started = time.perf_counter()
         try:
             torch = get_torch()
             checkpoint = torch.load(model_path, map_location='cpu', weights_only=False)
@@ -295,6 +424,12 @@ class VocalizationClassifier:
             model.load_state_dict(checkpoint['model_state_dict'])
             model.eval()
 
+            if tier != TIER_FULL:
+                # Dynamic int8 quantization of the (large) linear layers
+                model = torch.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+
             class_names = checkpoint.get('class_names', ['song', 'call', 'alarm'])
 
             # LRU cache cleanup
@@ -305,19 +440,152 @@ class VocalizationClassifier:
 
             self.models_cache[path_str] = (model, class_names)
             self.cache_order.append(path_str)
+            self._observe('model_load', started)
             return (model, class_names)
 
         except Exception as e:
             logger.error(f"Error loading model {model_path}: {e}")
             return None
 
-    def _audio_to_spectrogram(self, audio_path: Path) -> np.ndarray | None:
-        """Convert audio to mel spectrogram."""
+    def _load_gatekeeper(self):
+        """Load the shared gatekeeper model once. Returns (model, class_names) or None."""
+        if self._gatekeeper_loaded:
+            return self._gatekeeper
+        self._gatekeeper_loaded = True
+
+        gatekeeper_path = self.models_dir / GATEKEEPER_FILE
+        if not gatekeeper_path.exists():
+            logger.warning(f"Cascade enabled but no gatekeeper model found: {gatekeeper_path}")
+            return None
+
+        try:
+            torch = get_torch()
+            checkpoint = torch.load(gatekeeper_path, map_location='cpu', weights_only=False)
+            model = create_gatekeeper_model(num_classes=checkpoint.get('num_classes', 3))
+            model.load_state_dict(checkpoint['model_state_dict'])
+            model.eval()
+            self._gatekeeper = (model, checkpoint.get('class_names', ['song', 'call', 'alarm']))
+        except Exception as e:
+            logger.error(f"Error loading gatekeeper model {gatekeeper_path}: {e}")
+        return self._gatekeeper
+
+    def _predict(self, model, spectrogram: np.ndarray) -> np.ndarray:
+        """Run a model on a 128x128 spectrogram. Returns class probabilities."""
+        torch = get_torch()
+        started = time.perf_counter()
+        x = torch.FloatTensor(spectrogram).unsqueeze(0).unsqueeze(0)
+        with torch.no_grad():
+            outputs = model(x)
+            probas = torch.softmax(outputs, dim=1)[0].numpy()
+        self._observe('inference', started)
+        return probas
+
+    def _build_result(self, probas: np.ndarray, class_names: list[str], model_name: str, tier: str,
+                      peaks: str | None = None) -> dict:
+        """Build the classify() result dict from class probabilities."""
+        class_idx = int(probas.argmax())
+        voc_type = class_names[class_idx]
+
+        # Translate type to selected language
+        trans = TRANSLATIONS.get(self.language, TRANSLATIONS['en'])
+        voc_type_translated = trans.get(voc_type, voc_type)
+
+        return {
+            'type': voc_type,  # Always English internally
+            'type_display': voc_type_translated,  # Translated for display
+            'confidence': float(probas[class_idx]),
+            'model': model_name,
+            'tier': tier,
+            'peaks': peaks,
+            'probabilities': {
+                name: float(probas[i])
+                for i, name in enumerate(class_names)
+            }
+        }
+
+    def cascade_report(self) -> dict:
+        """Early-exit rate and agreement of the gatekeeper with the species models."""
+        s = self.cascade_stats
+        runs = s['runs']
+        return {
+            **s,
+            'early_exit_rate': s['early_exits'] / runs if runs else 0.0,
+            'audit_agreement': s['agreed'] / s['audited'] if s['audited'] else None,
+            'fallthrough_agreement': s['fallthrough_agreed'] / s['fallthrough'] if s['fallthrough'] else None,
+        }
+
+    def cache_report(self) -> list[dict]:
+        """Models held in memory, least recently used first, with their tensor sizes."""
+        report = []
+        for key in list(self.cache_order):
+            entry = self.models_cache.get(key)
+            if entry is None:
+                continue
+            model, class_names = entry
+            path, _, tier = key.partition('#')
+            report.append({'model': Path(path).name, 'tier': tier or TIER_FULL,
+                           'classes': class_names, 'bytes': model_bytes(model)})
+        if self._gatekeeper is not None:
+            model, class_names = self._gatekeeper
+            report.append({'model': GATEKEEPER_FILE, 'tier': TIER_FULL,
+                           'classes': class_names, 'bytes': model_bytes(model)})
+        return report
+
+    def _load_audio(self, audio_path: Path, sample_rate: int = SAMPLE_RATE) -> np.ndarray | None:
+        """Decode the first segment of an audio file (mono, not padded)."""
+        try:
+            librosa = get_librosa()
+            audio, sr = librosa.load(
+                str(audio_path), sr=sample_rate, mono=True, duration=SEGMENT_DURATION
+            )
+            return audio
+        except Exception as e:
+            logger.error(f"Audio decode error: {e}")
+            return None
+
+    def _check_signal(self, audio: np.ndarray, sample_rate: int) -> str | None:
+        """Cheap energy/SNR gate on the decoded waveform.
+
+        Returns the reason to skip ('empty', 'silent', 'clipped', 'low_snr'),
+        or None when the clip is worth classifying. Min-max normalisation of
+        the mel spectrogram would otherwise stretch silence or noise into a
+        confident-looking input.
+        """
+        if len(audio) < sample_rate * MIN_AUDIO_SECONDS:
+            return 'empty'
+
+        rms = np.sqrt(np.mean(np.square(audio, dtype=np.float64)))
+        if 20 * np.log10(rms + 1e-12) < SILENCE_DBFS:
+            return 'silent'
+
+        if np.mean(np.abs(audio) >= CLIP_LEVEL) > MAX_CLIPPED_FRACTION:
+            return 'clipped'
+
+        # Frame energies: loud frames vs quiet frames approximates SNR
+        frame = int(sample_rate * SNR_FRAME_SECONDS)
+        n_frames = len(audio) // frame
+        if n_frames >= 4:
+            energy = np.mean(np.square(audio[:n_frames * frame].reshape(n_frames, frame)), axis=1)
+            noise, signal = np.percentile(energy, [10, 90])
+            if 10 * np.log10((signal + 1e-12) / (noise + 1e-12)) < MIN_SNR_DB:
+                return 'low_snr'
+
+        return None
+
+    def _waveform_to_spectrogram(self, audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray | None:
+        """Convert a decoded waveform to a normalised mel spectrogram.
+
+        FFT and hop sizes scale with the sample rate so a reduced-rate decode
+        keeps the same time/frequency resolution.
+        """
         try:
             librosa = get_librosa()
-            audio, sr = librosa.load(str(audio_path), sr=SAMPLE_RATE, mono=True)
 
-            segment_samples = int(SEGMENT_DURATION * SAMPLE_RATE)
+            scale = sample_rate / SAMPLE_RATE
+            n_fft = int(N_FFT * scale)
+            hop_length = int(HOP_LENGTH * scale)
+
+            segment_samples = int(SEGMENT_DURATION * sample_rate)
             if len(audio) < segment_samples:
                 padded = np.zeros(segment_samples)
                 padded[:len(audio)] = audio
@@ -326,8 +594,8 @@ class VocalizationClassifier:
                 audio = audio[:segment_samples]
 
             mel_spec = librosa.feature.melspectrogram(
-                y=audio, sr=SAMPLE_RATE, n_mels=N_MELS,
-                n_fft=N_FFT, hop_length=HOP_LENGTH,
+                y=audio, sr=sample_rate, n_mels=N_MELS,
+                n_fft=n_fft, hop_length=hop_length,
                 fmin=FMIN, fmax=FMAX
             )
 
@@ -341,17 +609,79 @@ class VocalizationClassifier:
             logger.error(f"Audio processing error: {e}")
             return None
 
+    def _audio_to_spectrogram(self, audio_path: Path, sample_rate: int = SAMPLE_RATE) -> np.ndarray | None:
+        """Convert audio to mel spectrogram."""
+        audio = self._load_audio(audio_path, sample_rate)
+        if audio is None:
+            return None
+        return self._waveform_to_spectrogram(audio, sample_rate)
+
+    def _resize_input(self, spectrogram: np.ndarray) -> np.ndarray:
+        """Resize a spectrogram to the 128x128 model input if needed."""
+        if spectrogram.shape != (128, 128):
+            from skimage.transform import resize
+            spectrogram = resize(spectrogram, (128, 128), anti_aliasing=True)
+        return spectrogram
+
+    def model_input(self, audio_path: str | Path, tier: str = TIER_FULL) -> np.ndarray | None:
+        """The normalised 128x128 mel spectrogram classify() feeds the models for a clip."""
+        sample_rate = REDUCED_SAMPLE_RATE if tier == TIER_REDUCED else SAMPLE_RATE
+        spectrogram = self._audio_to_spectrogram(Path(audio_path), sample_rate)
+        if spectrogram is None:
+            return None
+        return self._resize_input(spectrogram)
+
+    def spectrogram_signature(self, tier: str = TIER_FULL) -> str:
+        """Parameters that determine the model input of a tier."""
+        sample_rate = REDUCED_SAMPLE_RATE if tier == TIER_REDUCED else SAMPLE_RATE
+        return (f"sr={sample_rate},mels={N_MELS},fft={N_FFT},hop={HOP_LENGTH},"
+                f"fmin={FMIN},fmax={FMAX},dur={SEGMENT_DURATION}")
+
+    def gate_report(self) -> dict:
+        """Inferences saved by the signal gate, per species and reason."""
+        return {
+            species: dict(reasons)
+            for species, reasons in sorted(self.gate_stats.items())
+        }
+
     def has_model(self, species_name: str) -> bool:
         """Check if a model exists for this species."""
         self._init_lazy()
         return self._find_model(species_name) is not None
 
+    def result_signature(self, scientific_name: str, tier: str = TIER_FULL) -> str | None:
+        """Identity of everything besides the audio that determines a classify() result.
+
+        Covers the model file (name, size, mtime), the spectrogram parameters,
+        tier, language and cascade settings. Returns None if there is no model.
+        """
+        model_path = self._find_model(scientific_name)
+        if not model_path:
+            return None
+
+        def file_identity(path: Path) -> str:
+            try:
+                st = path.stat()
+            except OSError:
+                return f"{path.name}:missing"
+            return f"{path.name}:{st.st_size}:{st.st_mtime_ns}"
+
+        parts = [
+            file_identity(model_path),
+            self.spectrogram_signature(tier),
+            f"tier={tier}",
+            f"lang={self.language}",
+        ]
+        if self.cascade_threshold is not None:
+            parts.append(f"cascade={self.cascade_threshold}:{file_identity(self.models_dir / GATEKEEPER_FILE)}")
+        return "|".join(parts)
+
     def get_available_species(self) -> list[str]:
         """Get list of species with available models."""
         self._init_lazy()
         return [name.title() for name in self.available_models.keys()]
 
-    def classify(self, scientific_name: str, audio_path: str | Path) -> dict | None:
+    def classify(self, scientific_name: str, audio_path: str | Path, tier: str = TIER_FULL) -> dict | None:
         """
         Classify vocalization type.
 
@@ -359,10 +689,34 @@ class VocalizationClassifier:
             scientific_name: Species scientific name (e.g., "Turdus merula")
                            Works with any format: "Turdus merula", "Turdus_merula", "turdus merula"
             audio_path: Path to audio file (MP3 or WAV)
+            tier: Quality tier (full, quantized or reduced)
 
         Returns:
-            Dict with type, confidence, probabilities, or None if not possible
+            Dict with type, confidence, probabilities, tier and peaks (base64
+            waveform_peaks() of the decoded segment), or None if not possible.
+            In profiling mode the dict also has 'timings': seconds per stage
+            (decode, mel, resize, model_load, inference, classify for the
+            whole call) and model_cache ('hit' or 'miss').
         """
+        if not self.profile:
+            return self._classify(scientific_name, audio_path, tier)
+
+        self._timings = {}
+        started = time.perf_counter()
+        try:
+            result = self._classify(scientific_name, audio_path, tier)
+        finally:
+            self._timings['classify'] = time.perf_counter() - started
+            self.last_timings, self._timings = self._timings, None
+        if result is not None:
+            result['timings'] = dict(self.last_timings)
+        return result
+
+    def _classify(self, scientific_name: str, audio_path: str | Path, tier: str) -> dict | None:
+        """classify() without the profiling wrapper."""
+        if tier not in TIERS:
+            raise ValueError(f"Unknown tier: {tier} (expected one of {', '.join(TIERS)})")
+
         model_path = self._find_model(scientific_name)
         if not model_path:
             return None
@@ -371,49 +725,76 @@ class VocalizationClassifier:
         if not audio_path.exists():
             return None
 
-        result = self._load_model(model_path)
-        if result is None:
+        sample_rate = REDUCED_SAMPLE_RATE if tier == TIER_REDUCED else SAMPLE_RATE
+        started = time.perf_counter()
+        audio = self._load_audio(audio_path, sample_rate)
+        if audio is None:
             return None
-
-        model, class_names = result
-
-        spectrogram = self._audio_to_spectrogram(audio_path)
+        self._observe('decode', started)
+
+        # Skip near-silent, clipped or noise-only clips before any model load
+        if self.signal_gate:
+            reason = self._check_signal(audio, sample_rate)
+            if reason is not None:
+                species = self._normalize_name(scientific_name)
+                reasons = self.gate_stats.setdefault(species, {})
+                reasons[reason] = reasons.get(reason, 0) + 1
+                logger.debug(f"Signal gate skipped {audio_path.name} ({scientific_name}): {reason}")
+                return None
+
+        # Waveform preview from the same decode (base64, so results stay JSON)
+        peaks = base64.b64encode(waveform_peaks(audio)).decode()
+
+        started = time.perf_counter()
+        spectrogram = self._waveform_to_spectrogram(audio, sample_rate)
         if spectrogram is None:
             return None
+        self._observe('mel', started)
 
         try:
-            torch = get_torch()
-
-            # Resize to 128x128 if needed
-            if spectrogram.shape != (128, 128):
-                from skimage.transform import resize
-                spectrogram = resize(spectrogram, (128, 128), anti_aliasing=True)
-
-            # To tensor
-            x = torch.FloatTensor(spectrogram).unsqueeze(0).unsqueeze(0)
-
-            with torch.no_grad():
-                outputs = model(x)
-                probas = torch.softmax(outputs, dim=1)[0]
-
-            class_idx = probas.argmax().item()
-            confidence = probas[class_idx].item()
-            voc_type = class_names[class_idx]
-
-            # Translate type to selected language
-            trans = TRANSLATIONS.get(self.language, TRANSLATIONS['en'])
-            voc_type_translated = trans.get(voc_type, voc_type)
-
-            return {
-                'type': voc_type,  # Always English internally
-                'type_display': voc_type_translated,  # Translated for display
-                'confidence': confidence,
-                'model': model_path.name,
-                'probabilities': {
-                    name: probas[i].item()
-                    for i, name in enumerate(class_names)
-                }
-            }
+            started = time.perf_counter()
+            spectrogram = self._resize_input(spectrogram)
+            self._observe('resize', started)
+
+            # Stage 1: cheap shared gatekeeper answers confident clips
+            gate = None
+            if self.cascade_threshold is not None:
+                gatekeeper = self._load_gatekeeper()
+                if gatekeeper is not None:
+                    gate_model, gate_classes = gatekeeper
+                    gate_probas = self._predict(gate_model, spectrogram)
+                    gate = self._build_result(gate_probas, gate_classes, GATEKEEPER_FILE, tier, peaks)
+                    self.cascade_stats['runs'] += 1
+
+                    # Occasionally confirm a confident answer with the full model to measure agreement
+                    if (gate['confidence'] >= self.cascade_threshold
+                            and self._rng.random() >= self.cascade_audit_rate):
+                        self.cascade_stats['early_exits'] += 1
+                        gate['cascade'] = 'early_exit'
+                        return gate
+
+            # Stage 2: full species model (no gatekeeper fallback: same as without cascade)
+            loaded = self._load_model(model_path, tier)
+            if loaded is None:
+                return None
+
+            model, class_names = loaded
+            probas = self._predict(model, spectrogram)
+            result = self._build_result(probas, class_names, model_path.name, tier, peaks)
+
+            if gate is not None:
+                agreed = gate['type'] == result['type']
+                if gate['confidence'] >= self.cascade_threshold:
+                    # Audited confident clip: record agreement, store the full model's answer
+                    self.cascade_stats['audited'] += 1
+                    self.cascade_stats['agreed'] += int(agreed)
+                    result['cascade'] = 'audited'
+                    return result
+                self.cascade_stats['fallthrough'] += 1
+                self.cascade_stats['fallthrough_agreed'] += int(agreed)
+                result['cascade'] = 'full'
+
+            return result
 
         except Exception as e:
             logger.error(f"Classification error: {e}")
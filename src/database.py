@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Vocalization Database Schema
+
+Versioned migrations for vocalization.db. The schema version is stored in
+SQLite's user_version; each migration runs once, in its own transaction,
+and is written to be safe on databases created by earlier releases (which
+all report version 0).
+
+Usage:
+    conn = sqlite3.connect("vocalization.db")
+    migrate(conn, birdnet_db=Path("/home/pi/BirdNET-Pi/scripts/birds.db"))
+"""
+
+import json
+import logging
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+import anomaly
+import rollups
+import species
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'  # same as SQLite's CURRENT_TIMESTAMP (UTC)
+BACKFILL_CHUNK = 500
+
+# Class probabilities stored as REAL columns (migration 9), so SQL can filter
+# and aggregate them. The probabilities JSON text is only kept for results
+# whose classes differ from these.
+PROBABILITY_COLUMNS = {"song": "p_song", "call": "p_call", "alarm": "p_alarm"}
+# The probabilities object of a row, as the JSON text the API always returned
+PROBABILITIES_JSON = "COALESCE(probabilities, json_object({}))".format(
+    ", ".join(f"'{name}', {column}" for name, column in PROBABILITY_COLUMNS.items())
+)
+
+
+def utc_now() -> str:
+    """Current UTC time as a database timestamp."""
+    return datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def detection_timestamp(date_str: str, time_str: str) -> str | None:
+    """Convert BirdNET-Pi's local Date/Time columns to a UTC database timestamp.
+
+    BirdNET-Pi records local wall-clock time on the same machine the service
+    runs on, so the system timezone is the right one to convert from.
+    """
+    try:
+        local = datetime.strptime(f"{date_str} {time_str}", TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        return None
+    return local.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def bump_generation(cursor: sqlite3.Cursor):
+    """Mark the dashboard data as changed, inside the caller's transaction.
+
+    The web viewer's response cache compares this counter instead of
+    recomputing aggregates on every poll.
+    """
+    cursor.execute("""
+        INSERT INTO service_state (key, value) VALUES ('data_generation', 1)
+        ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+    """)
+
+
+def read_generation(conn: sqlite3.Connection) -> int | None:
+    """Current data generation, or None if the database predates it."""
+    try:
+        row = conn.execute("SELECT value FROM service_state WHERE key = 'data_generation'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return int(row[0]) if row else 0
+
+
+def write_state(cursor: sqlite3.Cursor, key: str, value):
+    """Store a service_state value, inside the caller's transaction."""
+    cursor.execute("INSERT OR REPLACE INTO service_state (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def read_state(conn: sqlite3.Connection, key: str) -> str | None:
+    """A service_state value, or None if unset."""
+    row = conn.execute("SELECT value FROM service_state WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def probability_values(probabilities: dict) -> tuple:
+    """(p_song, p_call, p_alarm, probabilities JSON or None) for a result row."""
+    typed = tuple(probabilities.get(name) for name in PROBABILITY_COLUMNS)
+    extra = json.dumps(probabilities) if set(probabilities) != set(PROBABILITY_COLUMNS) else None
+    return (*typed, extra)
+
+
+def select_columns(columns: tuple[str, ...]) -> str:
+    """SELECT list for API columns ('probabilities' is rebuilt from the typed columns)."""
+    return ", ".join(
+        f"{PROBABILITIES_JSON} AS probabilities" if column == "probabilities" else column
+        for column in columns
+    )
+
+
+def _columns(cursor: sqlite3.Cursor, table: str) -> set[str]:
+    return {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+
+
+def _base_schema(cursor: sqlite3.Cursor, birdnet_db: Path | None):
+    """Tables of all releases before versioned migrations."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS vocalizations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            birdnet_id INTEGER UNIQUE,
+            file_name TEXT,
+            common_name TEXT,
+            scientific_name TEXT,
+            vocalization_type TEXT,
+            vocalization_type_display TEXT,
+            confidence REAL,
+            probabilities TEXT,
+            classified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    if 'tier' not in _columns(cursor, 'vocalizations'):
+        cursor.execute("ALTER TABLE vocalizations ADD COLUMN tier TEXT DEFAULT 'full'")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS service_state (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+
+    # Result cache keyed by audio fingerprint + model/spectrogram signature
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS result_cache (
+            cache_key TEXT PRIMARY KEY,
+            result TEXT,
+            last_used REAL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_result_cache_last_used ON result_cache(last_used)
+    """)
+
+    rollups.create_tables(cursor)
+
+
+def _detection_time(cursor: sqlite3.Cursor, birdnet_db: Path | None):
+    """Add detected_at (BirdNET's detection time, UTC), backfilled from birds.db.
+
+    Dashboard windows used classification time, which bunches a backlog
+    catch-up into the hour it was processed. Rows whose detection can no
+    longer be found fall back to classified_at.
+    """
+    if 'detected_at' not in _columns(cursor, 'vocalizations'):
+        cursor.execute("ALTER TABLE vocalizations ADD COLUMN detected_at TIMESTAMP")
+
+    if birdnet_db is not None and birdnet_db.exists():
+        birdnet = sqlite3.connect(f"file:{birdnet_db}?mode=ro", uri=True)
+        cursor.execute("SELECT birdnet_id FROM vocalizations WHERE detected_at IS NULL")
+        pending = [row[0] for row in cursor.fetchall()]
+        for start in range(0, len(pending), BACKFILL_CHUNK):
+            chunk = pending[start:start + BACKFILL_CHUNK]
+            rows = birdnet.execute(
+                f"SELECT rowid, Date, Time FROM detections WHERE rowid IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchall()
+            cursor.executemany(
+                "UPDATE vocalizations SET detected_at = ? WHERE birdnet_id = ?",
+                [(detection_timestamp(date, time), rowid) for rowid, date, time in rows]
+            )
+        birdnet.close()
+        logger.info(f"Backfilled detection time for {len(pending)} vocalizations from {birdnet_db}")
+
+    cursor.execute("UPDATE vocalizations SET detected_at = classified_at WHERE detected_at IS NULL")
+
+    # Rollups are keyed by detection time from now on
+    rollups.rebuild(cursor.connection, commit=False)
+
+
+def _covering_indexes(cursor: sqlite3.Cursor, birdnet_db: Path | None):
+    """Indexes for the dashboard's filters and sort order.
+
+    The UNIQUE constraint on birdnet_id already has an index, so the
+    separate idx_birdnet_id is dropped.
+    """
+    cursor.execute("DROP INDEX IF EXISTS idx_birdnet_id")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_voc_detected
+        ON vocalizations(detected_at)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_voc_type_detected
+        ON vocalizations(vocalization_type, detected_at)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_voc_common_detected
+        ON vocalizations(common_name, detected_at)
+    """)
+    cursor.execute("ANALYZE")
+
+
+def _audio_path(cursor: sqlite3.Cursor, birdnet_db: Path | None):
+    """Remember where the service found each clip, for the viewer's audio endpoint."""
+    if 'audio_path' not in _columns(cursor, 'vocalizations'):
+        cursor.execute("ALTER TABLE vocalizations ADD COLUMN audio_path TEXT")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_voc_file_name
+        ON vocalizations(file_name)
+    """)
+
+
+def _name_filters(cursor: sqlite3.Cursor, birdnet_db: Path | None):
+    """Case-insensitive indexes for the viewer's exact and prefix name filters.
+
+    With NOCASE collation, both `name = ? COLLATE NOCASE` and `name LIKE 'x%'`
+    are index range scans, already in detection-time order.
+    """
+    cursor.execute("DROP INDEX IF EXISTS idx_voc_common_detected")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_voc_common_nocase_detected
+        ON vocalizations(common_name COLLATE NOCASE, detected_at)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_voc_scientific_nocase_detected
+        ON vocalizations(scientific_name COLLATE NOCASE, detected_at)
+    """)
+    cursor.execute("ANALYZE")
+
+
+def _species_search(cursor: sqlite3.Cursor, birdnet_db: Path | None):
+    """Species directory with a trigram name index, synced by triggers."""
+    species.create_tables(cursor)
+    species.rebuild(cursor.connection, commit=False)
+
+
+def _alerts(cursor: sqlite3.Cursor, birdnet_db: Path | None):
+    """Alerts materialised by the service's anomaly detector."""
+    anomaly.create_tables(cursor)
+
+
+def _species_counter(cursor: sqlite3.Cursor, birdnet_db: Path | None):
+    """Trigger-maintained count of species with results, for /api/stats."""
+    rollups.create_tables(cursor)
+    rollups.reset_species_count(cursor)
+
+
+def _probability_columns(cursor: sqlite3.Cursor, birdnet_db: Path | None):
+    """Class probabilities as REAL columns, backfilled from the JSON text.
+
+    The JSON is cleared for rows whose classes are exactly song/call/alarm;
+    freed space is reused by new rows (VACUUM returns it to the SD card).
+    """
+    existing = _columns(cursor, 'vocalizations')
+    for column in PROBABILITY_COLUMNS.values():
+        if column not in existing:
+            cursor.execute(f"ALTER TABLE vocalizations ADD COLUMN {column} REAL")
+
+    assignments = ", ".join(
+        f"{column} = json_extract(probabilities, '$.{name}')" for name, column in PROBABILITY_COLUMNS.items()
+    )
+    cursor.execute(f"UPDATE vocalizations SET {assignments} WHERE json_valid(probabilities)")
+    cursor.execute(f"""
+        UPDATE vocalizations SET probabilities = NULL
+        WHERE json_valid(probabilities)
+        AND (SELECT COUNT(*) FROM json_each(probabilities)) = {len(PROBABILITY_COLUMNS)}
+        AND {" AND ".join(f"{column} IS NOT NULL" for column in PROBABILITY_COLUMNS.values())}
+    """)
+    logger.info(f"Moved class probabilities of {cursor.rowcount} vocalizations to typed columns")
+
+
+def _retention(cursor: sqlite3.Cursor, birdnet_db: Path | None):
+    """Archived detection counts in the species directory (see retention.py)."""
+    if 'archived' not in _columns(cursor, 'species'):
+        cursor.execute("ALTER TABLE species ADD COLUMN archived INTEGER NOT NULL DEFAULT 0")
+
+
+def _waveform_peaks(cursor: sqlite3.Cursor, birdnet_db: Path | None):
+    """Min/max waveform summary per result (classifier.waveform_peaks), for /api/peaks."""
+    if 'peaks' not in _columns(cursor, 'vocalizations'):
+        cursor.execute("ALTER TABLE vocalizations ADD COLUMN peaks BLOB")
+
+
+# (version, description, function) - append only, never renumber
+MIGRATIONS = [
+    (1, "base schema", _base_schema),
+    (2, "detection timestamp", _detection_time),
+    (3, "covering indexes", _covering_indexes),
+    (4, "audio path", _audio_path),
+    (5, "name filter indexes", _name_filters),
+    (6, "species search", _species_search),
+    (7, "alerts", _alerts),
+    (8, "species counter", _species_counter),
+    (9, "probability columns", _probability_columns),
+    (10, "retention", _retention),
+    (11, "waveform peaks", _waveform_peaks),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def migrate(conn: sqlite3.Connection, birdnet_db: Path | None = None) -> int:
+    """Apply pending migrations. Returns the resulting schema version."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+    for number, description, apply in MIGRATIONS:
+        if number <= version:
+            continue
+        logger.info(f"Applying database migration {number}: {description}")
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            apply(cursor, birdnet_db)
+            bump_generation(cursor)
+            cursor.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = number
+
+    return version
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Dashboard Event Stream (Server-Sent Events)
+
+Pushes new classifications and stat deltas to open dashboards instead of
+letting every tab poll. One broadcaster thread serves all clients: it
+checks the data generation every few seconds while anyone is connected,
+and only queries rows past the lowest vocalizations.id any client has
+seen. Client sockets are handed over from the request workers, so an
+idle dashboard costs no worker and no query of its own.
+
+Events:
+    id: <vocalization id>   event: vocalization   data: {row}
+    event: stats            data: {"total": +n, "song": +n, ..., "species": +n}
+    event: reset            data: {}     (too far behind: reload everything)
+
+Usage:
+    stream = EventStream(data_dir, columns)
+    stream.start()
+    stream.add_client(sock, last_id)     # after sending the SSE headers
+"""
+
+import json
+import logging
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import database
+import rollups
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 2.0      # seconds between data generation checks
+HEARTBEAT_INTERVAL = 15.0  # keep-alive comment so dead clients are noticed
+SEND_TIMEOUT = 5.0       # drop clients that cannot take an event this fast
+MAX_CLIENTS = 64
+MAX_BACKLOG = 500        # rows replayed on resume before asking for a reset
+RETRY_MS = 5000          # browser reconnect delay
+
+
+class StreamClient:
+    """One connected dashboard."""
+
+    def __init__(self, sock: socket.socket, last_id: int):
+        self.sock = sock
+        self.last_id = last_id
+
+    def send(self, payload: bytes) -> bool:
+        try:
+            self.sock.sendall(payload)
+            return True
+        except OSError:
+            return False
+
+
+def format_event(event: str, data, event_id: int | None = None) -> bytes:
+    """Encode one SSE event."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+class EventStream:
+    """Broadcaster of new vocalizations to SSE clients."""
+
+    def __init__(self, data_dir: Path, columns: tuple[str, ...],
+                 poll_interval: float = POLL_INTERVAL, max_clients: int = MAX_CLIENTS):
+        self.db_path = data_dir / "vocalization.db"
+        self.columns = columns
+        self.poll_interval = poll_interval
+        self.max_clients = max_clients
+        self._clients = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._conn = None
+        self._generation = None
+        self._totals = None
+        self._last_heartbeat = time.monotonic()
+        self.stats = {'connects': 0, 'events': 0, 'polls': 0, 'dropped': 0}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="event-stream", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            self._close(client)
+
+    def is_full(self) -> bool:
+        with self._lock:
+            return len(self._clients) >= self.max_clients
+
+    def owns(self, sock: socket.socket) -> bool:
+        """True if sock was handed over and must not be closed by the server."""
+        with self._lock:
+            return any(client.sock is sock for client in self._clients)
+
+    def add_client(self, sock: socket.socket, last_id: int):
+        """Take over a socket whose SSE response headers were already sent."""
+        sock.settimeout(SEND_TIMEOUT)
+        with self._lock:
+            self._clients.append(StreamClient(sock, last_id))
+            self.stats['connects'] += 1
+        # Replay anything the client missed right away
+        self._generation = None
+        self._wake.set()
+
+    def report(self) -> dict:
+        with self._lock:
+            return {**self.stats, 'clients': len(self._clients)}
+
+    def _close(self, client: StreamClient):
+        try:
+            client.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        client.sock.close()
+
+    def _drop(self, clients: list[StreamClient]):
+        with self._lock:
+            clients = [c for c in clients if c in self._clients]
+            self._clients = [c for c in self._clients if c not in clients]
+            self.stats['dropped'] += len(clients)
+        for client in clients:
+            self._close(client)
+
+    def _db(self) -> sqlite3.Connection | None:
+        if self._conn is None and self.db_path.exists():
+            self._conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            self._conn.execute("PRAGMA query_only = ON")
+        return self._conn
+
+    def _read_totals(self, conn: sqlite3.Connection) -> dict[str, int]:
+        totals = {"total": 0, "species": 0}
+        for vtype, count in conn.execute(
+            "SELECT vocalization_type, SUM(count) FROM rollup_totals GROUP BY vocalization_type"
+        ):
+            totals[vtype] = count
+            totals["total"] += count
+        totals["species"] = rollups.species_count(conn)
+        return totals
+
+    def _publish(self, conn: sqlite3.Connection, clients: list[StreamClient]):
+        """Send new rows (per client high-water mark) and stat deltas."""
+        since = min(client.last_id for client in clients)
+        rows = conn.execute(
+            f"SELECT {database.select_columns(self.columns)} FROM vocalizations WHERE id > ? ORDER BY id LIMIT ?",
+            (since, MAX_BACKLOG + 1)
+        ).fetchall()
+        id_index = self.columns.index("id")
+        behind = False
+
+        totals = self._read_totals(conn)
+        delta = None
+        if self._totals is not None:
+            keys = set(totals) | set(self._totals)
+            delta = {k: totals.get(k, 0) - self._totals.get(k, 0) for k in keys}
+            delta = {k: v for k, v in delta.items() if v} or None
+        self._totals = totals
+
+        failed = []
+        for client in clients:
+            pending = [row for row in rows if row[id_index] > client.last_id]
+            if len(pending) > MAX_BACKLOG:
+                payload = format_event("reset", {})
+                client.last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM vocalizations").fetchone()[0]
+                behind = True
+            else:
+                payload = b"".join(
+                    format_event("vocalization", dict(zip(self.columns, row)), row[id_index])
+                    for row in pending
+                )
+                if pending:
+                    client.last_id = pending[-1][id_index]
+                self.stats['events'] += len(pending)
+            if delta:
+                payload += format_event("stats", delta)
+            if payload and not client.send(payload):
+                failed.append(client)
+        if failed:
+            self._drop(failed)
+        if behind:
+            # The replay window stopped short for the up-to-date clients
+            self._generation = None
+            self._wake.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            with self._lock:
+                clients = list(self._clients)
+            if not clients:
+                continue  # nobody listening: no database access at all
+
+            try:
+                conn = self._db()
+                if conn is None:
+                    continue
+                self.stats['polls'] += 1
+                generation = database.read_generation(conn)
+                if generation != self._generation:
+                    self._generation = generation
+                    self._publish(conn, clients)
+            except sqlite3.Error as e:
+                logger.warning(f"Event stream query failed: {e}")
+                continue
+
+            now = time.monotonic()
+            if now - self._last_heartbeat >= HEARTBEAT_INTERVAL:
+                self._last_heartbeat = now
+                self._drop([client for client in clients if not client.send(b": ping\n\n")])
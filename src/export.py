@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Bulk Export Writers
+
+Streams query results as CSV, NDJSON or Parquet in constant memory: rows
+are pulled from the database cursor in batches and each batch is encoded
+and written out before the next one is read. Output goes through
+ChunkedWriter (HTTP/1.1 chunked transfer encoding) and optionally
+GzipWriter. Parquet needs the optional pyarrow package and is written one
+row group at a time.
+
+Usage:
+    out = GzipWriter(ChunkedWriter(handler.wfile))
+    writer = open_writer("csv", out, columns)
+    for batch in iter_batches(cursor):
+        writer.write_rows(batch)
+    writer.close()
+"""
+
+import csv
+import heapq
+import io
+import itertools
+import json
+import sqlite3
+import zlib
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# format -> (Content-Type, file extension)
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", ".csv"),
+    "ndjson": ("application/x-ndjson", ".ndjson"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+EXPORT_BATCH = 1000        # rows fetched from the cursor at a time
+PARQUET_ROW_GROUP = 10000  # rows buffered per Parquet row group (bounds memory)
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def iter_batches(cursor: sqlite3.Cursor, size: int = EXPORT_BATCH):
+    """Yield lists of up to size rows until the cursor is exhausted."""
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield rows
+
+
+def merge_batches(streams, key, size: int = EXPORT_BATCH):
+    """Merge batch streams that are each sorted by key into one sorted stream.
+
+    Rows with a key already written are dropped, so a row present in two
+    streams (e.g. the archive and the live table) comes out once.
+    """
+    previous = None
+    batch = []
+    for row in heapq.merge(*(itertools.chain.from_iterable(stream) for stream in streams), key=key):
+        current = key(row)
+        if current == previous:
+            continue
+        previous = current
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ChunkedWriter:
+    """File-like output that frames every write as an HTTP/1.1 chunk.
+
+    With chunked=False writes pass through unchanged (HTTP/1.0 clients:
+    the end of the body is the end of the connection).
+    """
+
+    def __init__(self, wfile, chunked: bool = True):
+        self.wfile = wfile
+        self.chunked = chunked
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        if not data:
+            return 0
+        data = bytes(data)
+        if self.chunked:
+            self.wfile.write(b"%X\r\n%s\r\n" % (len(data), data))
+        else:
+            self.wfile.write(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        self.wfile.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self.chunked:
+            self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class GzipWriter:
+    """Streaming gzip compression in front of another writer."""
+
+    def __init__(self, out, level: int = 6):
+        self.out = out
+        self.position = 0
+        self.closed = False
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip container
+
+    def write(self, data) -> int:
+        self.out.write(self._compressor.compress(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        self.out.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.out.write(self._compressor.flush())
+        self.out.close()
+
+
+class CsvExport:
+    """CSV with a header row."""
+
+    def __init__(self, out, columns: tuple[str, ...]):
+        self.out = out
+        self._write_text([columns])
+
+    def _write_text(self, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        self.out.write(buffer.getvalue().encode())
+
+    def write_rows(self, rows: list[tuple]):
+        self._write_text(rows)
+
+    def close(self):
+        self.out.close()
+
+
+class NdjsonExport:
+    """One JSON object per line."""
+
+    def __init__(self, out, columns: tuple[str, ...]):
+        self.out = out
+        self.columns = columns
+
+    def write_rows(self, rows: list[tuple]):
+        self.out.write("".join(json.dumps(dict(zip(self.columns, row))) + "\n" for row in rows).encode())
+
+    def close(self):
+        self.out.close()
+
+
+class ParquetExport:
+    """Parquet, one row group per PARQUET_ROW_GROUP rows (requires pyarrow)."""
+
+    def __init__(self, out, columns: tuple[str, ...], column_types: dict[str, str] | None = None):
+        types = {"int": pa.int64(), "float": pa.float64()}
+        self.schema = pa.schema([
+            (name, types.get((column_types or {}).get(name), pa.string())) for name in columns
+        ])
+        self.out = out
+        self._rows = []
+        self._writer = pq.ParquetWriter(pa.PythonFile(out, mode="w"), self.schema, compression="zstd")
+
+    def write_rows(self, rows: list[tuple]):
+        self._rows.extend(rows)
+        if len(self._rows) >= PARQUET_ROW_GROUP:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*self._rows), self.schema)]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+        self.out.close()
+
+
+def open_writer(fmt: str, out, columns: tuple[str, ...], column_types: dict[str, str] | None = None):
+    """Export writer for fmt ('csv', 'ndjson' or 'parquet').
+
+    column_types marks 'int' and 'float' columns for Parquet; everything
+    else is written as text.
+    """
+    if fmt == "csv":
+        return CsvExport(out, columns)
+    if fmt == "ndjson":
+        return NdjsonExport(out, columns)
+    if fmt == "parquet":
+        if not parquet_available():
+            raise ValueError("Parquet export needs the optional pyarrow package")
+        return ParquetExport(out, columns, column_types)
+    raise ValueError(f"Unknown export format: {fmt}")
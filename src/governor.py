@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Resource Governor
+
+Keeps vocalization classification from starving BirdNET-Pi's own analysis.
+Reads system pressure from /proc/loadavg, /proc/stat and the thermal zone
+(where present), caps torch intra-op threads, and paces work so this process
+stays within a configurable share of the machine's CPU.
+
+Usage:
+    governor = ResourceGovernor(cpu_budget=0.5)
+    governor.limit_threads()
+    for item in work:
+        governor.wait_for_headroom()
+        started = governor.start()
+        do_work(item)
+        governor.pace(started)
+    print(governor.report())
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PROC_LOADAVG = Path("/proc/loadavg")
+PROC_STAT = Path("/proc/stat")
+THERMAL_ZONE = Path("/sys/class/thermal/thermal_zone0/temp")
+
+DEFAULT_CPU_BUDGET = 0.5       # fraction of all cores this process may use
+DEFAULT_MAX_LOAD = 0.9         # 1-min load per core above which we back off
+DEFAULT_MAX_TEMP = 75.0        # degrees C above which we back off (Pi throttles at 80)
+BACKOFF_SECONDS = 2.0          # sleep per back-off step while the system is busy
+MAX_BACKOFF_SECONDS = 30.0     # never wait longer than this for headroom
+
+
+def read_loadavg() -> float | None:
+    """Return the 1-minute load average, or None if unavailable."""
+    try:
+        return float(PROC_LOADAVG.read_text().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def read_cpu_times() -> tuple[int, int] | None:
+    """Return (busy, total) jiffies from the aggregate cpu line of /proc/stat."""
+    try:
+        with open(PROC_STAT) as f:
+            fields = f.readline().split()
+    except OSError:
+        return None
+    if not fields or fields[0] != "cpu":
+        return None
+    values = [int(v) for v in fields[1:]]
+    # user nice system idle iowait irq softirq steal ...
+    idle = values[3] + (values[4] if len(values) > 4 else 0)
+    total = sum(values[:8])
+    return total - idle, total
+
+
+def read_temperature() -> float | None:
+    """Return SoC temperature in degrees C, or None if there is no thermal zone."""
+    try:
+        return int(THERMAL_ZONE.read_text().strip()) / 1000.0
+    except (OSError, ValueError):
+        return None
+
+
+class ResourceGovernor:
+    """Co-existence governor that paces classification work.
+
+    Two mechanisms are combined:
+    - Budget pacing: after each work item, sleep long enough that this
+      process' CPU time stays below cpu_budget * cores of wall-clock time.
+    - Pressure back-off: before each item, wait while the machine is already
+      loaded (load average, system-wide CPU use, temperature) so BirdNET-Pi
+      can finish its analysis in real time.
+    """
+
+    def __init__(self, cpu_budget: float = DEFAULT_CPU_BUDGET,
+                 max_load: float = DEFAULT_MAX_LOAD,
+                 max_temp: float = DEFAULT_MAX_TEMP,
+                 torch_threads: int | None = None):
+        self.cpu_count = os.cpu_count() or 1
+        self.cpu_budget = min(max(cpu_budget, 0.05), 1.0)
+        self.max_load = max_load
+        self.max_temp = max_temp
+        # Default: leave at least half the cores to BirdNET-Pi
+        if torch_threads is None:
+            torch_threads = max(1, int(self.cpu_count * self.cpu_budget))
+        self.torch_threads = max(1, torch_threads)
+        self._clock_ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self._last_sample = self._sample()
+
+        self.stats = {
+            'items': 0,
+            'busy_seconds': 0.0,
+            'paced_seconds': 0.0,
+            'backoff_seconds': 0.0,
+            'backoff_events': 0,
+            'backoff_reasons': {},
+        }
+
+    def limit_threads(self):
+        """Cap torch intra-op (and, if still possible, inter-op) threads."""
+        from classifier import get_torch
+        torch = get_torch()
+        torch.set_num_threads(self.torch_threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Can only be set before any parallel work has started
+            pass
+        logger.info(f"Torch threads limited to {self.torch_threads} of {self.cpu_count} cores")
+
+    def _sample(self) -> tuple[tuple[int, int] | None, float, float]:
+        """Snapshot of system CPU jiffies, own CPU seconds and wall time."""
+        return read_cpu_times(), time.process_time(), time.monotonic()
+
+    def _other_usage(self) -> tuple[float | None, float]:
+        """CPU use by everything except this process since the previous call.
+
+        Returns (busy fraction of all cores, own cores in use). Our own torch
+        work must not count as pressure, or the governor backs off from itself.
+        """
+        current = self._sample()
+        previous = self._last_sample
+        self._last_sample = current
+
+        (cpu_now, own_now, wall_now), (cpu_prev, own_prev, wall_prev) = current, previous
+        wall = wall_now - wall_prev
+        own_cores = (own_now - own_prev) / wall if wall > 0 else 0.0
+
+        if cpu_now is None or cpu_prev is None:
+            return None, own_cores
+        total = cpu_now[1] - cpu_prev[1]
+        if total <= 0:
+            return None, own_cores
+        busy = cpu_now[0] - cpu_prev[0] - (own_now - own_prev) * self._clock_ticks
+        return max(0.0, busy / total), own_cores
+
+    def pressure_reason(self) -> str | None:
+        """Return why the system is too busy for more work, or None."""
+        temp = read_temperature()
+        if temp is not None and temp >= self.max_temp:
+            return 'thermal'
+
+        busy, own_cores = self._other_usage()
+        if busy is not None and busy >= self.max_load:
+            return 'cpu'
+
+        # The load average lags; discount the cores we were using ourselves
+        load = read_loadavg()
+        if load is not None and (load - own_cores) / self.cpu_count >= self.max_load:
+            return 'load'
+
+        return None
+
+    def wait_for_headroom(self):
+        """Block (bounded) while the system is under pressure."""
+        waited = 0.0
+        while waited < MAX_BACKOFF_SECONDS:
+            reason = self.pressure_reason()
+            if reason is None:
+                break
+            reasons = self.stats['backoff_reasons']
+            reasons[reason] = reasons.get(reason, 0) + 1
+            self.stats['backoff_events'] += 1
+            time.sleep(BACKOFF_SECONDS)
+            waited += BACKOFF_SECONDS
+        self.stats['backoff_seconds'] += waited
+
+    def start(self) -> tuple[float, float]:
+        """Mark the start of a work item. Returns an opaque token for pace()."""
+        return time.monotonic(), time.process_time()
+
+    def pace(self, started: tuple[float, float]):
+        """Sleep so this process' CPU use stays within the budget."""
+        wall_start, cpu_start = started
+        wall = time.monotonic() - wall_start
+        cpu = time.process_time() - cpu_start
+
+        # cpu seconds may exceed wall seconds with multi-threaded torch;
+        # the budget is expressed over all cores of the machine.
+        allowed_rate = self.cpu_budget * self.cpu_count
+        required_wall = cpu / allowed_rate
+        delay = required_wall - wall
+
+        self.stats['items'] += 1
+        self.stats['busy_seconds'] += wall
+        if delay > 0:
+            self.stats['paced_seconds'] += delay
+            time.sleep(delay)
+
+    def throttled_seconds(self) -> float:
+        """Total time spent sleeping on behalf of BirdNET-Pi."""
+        return self.stats['paced_seconds'] + self.stats['backoff_seconds']
+
+    def report(self) -> str:
+        """One-line summary of how much work was throttled."""
+        s = self.stats
+        busy = s['busy_seconds']
+        throttled = self.throttled_seconds()
+        share = throttled / (busy + throttled) * 100 if busy + throttled > 0 else 0
+        reasons = ", ".join(f"{k}={v}" for k, v in sorted(s['backoff_reasons'].items())) or "none"
+        return (
+            f"Throttled {throttled:.1f}s ({share:.0f}% of {busy + throttled:.1f}s) over {s['items']} items: "
+            f"paced {s['paced_seconds']:.1f}s, back-off {s['backoff_seconds']:.1f}s "
+            f"({s['backoff_events']} events: {reasons})"
+        )
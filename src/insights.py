@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Behavior Insights Engine
+
+Computes the dashboard's Behavior Insights tab (species breakdown, hourly
+activity, week-over-week trends, alerts). The day-granular windows are
+summed side by side in one scan of rollup_daily (conditional aggregation)
+instead of a query each; the hour-of-day figures come pre-grouped from
+rollup_hourly. The results are loaded into dense NumPy arrays and every
+insight is a slice or sum. Alarm-spike and silence alerts are not computed
+here: the service's anomaly detector (anomaly.py) keeps them in the alerts
+table as detections arrive.
+
+Windows, in UTC:
+
+    species breakdown   days >= today-30
+    hourly patterns     hours >= today-7, by hour of day
+    trends              days >= today-7  vs  days [today-14, today-7)
+
+Usage:
+    result = compute(conn)                 # dict served at /api/behavior
+"""
+
+from datetime import datetime, timedelta, timezone
+import sqlite3
+
+import numpy as np
+
+import anomaly
+
+TYPES = ("song", "call", "alarm")
+WINDOW_DAYS = 30
+TOP_SPECIES = 15
+
+# Day windows summed per (species, type) by load_windows()
+TOTAL, THIS_WEEK, LAST_WEEK = range(3)
+
+
+def empty_result() -> dict:
+    """Response before the database exists."""
+    return {
+        "species_breakdown": [],
+        "hourly_patterns": [],
+        "alerts": [],
+        "trends": []
+    }
+
+
+def window_bounds(now: datetime) -> dict[str, str]:
+    """Window start keys, comparable with rollup day and hour keys."""
+    today = now.date()
+    return {f"d{n}": (today - timedelta(days=n)).isoformat() for n in (7, 14, WINDOW_DAYS)}
+
+
+def load_windows(conn: sqlite3.Connection, bounds: dict[str, str]) -> list[tuple]:
+    """(common_name, type, total, this week, last week) rows."""
+    return conn.execute(f"""
+        SELECT common_name, vocalization_type,
+               SUM(count),
+               SUM(CASE WHEN day >= :d7 THEN count ELSE 0 END),
+               SUM(CASE WHEN day >= :d14 AND day < :d7 THEN count ELSE 0 END)
+        FROM rollup_daily
+        WHERE day >= :d{WINDOW_DAYS}
+        GROUP BY common_name, vocalization_type
+    """, bounds).fetchall()
+
+
+def load_hour_of_day(conn: sqlite3.Connection, bounds: dict[str, str]) -> list[tuple]:
+    """(hour of day, type, count) rows of the last 7 days."""
+    return conn.execute("""
+        SELECT CAST(substr(hour, 12, 2) AS INTEGER), vocalization_type, SUM(count)
+        FROM rollup_hourly
+        WHERE hour >= :d7
+        GROUP BY 1, 2
+    """, bounds).fetchall()
+
+
+def compute(conn: sqlite3.Connection, now: datetime | None = None) -> dict:
+    """All behavior insights from one daily-rollup scan, one hourly aggregate and the alerts table."""
+    bounds = window_bounds(now or datetime.now(timezone.utc))
+    daily = load_windows(conn, bounds)
+    by_hour = load_hour_of_day(conn, bounds)
+
+    # Dense indexes: species in name order, known types first
+    names = [row[0] for row in daily]
+    species, species_idx = np.unique(np.array(names, dtype=str), return_inverse=True)
+    species = [str(name) for name in species]
+    types = {row[1] for row in daily} | {row[1] for row in by_hour}
+    type_names = list(TYPES) + sorted(types - set(TYPES))
+    type_index = {name: i for i, name in enumerate(type_names)}
+    song, call, alarm = (type_index[t] for t in TYPES)
+
+    # windows[species, type, window]: one daily row per species and type
+    windows = np.zeros((len(species), len(type_names), 3), dtype=np.int64)
+    if daily:
+        rows = species_idx, [type_index[row[1]] for row in daily]
+        windows[rows] = np.array([row[2:] for row in daily], dtype=np.int64)
+
+    hour_of_day = np.zeros((24, len(type_names)), dtype=np.int64)
+    for hour, vtype, count in by_hour:
+        hour_of_day[hour, type_index[vtype]] = count
+
+    # 1. Species breakdown: % song/call/alarm per species (last 30 days)
+    by_species = windows[:, :, TOTAL]
+    totals = by_species.sum(axis=1)
+    species_breakdown = []
+    for i in np.argsort(-totals, kind="stable")[:TOP_SPECIES]:
+        total = int(totals[i])
+        if total > 0:
+            species_breakdown.append({
+                "species": species[i],
+                "total": total,
+                "song_pct": round(int(by_species[i, song]) / total * 100),
+                "call_pct": round(int(by_species[i, call]) / total * 100),
+                "alarm_pct": round(int(by_species[i, alarm]) / total * 100)
+            })
+
+    # 2. Hourly patterns (last 7 days, by hour of day)
+    hourly_patterns = {
+        "labels": [f"{h}:00" for h in range(24)],
+        "song": hour_of_day[:, song].tolist(),
+        "call": hour_of_day[:, call].tolist(),
+        "alarm": hour_of_day[:, alarm].tolist()
+    }
+
+    # 3. Alerts: materialised by the service's anomaly detector
+    alerts = anomaly.active_alerts(conn)
+
+    # 4. Trends: this week vs last week
+    this_week = windows[:, :, THIS_WEEK].sum(axis=0)
+    last_week = windows[:, :, LAST_WEEK].sum(axis=0)
+    trends = []
+    for vtype in TYPES:
+        this_count = int(this_week[type_index[vtype]])
+        last_count = int(last_week[type_index[vtype]])
+        trends.append({
+            "type": vtype,
+            "this_week": this_count,
+            "last_week": last_count,
+            "change_pct": round((this_count - last_count) / last_count * 100) if last_count > 0 else 0
+        })
+
+    return {
+        "species_breakdown": species_breakdown,
+        "hourly_patterns": hourly_patterns,
+        "alerts": alerts,
+        "trends": trends
+    }
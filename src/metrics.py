@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Prometheus Metrics
+
+Minimal in-process metrics (histograms, counters, gauges) rendered in the
+Prometheus text exposition format, plus a small HTTP listener so a
+Prometheus server can scrape the service directly:
+
+    GET http://<pi>:9188/metrics
+
+Histograms keep cumulative bucket counts per label set, so observing a
+value is a bisect and two additions. Values that already live elsewhere
+(cache statistics, queue depth, RSS) are read at scrape time through
+collector callbacks instead of being copied on every change.
+
+Usage:
+    registry = Registry()
+    stages = registry.histogram("stage_seconds", "Time per stage", labels=("stage",))
+    with stages.time(stage="decode"):
+        audio = decode()
+    registry.collector(lambda: [("queue_depth", "gauge", "Pending detections", [({}, depth)])])
+    MetricsServer(registry, port=9188).start()
+"""
+
+import bisect
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_PORT = 9188
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "birdnet_vocalization_"
+
+# Seconds; stages range from sub-millisecond (resize) to seconds (decode, model load)
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Seconds from BirdNET's detection to the stored result
+LAG_BUCKETS = (5, 15, 30, 60, 120, 300, 600, 900, 1800, 3600, 7200, 21600, 86400)
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def escape_label(value) -> str:
+    """Label value escaping of the text format (backslash, quote, newline)."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in labels.items()) + "}"
+
+
+def read_rss_bytes() -> int | None:
+    """Resident set size of this process (Linux), or None if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Metric:
+    """A named metric with one value (or histogram) per label set."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = PREFIX + name
+        self.help = help_text
+        self.label_names = labels
+        self.lock = threading.Lock()
+        self.values = {}  # label values tuple -> value
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _labels(self, key: tuple) -> dict:
+        return dict(zip(self.label_names, key))
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        with self.lock:
+            values = sorted(self.values.items())
+        return self.header() + [
+            f"{self.name}{format_labels(self._labels(key))} {format_value(value)}" for key, value in values
+        ]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram (le buckets, _sum and _count per label set)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = STAGE_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                # Per-bucket counts (+Inf last), sum
+                entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the with block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> list[str]:
+        with self.lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self.values.items())
+        lines = self.header()
+        for key, (counts, total) in values:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{format_labels({**labels, 'le': format_value(bound)})} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {format_value(round(total, 6))}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """The metrics of one process, rendered together for a scrape."""
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def _add(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: tuple[str, ...] = (),
+                  buckets: tuple[float, ...] = STAGE_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def collector(self, collect):
+        """Register collect() -> [(name, kind, help, [(labels, value), ...]), ...], called per scrape."""
+        self.collectors.append(collect)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collect in self.collectors:
+            try:
+                families = list(collect())
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+                continue
+            for name, kind, help_text, samples in families:
+                samples = [(labels, value) for labels, value in samples if value is not None]
+                if not samples:
+                    continue
+                lines.append(f"# HELP {PREFIX}{name} {help_text}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                lines.extend(f"{PREFIX}{name}{format_labels(labels)} {format_value(value)}"
+                             for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics from the server's registry."""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404, "Not Found")
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # one line per scrape would flood the service log
+
+
+class MetricsServer:
+    """Prometheus scrape endpoint on a daemon thread."""
+
+    def __init__(self, registry: Registry, port: int = DEFAULT_METRICS_PORT, host: str = ""):
+        self.registry = registry
+        self.address = (host, port)
+        self.httpd = None
+
+    def start(self):
+        self.httpd = ThreadingHTTPServer(self.address, MetricsHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.registry = self.registry
+        threading.Thread(target=self.httpd.serve_forever, name="metrics", daemon=True).start()
+        logger.info(f"Prometheus metrics on http://{self.address[0] or '0.0.0.0'}:{self.httpd.server_port}/metrics")
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
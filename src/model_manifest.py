@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Model Manifest
+
+A JSON list of the installed species models (data/models.json), so nothing
+on the dashboard's request path has to list the models directory on the
+Pi's SD card. The service rewrites it at startup and whenever the models
+directory's mtime changes (one stat per service loop), and stores the
+model count in service_state next to the other dashboard numbers.
+
+    {"models_dir": "...", "mtime_ns": 1760000000000000000, "generated_at": "...",
+     "models": [{"file": "Turdus_merula.pt", "species": "turdus merula", "size": 1234567}, ...]}
+
+Usage:
+    manifest = ModelManifest(models_dir, data_dir / MANIFEST_FILE)
+    if manifest.refresh():
+        print(f"{manifest.count} models")
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "models.json"
+MODEL_SUFFIX = ".pt"
+GATEKEEPER_FILE = "gatekeeper.pt"  # shared cascade model, not a species
+
+
+def species_key(model_file: Path) -> str:
+    """Normalized scientific name of a model file.
+
+    Models are named by scientific name (Turdus_merula.pt); the deprecated
+    species_name_cnn_v1.pt suffix is dropped. "Turdus_merula" -> "turdus merula".
+    """
+    name = re.sub(r'_cnn_v\d+$', '', model_file.stem)
+    return name.replace('_', ' ').lower()
+
+
+def scan(models_dir: Path) -> list[dict]:
+    """List the species models in models_dir (sorted by file name)."""
+    models = []
+    with os.scandir(models_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(MODEL_SUFFIX) or entry.name == GATEKEEPER_FILE:
+                continue
+            if not entry.is_file():
+                continue
+            models.append({
+                "file": entry.name,
+                "species": species_key(Path(entry.name)),
+                "size": entry.stat().st_size,
+            })
+    return sorted(models, key=lambda model: model["file"])
+
+
+def load(path: Path) -> dict | None:
+    """Read a manifest file, or None if it is missing or unreadable."""
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+class ModelManifest:
+    """The models directory listing, persisted and refreshed on directory mtime change."""
+
+    def __init__(self, models_dir: Path, path: Path):
+        self.models_dir = models_dir
+        self.path = path
+        self.data = load(path)
+
+    @property
+    def models(self) -> list[dict]:
+        return self.data["models"] if self.data else []
+
+    @property
+    def count(self) -> int:
+        return len(self.models)
+
+    def refresh(self) -> bool:
+        """Rescan if the models directory changed since the manifest was written.
+
+        Returns True if the manifest was rewritten.
+        """
+        try:
+            mtime_ns = os.stat(self.models_dir).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if (self.data is not None and self.data.get("mtime_ns") == mtime_ns
+                and self.data.get("models_dir") == str(self.models_dir)):
+            return False
+
+        try:
+            models = scan(self.models_dir) if mtime_ns is not None else []
+        except OSError as e:
+            logger.warning(f"Could not list models in {self.models_dir}: {e}")
+            return False
+
+        self.data = {
+            "models_dir": str(self.models_dir),
+            "mtime_ns": mtime_ns,
+            "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+            "models": models,
+        }
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(self.data, indent=1))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write model manifest {self.path}: {e}")
+        logger.info(f"Model manifest: {len(models)} models in {self.models_dir}")
+        return True
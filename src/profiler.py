@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Runtime Profiler
+
+Diagnostics for a running service, triggered by signals so the warm model
+and result caches survive (no restart under a profiler):
+
+    kill -USR1 <pid>   sample every thread's stack for N seconds (wall clock)
+                       -> data/profiles/profile-YYYYmmdd-HHMMSS.collapsed
+    kill -USR2 <pid>   RSS, the model cache and the top tracemalloc allocators
+                       -> data/profiles/memory-YYYYmmdd-HHMMSS.txt
+
+The sampler is a plain thread reading sys._current_frames() SAMPLE_HZ
+times a second; it costs a little CPU only while a profile runs. The
+collapsed-stack output ("thread;outer;inner count" per line) opens in
+speedscope (https://www.speedscope.app) or flamegraph.pl.
+
+tracemalloc only sees allocations made after it starts, so the first USR2
+starts it; every later USR2 lists the top allocators and the growth since
+the previous snapshot. Signal handlers only start a worker thread: the
+main loop is never blocked and no file is written from inside a handler.
+
+Usage:
+    profiler = RuntimeProfiler(data_dir, classifier, duration=30)
+    profiler.install()
+"""
+
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+from metrics import read_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = "profiles"
+DEFAULT_PROFILE_SECONDS = 30
+SAMPLE_HZ = 100
+TRACEMALLOC_FRAMES = 10     # stack depth recorded per allocation
+TOP_ALLOCATORS = 25
+
+
+def frame_label(frame) -> str:
+    """'function (file.py:line)' with the function's first line, stable across samples."""
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def collapse(frame, thread_name: str) -> str:
+    """One stack as a collapsed-stack key, outermost frame first."""
+    stack = []
+    while frame is not None:
+        stack.append(frame_label(frame))
+        frame = frame.f_back
+    stack.append(thread_name)
+    return ";".join(reversed(stack))
+
+
+class RuntimeProfiler:
+    """SIGUSR1 stack sampling and SIGUSR2 memory snapshots, written to data_dir/profiles."""
+
+    def __init__(self, data_dir: Path, classifier=None, duration: float = DEFAULT_PROFILE_SECONDS):
+        self.output_dir = data_dir / PROFILE_DIR
+        self.classifier = classifier
+        self.duration = duration
+        self._sampling = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._last_snapshot = None
+
+    def install(self):
+        """Register the USR1/USR2 handlers (not available on every platform)."""
+        if not hasattr(signal, "SIGUSR1"):
+            logger.info("Runtime profiling signals are not available on this platform")
+            return
+        signal.signal(signal.SIGUSR1, lambda sig, frame: self._spawn(self.profile))
+        signal.signal(signal.SIGUSR2, lambda sig, frame: self._spawn(self.memory_snapshot))
+        pid = os.getpid()
+        logger.info(f"Runtime profiling: kill -USR1 {pid} ({self.duration:g}s wall-clock profile), "
+                    f"kill -USR2 {pid} (memory snapshot)")
+
+    def _spawn(self, target):
+        threading.Thread(target=target, name="profiler", daemon=True).start()
+
+    def _output_path(self, kind: str, suffix: str) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        return self.output_dir / f"{kind}-{time.strftime('%Y%m%d-%H%M%S')}{suffix}"
+
+    def profile(self, duration: float | None = None) -> Path | None:
+        """Sample all other threads' stacks for duration seconds; returns the collapsed-stack file."""
+        if not self._sampling.acquire(blocking=False):
+            logger.info("Profile already running, signal ignored")
+            return None
+        try:
+            duration = duration or self.duration
+            logger.info(f"Profiling for {duration:g}s at {SAMPLE_HZ} Hz...")
+            own = threading.get_ident()
+            names = {}
+            stacks = Counter()
+            samples = 0
+            deadline = time.monotonic() + duration
+            while time.monotonic() < deadline:
+                for ident, frame in sys._current_frames().items():
+                    if ident == own:
+                        continue
+                    if ident not in names:
+                        names.update((thread.ident, thread.name) for thread in threading.enumerate())
+                    stacks[collapse(frame, names.get(ident, f"thread-{ident}"))] += 1
+                samples += 1
+                time.sleep(1 / SAMPLE_HZ)
+
+            path = self._output_path("profile", ".collapsed")
+            path.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()))
+            logger.info(f"Profile: {samples} samples of {len(names)} threads written to {path}")
+            return path
+        except OSError as e:
+            logger.error(f"Could not write profile: {e}")
+            return None
+        finally:
+            self._sampling.release()
+
+    def memory_snapshot(self) -> Path | None:
+        """Write RSS, the model cache and (from the second call on) the top allocators."""
+        with self._snapshot_lock:
+            rss = read_rss_bytes()
+            lines = [
+                f"Memory snapshot {time.strftime('%Y-%m-%d %H:%M:%S')} (pid {os.getpid()})",
+                f"RSS: {rss / 1e6:.1f} MB" if rss is not None else "RSS: unavailable",
+                f"Threads: {threading.active_count()}",
+            ]
+
+            if self.classifier is not None:
+                models = self.classifier.cache_report()
+                total = sum(model['bytes'] for model in models)
+                lines += ["", f"Model cache: {len(models)} models, {total / 1e6:.1f} MB of tensors "
+                              f"(least recently used first)"]
+                lines += [f"  {model['model']:<48} {model['tier']:<10} {model['bytes'] / 1e6:8.1f} MB"
+                          for model in models]
+
+            lines.append("")
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                lines.append("tracemalloc started now; send SIGUSR2 again for the top allocators")
+            else:
+                snapshot = tracemalloc.take_snapshot().filter_traces([
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                ])
+                current, peak = tracemalloc.get_traced_memory()
+                lines.append(f"Traced since start: {current / 1e6:.1f} MB (peak {peak / 1e6:.1f} MB)")
+                lines += ["", f"Top {TOP_ALLOCATORS} allocators:"]
+                lines += [f"  {stat}" for stat in snapshot.statistics("lineno")[:TOP_ALLOCATORS]]
+                if self._last_snapshot is not None:
+                    lines += ["", "Growth since the previous snapshot:"]
+                    lines += [f"  {stat}" for stat in
+                              snapshot.compare_to(self._last_snapshot, "lineno")[:TOP_ALLOCATORS]]
+                self._last_snapshot = snapshot
+
+            try:
+                path = self._output_path("memory", ".txt")
+                path.write_text("\n".join(lines) + "\n")
+            except OSError as e:
+                logger.error(f"Could not write memory snapshot: {e}")
+                return None
+            logger.info(f"Memory snapshot written to {path}")
+            return path
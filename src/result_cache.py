@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Classification Result Cache
+
+Content-addressed cache of classify() results, stored in vocalization.db.
+The key combines a fingerprint of the audio bytes with the classifier's
+result signature (model file identity, spectrogram parameters, tier), so
+duplicate or re-processed clips skip decode and inference entirely.
+
+Usage:
+    cache = ResultCache(db_path, max_entries=50000)
+    key = cache.make_key(audio_path, classifier.result_signature(name, tier))
+    result = cache.get(key)
+    if result is None:
+        result = classifier.classify(name, audio_path, tier=tier)
+        cache.put(key, result)
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 50000
+EVICT_FRACTION = 0.1  # evict this share of entries at once when full
+READ_CHUNK = 1 << 16
+
+
+def audio_fingerprint(audio_path: Path) -> str:
+    """Hash of the audio file contents (byte-identical files share a fingerprint)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(audio_path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Bounded LRU cache of classification results in the result_cache table."""
+
+    def __init__(self, db_path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def make_key(self, audio_path: Path, signature: str | None) -> str | None:
+        """Cache key for an audio file classified under a result signature."""
+        if not self.enabled or signature is None:
+            return None
+        try:
+            fingerprint = audio_fingerprint(audio_path)
+        except OSError:
+            return None
+        return hashlib.blake2b(f"{fingerprint}|{signature}".encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str | None) -> dict | None:
+        """Return the cached result for a key, or None on a miss."""
+        if key is None:
+            return None
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT result FROM result_cache WHERE cache_key = ?", (key,))
+        row = cursor.fetchone()
+        if row:
+            cursor.execute(
+                "UPDATE result_cache SET last_used = ? WHERE cache_key = ?",
+                (time.time(), key)
+            )
+            conn.commit()
+        conn.close()
+
+        if not row:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return json.loads(row[0])
+
+    def put(self, key: str | None, result: dict | None):
+        """Store a result, evicting the least recently used entries when full."""
+        if key is None or result is None:
+            return
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO result_cache (cache_key, result, last_used)
+            VALUES (?, ?, ?)
+        """, (key, json.dumps(result), time.time()))
+
+        cursor.execute("SELECT COUNT(*) FROM result_cache")
+        count = cursor.fetchone()[0]
+        if count > self.max_entries:
+            evict = count - self.max_entries + int(self.max_entries * EVICT_FRACTION)
+            cursor.execute("""
+                DELETE FROM result_cache WHERE cache_key IN (
+                    SELECT cache_key FROM result_cache ORDER BY last_used ASC LIMIT ?
+                )
+            """, (evict,))
+            self.stats['evictions'] += cursor.rowcount
+            logger.debug(f"Result cache evicted {cursor.rowcount} entries")
+
+        conn.commit()
+        conn.close()
+
+    def report(self) -> str:
+        """One-line summary of cache effectiveness."""
+        s = self.stats
+        lookups = s['hits'] + s['misses']
+        ratio = s['hits'] / lookups if lookups else 0
+        return f"Result cache: {s['hits']}/{lookups} hits ({ratio:.0%}), {s['evictions']} evicted"
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Retention and Archival Compaction
+
+Opt-in (retention_days > 0; the default 0 keeps every raw row). Keeps raw
+vocalization rows for a configurable window. Older rows are moved, one UTC
+day at a time, into gzip-compressed NDJSON files:
+
+    data/archive/2025/vocalizations-2025-05-01.ndjson.gz
+
+/api/export still reads them (iter_archive), so the full history stays
+downloadable. The rollup tables are never pruned, so charts, totals and
+insights keep every day; the species directory keeps counting archived
+detections (species.archived). service_state 'archived_before' is the
+first day that is still raw.
+
+Space freed by archiving (and by result cache eviction) is returned to the
+SD card with incremental vacuum, a bounded number of pages at a time.
+Switching an existing database to incremental vacuum takes one full VACUUM
+on the first run: it needs free disk space for a copy of the database
+(skipped with a warning otherwise) and holds the write lock while it runs.
+Maintenance runs at most once a day and never during the dawn chorus
+(DAWN_HOURS, local time), when BirdNET-Pi and the classifier are busiest.
+Database size and fragmentation before and after each run are logged and
+stored in service_state ('retention_report').
+
+Usage:
+    manager = RetentionManager(db_path, data_dir / ARCHIVE_DIR, retention_days=365)
+    if manager.due():
+        report = manager.run()
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 0      # keep everything; archiving is opt-in
+ARCHIVE_DIR = "archive"
+ARCHIVE_PATTERN = "vocalizations-*.ndjson.gz"
+DAWN_HOURS = range(4, 10)    # local hours without maintenance
+VACUUM_STEP_PAGES = 1000     # pages freed per incremental_vacuum call
+VACUUM_PAUSE = 0.05          # seconds between steps, so the service can write
+VACUUM_SPACE_FACTOR = 1.2    # free disk needed for the one-time VACUUM, relative to the database
+
+
+def archive_path(archive_dir: Path, day: str) -> Path:
+    """Archive file of one UTC day ('YYYY-MM-DD')."""
+    return archive_dir / day[:4] / f"vocalizations-{day}.ndjson.gz"
+
+
+def archive_days(archive_dir: Path, since: str | None = None, until: str | None = None,
+                 before: str | None = None) -> list[tuple[str, Path]]:
+    """(day, path) of the archive files overlapping [since, until] and older than before, oldest first."""
+    days = []
+    for path in archive_dir.glob(f"*/{ARCHIVE_PATTERN}"):
+        day = path.name[len("vocalizations-"):-len(".ndjson.gz")]
+        if ((since is None or day >= since[:10]) and (until is None or day <= until[:10])
+                and (before is None or day < before)):
+            days.append((day, path))
+    return sorted(days)
+
+
+def read_archive(path: Path) -> list[dict]:
+    """All rows of one archive file."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_archive(path: Path, rows: list[dict]):
+    """Write an archive file atomically (temporary file, fsync, rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=9) as f:
+            for row in rows:
+                f.write((json.dumps(row) + "\n").encode())
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, path)
+
+
+def iter_archive(archive_dir: Path, select: str, where: list[str], args: list,
+                 columns: tuple[str, ...], since: str | None = None, until: str | None = None,
+                 before: str | None = None, batch_size: int = 1000):
+    """Yield batches of archived rows matching a vocalizations query, oldest first.
+
+    Each day file is loaded into an in-memory 'vocalizations' table so the
+    same SELECT list and WHERE clauses as the live query apply; columns
+    missing from older files read as NULL. Memory use is one day of rows.
+    before (archived_before as read with the live query) leaves out days
+    archived since, which that query still returns.
+    """
+    mem = sqlite3.connect(":memory:")
+    try:
+        for _, path in archive_days(archive_dir, since, until, before):
+            rows = read_archive(path)
+            if not rows:
+                continue
+            table_columns = list(dict.fromkeys([*rows[0], *columns]))
+            mem.execute("DROP TABLE IF EXISTS vocalizations")
+            mem.execute(f"CREATE TABLE vocalizations ({', '.join(table_columns)})")
+            mem.executemany(
+                f"INSERT INTO vocalizations VALUES ({', '.join('?' * len(table_columns))})",
+                [tuple(row.get(column) for column in table_columns) for row in rows]
+            )
+            query = f"SELECT {select} FROM vocalizations"
+            if where:
+                query += " WHERE " + " AND ".join(where)
+            cursor = mem.execute(query + " ORDER BY detected_at, id", args)
+            while batch := cursor.fetchmany(batch_size):
+                yield batch
+    finally:
+        mem.close()
+
+
+def archived_before(conn: sqlite3.Connection) -> str | None:
+    """First day ('YYYY-MM-DD') still in the raw table, or None if nothing was archived."""
+    try:
+        return database.read_state(conn, 'archived_before')
+    except sqlite3.OperationalError:
+        return None
+
+
+def size_report(conn: sqlite3.Connection) -> dict:
+    """Database size and the share of it that is free pages."""
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return {
+        "size_mb": round(pages * page_size / 1e6, 1),
+        "free_mb": round(free * page_size / 1e6, 1),
+        "fragmentation_pct": round(free / pages * 100, 1) if pages else 0.0,
+    }
+
+
+class RetentionManager:
+    """Daily archival of raw rows past the retention window, plus incremental vacuum."""
+
+    def __init__(self, db_path: Path, archive_dir: Path, retention_days: int = DEFAULT_RETENTION_DAYS):
+        self.db_path = db_path
+        self.archive_dir = archive_dir
+        self.retention_days = retention_days
+        self.last_run = None  # local date of the last run, loaded on first due()
+
+    @property
+    def enabled(self) -> bool:
+        return self.retention_days > 0
+
+    def due(self, now: datetime | None = None) -> bool:
+        """True once a day, outside the dawn hours, when retention is enabled."""
+        now = now or datetime.now()
+        if not self.enabled or now.hour in DAWN_HOURS:
+            return False
+        if self.last_run is None:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                self.last_run = database.read_state(conn, 'retention_last_run') or ""
+            finally:
+                conn.close()
+        return self.last_run != now.date().isoformat()
+
+    def run(self, now: datetime | None = None) -> dict:
+        """Archive expired days, then vacuum. Returns the size report."""
+        now = now or datetime.now()
+        self.last_run = now.date().isoformat()  # one attempt a day, also if it fails
+        started = time.monotonic()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            before = size_report(conn)
+            archived = 0
+            if self.enabled:
+                cutoff = (datetime.now(timezone.utc).date() - timedelta(days=self.retention_days)).isoformat()
+                archived = self.archive_before(conn, cutoff)
+                self.enable_incremental_vacuum(conn)
+            self.vacuum(conn)
+            after = size_report(conn)
+
+            report = {
+                "run_at": database.utc_now(),
+                "archived_rows": archived,
+                "before": before,
+                "after": after,
+                "seconds": round(time.monotonic() - started, 1),
+            }
+            cursor = conn.cursor()
+            database.write_state(cursor, 'retention_report', json.dumps(report))
+            database.write_state(cursor, 'retention_last_run', now.date().isoformat())
+            conn.commit()
+        finally:
+            conn.close()
+
+        logger.info(
+            f"Retention: archived {archived} rows; {before['size_mb']} MB "
+            f"({before['fragmentation_pct']}% free) -> {after['size_mb']} MB "
+            f"({after['fragmentation_pct']}% free) in {report['seconds']}s"
+        )
+        return report
+
+    def archive_before(self, conn: sqlite3.Connection, cutoff: str) -> int:
+        """Move all raw rows detected before cutoff ('YYYY-MM-DD') to the archive."""
+        total = 0
+        while True:
+            oldest = conn.execute("SELECT MIN(detected_at) FROM vocalizations").fetchone()[0]
+            if oldest is None or oldest[:10] >= cutoff:
+                break
+            total += self.archive_day(conn, oldest[:10])
+        return total
+
+    def archive_day(self, conn: sqlite3.Connection, day: str) -> int:
+        """Archive one UTC day: write its file, then delete the rows in one transaction.
+
+        Rows already archived for the day (a late result) are merged by id,
+        so a run interrupted between the two steps is safe to repeat.
+        """
+        next_day = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+        cursor = conn.execute(
+            "SELECT * FROM vocalizations WHERE detected_at >= ? AND detected_at < ?", (day, next_day)
+        )
+        columns = [description[0] for description in cursor.description]
+        # Binary previews (waveform peaks) are not archived
+        rows = [{column: value for column, value in zip(columns, row) if not isinstance(value, bytes)}
+                for row in cursor.fetchall()]
+        if not rows:
+            return 0
+
+        path = archive_path(self.archive_dir, day)
+        merged = {row["id"]: row for row in (read_archive(path) if path.exists() else [])}
+        merged.update((row["id"], row) for row in rows)
+        write_archive(path, sorted(merged.values(), key=lambda row: (row["detected_at"] or "", row["id"])))
+
+        # Archived detections keep counting in the species directory
+        archived_species = {}
+        for row in rows:
+            key = (row["scientific_name"] or "", row["common_name"] or "")
+            archived_species[key] = archived_species.get(key, 0) + 1
+        max_id = max(row["id"] for row in rows)
+
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            cursor.execute(
+                "DELETE FROM vocalizations WHERE detected_at >= ? AND detected_at < ? AND id <= ?",
+                (day, next_day, max_id)
+            )
+            cursor.executemany("""
+                UPDATE species SET archived = archived + ?, detections = detections + ?
+                WHERE scientific_name = ? AND common_name = ?
+            """, [(count, count, *key) for key, count in archived_species.items()])
+            if next_day > (archived_before(conn) or ""):
+                database.write_state(cursor, 'archived_before', next_day)
+            database.bump_generation(cursor)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        logger.info(f"Archived {len(rows)} vocalizations of {day} to {path}")
+        return len(rows)
+
+    def enable_incremental_vacuum(self, conn: sqlite3.Connection) -> bool:
+        """Switch the database to auto_vacuum=INCREMENTAL (one full VACUUM, first run only).
+
+        The VACUUM writes a complete copy of the database and holds the write
+        lock until it is done; it is skipped while the disk lacks the space.
+        Returns True if the database is in incremental mode.
+        """
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return True
+        db_bytes = self.db_path.stat().st_size
+        free_bytes = shutil.disk_usage(self.db_path.parent).free
+        if free_bytes < db_bytes * VACUUM_SPACE_FACTOR:
+            logger.warning(
+                f"Not enabling incremental vacuum: the one-time VACUUM needs about "
+                f"{db_bytes * VACUUM_SPACE_FACTOR / 1e6:.0f} MB free, {free_bytes / 1e6:.0f} MB available"
+            )
+            return False
+        logger.info(f"Enabling incremental vacuum (one-time full VACUUM of {db_bytes / 1e6:.0f} MB, "
+                    f"writes are paused until it finishes)...")
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+
+    def vacuum(self, conn: sqlite3.Connection):
+        """Release all free pages to the file system, VACUUM_STEP_PAGES at a time."""
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return  # incremental_vacuum is a no-op in other modes
+        while conn.execute("PRAGMA freelist_count").fetchone()[0] > 0:
+            conn.execute(f"PRAGMA incremental_vacuum({VACUUM_STEP_PAGES})").fetchall()
+            conn.commit()
+            time.sleep(VACUUM_PAUSE)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Vocalization Rollups
+
+Pre-aggregated counts per species and vocalization type, maintained by the
+service at insert time so dashboard charts and behaviour insights never scan
+the raw vocalizations table:
+
+    rollup_hourly  (hour 'YYYY-MM-DD HH', common_name, vocalization_type, count)
+    rollup_daily   (day  'YYYY-MM-DD',    common_name, vocalization_type, count)
+    rollup_totals  (                      common_name, vocalization_type, count)
+
+The number of species with at least one result is kept in service_state
+('species_count') by triggers on rollup_totals, so the dashboard never
+counts distinct names.
+
+Rollups are never pruned: days whose raw rows were moved to the archive
+(retention.py, service_state 'archived_before') are kept as they are by
+rebuild().
+
+Rollups are keyed by detection time (vocalizations.detected_at), in the same
+UTC 'YYYY-MM-DD HH:MM:SS' format as SQLite's CURRENT_TIMESTAMP, so
+date('now', ...) comparisons work unchanged.
+"""
+
+import logging
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS rollup_hourly (
+        hour TEXT NOT NULL,
+        common_name TEXT NOT NULL,
+        vocalization_type TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (hour, common_name, vocalization_type)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS rollup_daily (
+        day TEXT NOT NULL,
+        common_name TEXT NOT NULL,
+        vocalization_type TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, common_name, vocalization_type)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS rollup_totals (
+        common_name TEXT NOT NULL,
+        vocalization_type TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (common_name, vocalization_type)
+    ) WITHOUT ROWID
+    """,
+    # Distinct species counter: a species counts once any of its types has a result
+    """
+    CREATE TRIGGER IF NOT EXISTS rollup_species_insert AFTER INSERT ON rollup_totals
+    WHEN new.count > 0 AND NOT EXISTS (
+        SELECT 1 FROM rollup_totals
+        WHERE common_name = new.common_name AND vocalization_type != new.vocalization_type AND count > 0
+    )
+    BEGIN
+        UPDATE service_state SET value = CAST(value AS INTEGER) + 1 WHERE key = 'species_count';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS rollup_species_update AFTER UPDATE OF count ON rollup_totals
+    WHEN (old.count > 0) != (new.count > 0) AND NOT EXISTS (
+        SELECT 1 FROM rollup_totals
+        WHERE common_name = new.common_name AND vocalization_type != new.vocalization_type AND count > 0
+    )
+    BEGIN
+        UPDATE service_state SET value = CAST(value AS INTEGER) + (CASE WHEN new.count > 0 THEN 1 ELSE -1 END)
+        WHERE key = 'species_count';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS rollup_species_delete AFTER DELETE ON rollup_totals
+    WHEN old.count > 0 AND NOT EXISTS (
+        SELECT 1 FROM rollup_totals
+        WHERE common_name = old.common_name AND vocalization_type != old.vocalization_type AND count > 0
+    )
+    BEGIN
+        UPDATE service_state SET value = CAST(value AS INTEGER) - 1 WHERE key = 'species_count';
+    END
+    """,
+]
+
+
+def create_tables(cursor: sqlite3.Cursor):
+    """Create the rollup tables if they do not exist."""
+    for statement in SCHEMA:
+        cursor.execute(statement)
+
+
+def reset_species_count(cursor: sqlite3.Cursor):
+    """Recount the species counter from rollup_totals (after a rebuild or migration)."""
+    cursor.execute("""
+        INSERT OR REPLACE INTO service_state (key, value)
+        SELECT 'species_count', COUNT(DISTINCT common_name) FROM rollup_totals WHERE count > 0
+    """)
+
+
+def species_count(conn: sqlite3.Connection) -> int:
+    """Species with at least one result, from the maintained counter."""
+    row = conn.execute("SELECT value FROM service_state WHERE key = 'species_count'").fetchone()
+    if row is not None:
+        return int(row[0])
+    # Database not migrated to the counter yet
+    return conn.execute("SELECT COUNT(DISTINCT common_name) FROM rollup_totals WHERE count > 0").fetchone()[0]
+
+
+def add(cursor: sqlite3.Cursor, timestamp: str, common_name: str, vocalization_type: str, delta: int = 1):
+    """Add (or with delta=-1, remove) one vocalization to/from all rollups.
+
+    Runs inside the caller's transaction so rollups stay consistent with
+    the raw row insert.
+    """
+    hour = timestamp[:13]
+    day = timestamp[:10]
+    cursor.execute("""
+        INSERT INTO rollup_hourly (hour, common_name, vocalization_type, count)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (hour, common_name, vocalization_type) DO UPDATE SET count = count + excluded.count
+    """, (hour, common_name, vocalization_type, delta))
+    cursor.execute("""
+        INSERT INTO rollup_daily (day, common_name, vocalization_type, count)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (day, common_name, vocalization_type) DO UPDATE SET count = count + excluded.count
+    """, (day, common_name, vocalization_type, delta))
+    cursor.execute("""
+        INSERT INTO rollup_totals (common_name, vocalization_type, count)
+        VALUES (?, ?, ?)
+        ON CONFLICT (common_name, vocalization_type) DO UPDATE SET count = count + excluded.count
+    """, (common_name, vocalization_type, delta))
+
+
+def rebuild(conn: sqlite3.Connection, time_column: str = "detected_at", commit: bool = True):
+    """Backfill or repair all rollups from the raw vocalizations table.
+
+    Replaces existing rollup contents in a single transaction (the caller's,
+    when commit is False). Hours and days before the archived cutoff have
+    no raw rows left and keep their counts.
+    """
+    cursor = conn.cursor()
+    create_tables(cursor)
+    row = cursor.execute("SELECT value FROM service_state WHERE key = 'archived_before'").fetchone()
+    p = {"since": row[0] if row else ""}
+    cursor.execute("DELETE FROM rollup_hourly WHERE hour >= :since", p)
+    cursor.execute("DELETE FROM rollup_daily WHERE day >= :since", p)
+    cursor.execute("DELETE FROM rollup_totals")
+
+    cursor.execute(f"""
+        INSERT INTO rollup_hourly (hour, common_name, vocalization_type, count)
+        SELECT substr({time_column}, 1, 13), common_name, vocalization_type, COUNT(*)
+        FROM vocalizations
+        WHERE {time_column} >= :since
+        GROUP BY 1, 2, 3
+    """, p)
+    cursor.execute("""
+        INSERT INTO rollup_daily (day, common_name, vocalization_type, count)
+        SELECT substr(hour, 1, 10), common_name, vocalization_type, SUM(count)
+        FROM rollup_hourly
+        WHERE hour >= :since
+        GROUP BY 1, 2, 3
+    """, p)
+    cursor.execute("""
+        INSERT INTO rollup_totals (common_name, vocalization_type, count)
+        SELECT common_name, vocalization_type, SUM(count)
+        FROM rollup_daily
+        GROUP BY 1, 2
+    """)
+    reset_species_count(cursor)
+    if commit:
+        conn.commit()
+
+    cursor.execute("SELECT COALESCE(SUM(count), 0) FROM rollup_totals")
+    total = cursor.fetchone()[0]
+    logger.info(f"Rollups rebuilt from {total} vocalizations")
+    return total
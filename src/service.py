@@ -10,22 +10,40 @@ Usage:
 """
 
 import argparse
+import base64
 import logging
 import os
 import signal
 import sqlite3
 import sys
 import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
-from classifier import VocalizationClassifier
+import anomaly
+import database
+import metrics
+import model_manifest
+import profiler
+import retention
+import rollups
+import species
+import trace_log
+from classifier import VocalizationClassifier, TIERS, TIER_FULL, DEFAULT_CASCADE_THRESHOLD
+from governor import ResourceGovernor, DEFAULT_CPU_BUDGET
+from result_cache import ResultCache, DEFAULT_MAX_ENTRIES
 
 # Configuration
 DEFAULT_BIRDNET_DIR = Path("/home/pi/BirdNET-Pi")
 DEFAULT_DATA_DIR = Path("/opt/birdnet-vocalization/data")
 DEFAULT_INTERVAL = 30  # seconds between checks
 MIN_CONFIDENCE = 0.5   # minimum confidence to store result
+DEFAULT_TARGET_LATENCY = 900  # seconds from detection to stored result
+TIER_AUTO = 'auto'
+
+# Initial per-detection cost guesses (seconds, Pi 4) until real timings are measured
+INITIAL_TIER_COSTS = {'full': 1.0, 'quantized': 0.7, 'reduced': 0.4}
 
 
 def setup_logging(data_dir: Path):
@@ -48,10 +66,60 @@ def setup_logging(data_dir: Path):
 logger = logging.getLogger(__name__)
 
 
+class TierScheduler:
+    """Chooses a classifier quality tier from backlog and latency target.
+
+    Keeps a moving average of the measured cost per detection for each tier
+    and picks the most accurate tier that is projected to clear the queue
+    within the target detection-to-result latency.
+    """
+
+    def __init__(self, target_latency: float = DEFAULT_TARGET_LATENCY, fixed_tier: str = TIER_AUTO):
+        self.target_latency = target_latency
+        self.fixed_tier = fixed_tier
+        self.costs = dict(INITIAL_TIER_COSTS)
+        self.chosen = {tier: 0 for tier in TIERS}
+
+    def observe(self, tier: str, seconds: float, alpha: float = 0.2):
+        """Update the cost estimate for a tier with a measured duration."""
+        self.costs[tier] = (1 - alpha) * self.costs[tier] + alpha * seconds
+
+    def choose(self, queue_depth: int, lag_seconds: float) -> str:
+        """Pick a tier for the next detection.
+
+        Args:
+            queue_depth: Detections still waiting, including this one
+            lag_seconds: How long ago this detection was made
+        """
+        if self.fixed_tier != TIER_AUTO:
+            tier = self.fixed_tier
+        else:
+            tier = TIERS[-1]
+            for candidate in TIERS:
+                projected = lag_seconds + queue_depth * self.costs[candidate]
+                if projected <= self.target_latency:
+                    tier = candidate
+                    break
+        self.chosen[tier] += 1
+        return tier
+
+    def report(self) -> str:
+        """Summary of tier usage and cost estimates."""
+        return ", ".join(
+            f"{tier}={self.chosen[tier]} (~{self.costs[tier]:.2f}s)" for tier in TIERS
+        )
+
+
 class VocalizationService:
     """Service that monitors BirdNET-Pi and classifies vocalizations."""
 
-    def __init__(self, birdnet_dir: Path, models_dir: Path, data_dir: Path, language: str = 'en'):
+    def __init__(self, birdnet_dir: Path, models_dir: Path, data_dir: Path, language: str = 'en',
+                 cpu_budget: float = DEFAULT_CPU_BUDGET, torch_threads: int | None = None,
+                 target_latency: float = DEFAULT_TARGET_LATENCY, tier: str = TIER_AUTO,
+                 cascade_threshold: float | None = None, signal_gate: bool = True,
+                 cache_size: int = DEFAULT_MAX_ENTRIES,
+                 retention_days: int = retention.DEFAULT_RETENTION_DAYS,
+                 metrics_port: int | None = None, trace_file: Path | None = None):
         self.birdnet_dir = birdnet_dir
         self.birdnet_db = birdnet_dir / "scripts" / "birds.db"
 
@@ -70,49 +138,142 @@ class VocalizationService:
         self.vocalization_db = data_dir / "vocalization.db"
         self.language = language
 
-        self.classifier = VocalizationClassifier(models_dir, language=language)
+        self.classifier = VocalizationClassifier(
+            models_dir, language=language, cascade_threshold=cascade_threshold,
+            signal_gate=signal_gate, profile=trace_file is not None
+        )
+        self.governor = ResourceGovernor(cpu_budget=cpu_budget, torch_threads=torch_threads)
+        self.scheduler = TierScheduler(target_latency=target_latency, fixed_tier=tier)
+        self.result_cache = ResultCache(self.vocalization_db, max_entries=cache_size)
+        self.anomalies = anomaly.AnomalyDetector()
+        self.models_manifest = model_manifest.ModelManifest(
+            models_dir, data_dir / model_manifest.MANIFEST_FILE
+        )
+        self.retention = retention.RetentionManager(
+            self.vocalization_db, data_dir / retention.ARCHIVE_DIR, retention_days=retention_days
+        )
         self.running = False
         self.last_processed_id = 0
+        self.queue_depth = 0
+
+        self.metrics_port = metrics_port
+        self.metrics_server = None
+        self._init_metrics()
+
+        # Opt-in per-detection timing trace (classifier runs in profiling mode)
+        self.trace = trace_log.TraceLog(trace_file) if trace_file is not None else None
+        self._timings = None  # stage timings of the detection in progress, when tracing
 
         self._init_database()
         self._load_last_processed()
+        self.refresh_model_manifest(store=True)
+
+    def _init_metrics(self):
+        """Stage latency histograms and scrape-time collectors for the Prometheus endpoint."""
+        self.metrics = metrics.Registry()
+        self.stage_seconds = self.metrics.histogram(
+            "stage_seconds", "Time spent per processing stage", labels=("stage",)
+        )
+        self.lag_seconds = self.metrics.histogram(
+            "detection_lag_seconds", "Seconds from BirdNET's detection to the stored result",
+            buckets=metrics.LAG_BUCKETS
+        )
+        self.detections_total = self.metrics.counter(
+            "detections_total", "Detections processed, by outcome", labels=("outcome",)
+        )
+        self.classifier.stage_hook = lambda stage, seconds: self.stage_seconds.observe(seconds, stage=stage)
+        self.metrics.collector(self._collect_metrics)
+
+    @contextmanager
+    def _stage(self, name: str):
+        """Time a service stage into the stage histogram and, when tracing, the detection's timings."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            self.stage_seconds.observe(seconds, stage=name)
+            if self._timings is not None:
+                self._timings[name] = self._timings.get(name, 0.0) + seconds
+
+    def _write_trace(self, detection: dict, outcome: str, started: float, tier: str | None = None,
+                     cache: str | None = None, result: dict | None = None):
+        """Append the timings of one detection to the trace log (when tracing)."""
+        if self.trace is None:
+            return
+        timings, self._timings = self._timings or {}, None
+        timings['total'] = time.perf_counter() - started
+        self.trace.write({
+            "birdnet_id": detection['rowid'],
+            "species": detection.get('Sci_Name', ''),
+            "common_name": detection.get('Com_Name', ''),
+            "tier": tier,
+            "cache": cache,
+            "outcome": outcome,
+            "model_cache": timings.pop('model_cache', None),
+            "type": result['type'] if result else None,
+            "confidence": round(result['confidence'], 4) if result else None,
+            "timings": timings,
+        })
+
+    def _collect_metrics(self) -> list:
+        """Cache, queue and process gauges, read at scrape time."""
+        result_stats = self.result_cache.stats
+        model_stats = self.classifier.model_cache_stats
+        torch = sys.modules.get("torch")
+        return [
+            ("cache_requests_total", "counter", "Result and model cache lookups", [
+                ({"cache": "result", "outcome": "hit"}, result_stats['hits']),
+                ({"cache": "result", "outcome": "miss"}, result_stats['misses']),
+                ({"cache": "model", "outcome": "hit"}, model_stats['hits']),
+                ({"cache": "model", "outcome": "miss"}, model_stats['misses']),
+            ]),
+            ("cache_evictions_total", "counter", "Result cache entries evicted", [
+                ({"cache": "result"}, result_stats['evictions']),
+            ]),
+            ("models_cached", "gauge", "Species models held in memory", [
+                ({}, len(self.classifier.models_cache)),
+            ]),
+            ("queue_depth", "gauge", "Detections in birds.db not yet processed", [
+                ({}, self.queue_depth),
+            ]),
+            ("last_processed_id", "gauge", "Last processed birds.db detection rowid", [
+                ({}, self.last_processed_id),
+            ]),
+            ("resident_memory_bytes", "gauge", "Resident set size of the service", [
+                ({}, metrics.read_rss_bytes()),
+            ]),
+            ("torch_threads", "gauge", "Torch intra-op threads", [
+                ({}, torch.get_num_threads() if torch is not None else self.governor.torch_threads),
+            ]),
+            ("throttled_seconds_total", "counter", "Seconds paced or backed off for BirdNET-Pi", [
+                ({}, round(self.governor.throttled_seconds(), 3)),
+            ]),
+        ]
 
     def _init_database(self):
         """Initialize vocalization database."""
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
         conn = sqlite3.connect(self.vocalization_db)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS vocalizations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                birdnet_id INTEGER UNIQUE,
-                file_name TEXT,
-                common_name TEXT,
-                scientific_name TEXT,
-                vocalization_type TEXT,
-                vocalization_type_display TEXT,
-                confidence REAL,
-                probabilities TEXT,
-                classified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
 
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_birdnet_id ON vocalizations(birdnet_id)
-        """)
+        # WAL lets the web viewer read concurrently while the service writes
+        conn.execute("PRAGMA journal_mode=WAL")
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS service_state (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-        """)
+        version = database.migrate(conn, birdnet_db=self.birdnet_db)
+        self.anomalies.load(conn)
+        conn.close()
+        logger.info(f"Database initialized: {self.vocalization_db} (schema v{version})")
 
+    def rebuild_rollups(self) -> int:
+        """Backfill or repair the rollup tables and species directory from raw vocalizations."""
+        conn = sqlite3.connect(self.vocalization_db)
+        total = rollups.rebuild(conn, commit=False)
+        species.rebuild(conn, commit=False)
+        database.bump_generation(conn.cursor())
         conn.commit()
         conn.close()
-        logger.info(f"Database initialized: {self.vocalization_db}")
+        return total
 
     def _load_last_processed(self):
         """Load last processed detection ID."""
@@ -167,6 +328,31 @@ class VocalizationService:
 
         return detections
 
+    def _get_pending_count(self) -> int:
+        """Count detections in birds.db not yet processed (the queue depth)."""
+        if not self.birdnet_db.exists():
+            return 0
+
+        conn = sqlite3.connect(self.birdnet_db)
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM detections WHERE rowid > ?",
+            (self.last_processed_id,)
+        )
+        count = cursor.fetchone()[0]
+        conn.close()
+        return count
+
+    def _detection_lag(self, detection: dict) -> float:
+        """Seconds between BirdNET's detection time and now (0 if unknown)."""
+        try:
+            detected = datetime.strptime(
+                f"{detection.get('Date', '')} {detection.get('Time', '')}", "%Y-%m-%d %H:%M:%S"
+            )
+        except ValueError:
+            return 0.0
+        return max(0.0, (datetime.now() - detected).total_seconds())
+
     def _find_audio_file(self, detection: dict) -> Path | None:
         """Find audio file for detection."""
         file_name = detection.get('File_Name', '')
@@ -222,18 +408,37 @@ class VocalizationService:
 
         return None
 
-    def _store_result(self, detection: dict, result: dict):
+    def _store_result(self, detection: dict, result: dict, audio_path: Path | None = None):
         """Store classification result."""
-        import json
-
         conn = sqlite3.connect(self.vocalization_db)
         cursor = conn.cursor()
 
+        # Re-processing replaces the earlier row; take it out of the rollups first
         cursor.execute("""
-            INSERT OR REPLACE INTO vocalizations
+            SELECT detected_at, common_name, vocalization_type
+            FROM vocalizations WHERE birdnet_id = ?
+        """, (detection['rowid'],))
+        previous = cursor.fetchone()
+        if self.anomalies.due():
+            # A batch crossed the hour: roll the alert windows before counting
+            self.anomalies.tick(cursor)
+        if previous:
+            rollups.add(cursor, *previous, delta=-1)
+            self.anomalies.record(cursor, *previous, delta=-1)
+            # Explicit delete so the species directory triggers see it
+            cursor.execute("DELETE FROM vocalizations WHERE birdnet_id = ?", (detection['rowid'],))
+
+        classified_at = database.utc_now()
+        detected_at = database.detection_timestamp(
+            detection.get('Date', ''), detection.get('Time', '')
+        ) or classified_at
+        cursor.execute("""
+            INSERT INTO vocalizations
             (birdnet_id, file_name, common_name, scientific_name,
-             vocalization_type, vocalization_type_display, confidence, probabilities)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+             vocalization_type, vocalization_type_display, confidence,
+             p_song, p_call, p_alarm, probabilities, tier,
+             classified_at, detected_at, audio_path, peaks)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             detection['rowid'],
             detection.get('File_Name', ''),
@@ -242,21 +447,65 @@ class VocalizationService:
             result['type'],
             result['type_display'],
             result['confidence'],
-            json.dumps(result['probabilities'])
+            *database.probability_values(result['probabilities']),
+            result.get('tier', TIER_FULL),
+            classified_at,
+            detected_at,
+            str(audio_path) if audio_path else None,
+            base64.b64decode(result['peaks']) if result.get('peaks') else None
         ))
+        rollups.add(cursor, detected_at, detection.get('Com_Name', ''), result['type'])
+        self.anomalies.record(cursor, detected_at, detection.get('Com_Name', ''), result['type'])
+        database.bump_generation(cursor)
 
         conn.commit()
         conn.close()
 
+    def refresh_model_manifest(self, store: bool = False):
+        """Rewrite the model manifest if the models directory changed, and publish the count."""
+        if not self.models_manifest.refresh() and not store:
+            return
+        conn = sqlite3.connect(self.vocalization_db)
+        cursor = conn.cursor()
+        database.write_state(cursor, 'model_count', self.models_manifest.count)
+        database.bump_generation(cursor)
+        conn.commit()
+        conn.close()
+
+    def check_anomalies(self):
+        """Hourly alert upkeep: slide the alarm window, fold daily baselines, raise/resolve alerts."""
+        if not self.anomalies.due():
+            return
+        conn = sqlite3.connect(self.vocalization_db)
+        cursor = conn.cursor()
+        if self.anomalies.tick(cursor):
+            database.bump_generation(cursor)
+        conn.commit()
+        conn.close()
+
+    def run_maintenance(self):
+        """Daily archival of expired raw rows and incremental vacuum, outside dawn hours (opt-in)."""
+        if not self.retention.due():
+            return
+        try:
+            self.retention.run()
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Retention run failed: {e}")
+
     def process_detections(self):
         """Process new detections."""
-        detections = self._get_new_detections()
+        with self._stage("birds_query"):
+            detections = self._get_new_detections()
 
         if not detections:
+            self.queue_depth = 0
             return
 
         processed = 0
         classified = 0
+        with self._stage("queue_count"):
+            pending = self._get_pending_count()
+        self.queue_depth = pending
 
         for detection in detections:
             rowid = detection['rowid']
@@ -268,38 +517,98 @@ class VocalizationService:
             # Check if we have a model for this species (by scientific name)
             if not self.classifier.has_model(scientific_name):
                 logger.warning(f"No model for: {scientific_name} ({common_name})")
+                self.detections_total.inc(outcome="no_model")
                 self.last_processed_id = rowid
                 processed += 1
                 continue
 
             logger.debug(f"Model found for: {scientific_name}")
+            detection_started = time.perf_counter()
+            self._timings = {} if self.trace is not None else None
 
             # Find audio file
-            audio_path = self._find_audio_file(detection)
+            with self._stage("file_resolution"):
+                audio_path = self._find_audio_file(detection)
             if not audio_path:
                 logger.warning(f"Audio not found for {common_name} ({scientific_name}): {detection.get('File_Name')}")
+                self.detections_total.inc(outcome="no_audio")
+                self._write_trace(detection, "no_audio", detection_started)
                 self.last_processed_id = rowid
                 processed += 1
                 continue
 
             logger.debug(f"Found audio: {audio_path}")
 
-            # Classify using scientific name
-            result = self.classifier.classify(scientific_name, audio_path)
+            # Cheaper tier when the backlog would otherwise miss the latency target
+            tier = self.scheduler.choose(
+                queue_depth=max(pending - processed, 1),
+                lag_seconds=self._detection_lag(detection)
+            )
+
+            # Identical audio under the same model and settings: reuse the result
+            with self._stage("cache_lookup"):
+                cache_key = self.result_cache.make_key(
+                    audio_path, self.classifier.result_signature(scientific_name, tier)
+                )
+                result = self.result_cache.get(cache_key)
+            cache = "off" if cache_key is None else "hit" if result is not None else "miss"
+
+            if result is None:
+                # Give BirdNET-Pi priority: wait for headroom, then pace to the CPU budget
+                with self._stage("throttle"):
+                    self.governor.wait_for_headroom()
+                started = self.governor.start()
+
+                # Classify using scientific name
+                result = self.classifier.classify(scientific_name, audio_path, tier=tier)
+                self.scheduler.observe(tier, time.monotonic() - started[0])
+                with self._stage("throttle"):
+                    self.governor.pace(started)
+                if result is not None:
+                    result.pop('timings', None)  # belongs to this call, not to the cached result
+                if self._timings is not None:
+                    self._timings.update(self.classifier.last_timings or {})
+                self.result_cache.put(cache_key, result)
 
             if result and result['confidence'] >= MIN_CONFIDENCE:
-                self._store_result(detection, result)
+                with self._stage("db_write"):
+                    self._store_result(detection, result, audio_path)
+                self.lag_seconds.observe(self._detection_lag(detection))
+                outcome = "classified"
                 classified += 1
                 logger.info(
                     f"{common_name} ({scientific_name}): {result['type_display']} ({result['confidence']:.0%})"
                 )
+            else:
+                outcome = "low_confidence" if result else "unclassified"
+            self.detections_total.inc(outcome=outcome)
+            self._write_trace(detection, outcome, detection_started, tier=tier, cache=cache, result=result)
 
             self.last_processed_id = rowid
             processed += 1
+            self.queue_depth = max(pending - processed, 0)
 
         if processed > 0:
             self._save_last_processed()
             logger.info(f"Processed {processed} detections, classified {classified}")
+            logger.info(self.governor.report())
+            logger.info(f"Tiers: {self.scheduler.report()}")
+            if self.result_cache.enabled:
+                logger.info(self.result_cache.report())
+            gated = self.classifier.gate_report()
+            if gated:
+                summary = ", ".join(
+                    f"{species}: {sum(reasons.values())}" for species, reasons in gated.items()
+                )
+                logger.info(f"Signal gate has saved {sum(sum(r.values()) for r in gated.values())} inferences so far ({summary})")
+            if self.classifier.cascade_threshold is not None:
+                report = self.classifier.cascade_report()
+                agreement = report['audit_agreement']
+                logger.info(
+                    f"Cascade: {report['early_exits']}/{report['runs']} early exits "
+                    f"({report['early_exit_rate']:.0%}), audit agreement "
+                    f"{'n/a' if agreement is None else f'{agreement:.0%}'} ({report['audited']} audited)"
+                )
 
     def run(self, interval: int = DEFAULT_INTERVAL):
         """Run the service loop."""
@@ -308,10 +617,18 @@ class VocalizationService:
         logger.info(f"Monitoring: {self.birdnet_db}")
         logger.info(f"Models: {self.classifier.models_dir}")
         logger.info(f"Available species: {len(self.classifier.get_available_species())}")
+        logger.info(f"CPU budget: {self.governor.cpu_budget:.0%} of {self.governor.cpu_count} cores")
+        self.governor.limit_threads()
+        if self.metrics_port is not None:
+            self.metrics_server = metrics.MetricsServer(self.metrics, port=self.metrics_port)
+            self.metrics_server.start()
 
         while self.running:
             try:
+                self.refresh_model_manifest()
+                self.check_anomalies()
                 self.process_detections()
+                self.run_maintenance()
             except Exception as e:
                 logger.error(f"Error processing detections: {e}")
 
@@ -320,6 +637,10 @@ class VocalizationService:
     def stop(self):
         """Stop the service."""
         self.running = False
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        if self.trace is not None:
+            self.trace.close()
         logger.info("Service stopping...")
 
 
@@ -359,6 +680,100 @@ def main():
         help="Language for vocalization types (en, nl, de, sv, no, da, fi, fr, es, it, pl, pt, cs, hu, ro, sk, uk, ru)"
     )
 
+    parser.add_argument(
+        "--cpu-budget",
+        type=float,
+        default=DEFAULT_CPU_BUDGET,
+        help=f"Fraction of total CPU the classifier may use, leaving the rest for BirdNET-Pi (default: {DEFAULT_CPU_BUDGET})"
+    )
+    parser.add_argument(
+        "--torch-threads",
+        type=int,
+        default=None,
+        help="Torch intra-op threads (default: derived from --cpu-budget)"
+    )
+
+    parser.add_argument(
+        "--target-latency",
+        type=float,
+        default=DEFAULT_TARGET_LATENCY,
+        help=f"Target seconds from detection to result; cheaper tiers are used when behind (default: {DEFAULT_TARGET_LATENCY})"
+    )
+    parser.add_argument(
+        "--tier",
+        type=str,
+        default=TIER_AUTO,
+        choices=[TIER_AUTO] + TIERS,
+        help="Classifier quality tier, or 'auto' to choose from queue depth (default: auto)"
+    )
+
+    parser.add_argument(
+        "--cascade-threshold",
+        type=float,
+        nargs="?",
+        const=DEFAULT_CASCADE_THRESHOLD,
+        default=None,
+        help=f"Enable cascade mode: answer from the shared gatekeeper model when its confidence "
+             f"is at least this value (default when given: {DEFAULT_CASCADE_THRESHOLD})"
+    )
+
+    parser.add_argument(
+        "--no-signal-gate",
+        action="store_true",
+        help="Classify every clip, including near-silent, clipped or noise-only audio"
+    )
+
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help=f"Maximum cached classification results, 0 to disable (default: {DEFAULT_MAX_ENTRIES})"
+    )
+
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=retention.DEFAULT_RETENTION_DAYS,
+        help="Days of raw results kept in the database; older ones move to compressed archive files "
+             "(charts keep the full history). The first run converts the database to incremental vacuum "
+             "with one full VACUUM, which needs free space for a copy of it (default: 0, keep everything)"
+    )
+
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        nargs="?",
+        const=metrics.DEFAULT_METRICS_PORT,
+        default=None,
+        help=f"Serve Prometheus metrics (stage latencies, cache hit rates, queue depth, memory) "
+             f"on this port at /metrics (default when given: {metrics.DEFAULT_METRICS_PORT})"
+    )
+
+    parser.add_argument(
+        "--trace-file",
+        type=Path,
+        nargs="?",
+        const=Path(trace_log.TRACE_FILE),
+        default=None,
+        help=f"Profile every classification and append per-stage timings as JSON lines to this rotating "
+             f"file, relative to --data-dir (default when given: {trace_log.TRACE_FILE}); "
+             f"summarise with scripts/analyze_trace.py"
+    )
+
+    parser.add_argument(
+        "--profile-seconds",
+        type=float,
+        default=profiler.DEFAULT_PROFILE_SECONDS,
+        help=f"Length of the stack-sampling profile started by SIGUSR1; SIGUSR2 writes a memory snapshot "
+             f"(both to data/{profiler.PROFILE_DIR}/, default: {profiler.DEFAULT_PROFILE_SECONDS})"
+    )
+
+    parser.add_argument(
+        "--rebuild-rollups",
+        action="store_true",
+        help="Backfill/repair the dashboard rollup tables from raw results and exit"
+    )
+
     args = parser.parse_args()
 
     # Setup logging first (needs data_dir)
@@ -369,9 +784,23 @@ def main():
         birdnet_dir=args.birdnet_dir,
         models_dir=args.models_dir,
         data_dir=args.data_dir,
-        language=args.language
+        language=args.language,
+        cpu_budget=args.cpu_budget,
+        torch_threads=args.torch_threads,
+        target_latency=args.target_latency,
+        tier=args.tier,
+        cascade_threshold=args.cascade_threshold,
+        signal_gate=not args.no_signal_gate,
+        cache_size=args.cache_size,
+        retention_days=args.retention_days,
+        metrics_port=args.metrics_port,
+        trace_file=args.data_dir / args.trace_file if args.trace_file is not None else None
     )
 
+    if args.rebuild_rollups:
+        service.rebuild_rollups()
+        return
+
     # Handle graceful shutdown
     def signal_handler(sig, frame):
         service.stop()
@@ -379,6 +808,8 @@ def main():
 
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
+    # SIGUSR1: wall-clock profile, SIGUSR2: memory snapshot, without losing the warm caches
+    profiler.RuntimeProfiler(args.data_dir, service.classifier, duration=args.profile_seconds).install()
 
     service.run(interval=args.interval)
 
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Species Directory and Name Search
+
+One row per (scientific name, common name) ever classified, with a
+detection count, kept in sync with the vocalizations table by triggers.
+Detections moved to the archive (retention.py) stay counted in
+'archived', so the directory covers the full history.
+An FTS5 trigram index over both names answers substring searches
+("merel", "turdus", "blackb") from the small species table, however long
+the vocalization history grows:
+
+    species      (id, scientific_name, common_name, detections, last_detected, archived)
+    species_fts  FTS5(common_name, scientific_name), tokenize='trigram'
+
+Usage:
+    species.create_tables(cursor)
+    species.rebuild(conn)
+    matches = species.search(conn, "merel", limit=10)
+"""
+
+import logging
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+MIN_TRIGRAM_QUERY = 3  # shorter queries cannot use the trigram index
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS species (
+        id INTEGER PRIMARY KEY,
+        scientific_name TEXT NOT NULL,
+        common_name TEXT NOT NULL,
+        detections INTEGER NOT NULL DEFAULT 0,
+        last_detected TIMESTAMP,
+        archived INTEGER NOT NULL DEFAULT 0,
+        UNIQUE (scientific_name, common_name)
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS species_fts USING fts5(
+        common_name, scientific_name,
+        content='species', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    # External-content FTS: mirror every change to species
+    """
+    CREATE TRIGGER IF NOT EXISTS species_fts_insert AFTER INSERT ON species BEGIN
+        INSERT INTO species_fts (rowid, common_name, scientific_name)
+        VALUES (new.id, new.common_name, new.scientific_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS species_fts_delete AFTER DELETE ON species BEGIN
+        INSERT INTO species_fts (species_fts, rowid, common_name, scientific_name)
+        VALUES ('delete', old.id, old.common_name, old.scientific_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS species_fts_update AFTER UPDATE OF common_name, scientific_name ON species BEGIN
+        INSERT INTO species_fts (species_fts, rowid, common_name, scientific_name)
+        VALUES ('delete', old.id, old.common_name, old.scientific_name);
+        INSERT INTO species_fts (rowid, common_name, scientific_name)
+        VALUES (new.id, new.common_name, new.scientific_name);
+    END
+    """,
+    # Keep the directory in step with the raw results
+    """
+    CREATE TRIGGER IF NOT EXISTS vocalizations_species_insert AFTER INSERT ON vocalizations BEGIN
+        INSERT INTO species (scientific_name, common_name, detections, last_detected)
+        VALUES (COALESCE(new.scientific_name, ''), COALESCE(new.common_name, ''), 1, new.detected_at)
+        ON CONFLICT (scientific_name, common_name) DO UPDATE SET
+            detections = detections + 1,
+            last_detected = MAX(COALESCE(last_detected, ''), COALESCE(excluded.last_detected, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS vocalizations_species_delete AFTER DELETE ON vocalizations BEGIN
+        UPDATE species SET detections = detections - 1
+        WHERE scientific_name = COALESCE(old.scientific_name, '')
+          AND common_name = COALESCE(old.common_name, '');
+    END
+    """,
+]
+
+
+def create_tables(cursor: sqlite3.Cursor):
+    """Create the species table, its FTS index and the sync triggers."""
+    for statement in SCHEMA:
+        cursor.execute(statement)
+
+
+def rebuild(conn: sqlite3.Connection, commit: bool = True) -> int:
+    """Repopulate the species directory from the raw vocalizations table.
+
+    Archived detection counts are kept. Returns the number of species entries.
+    """
+    cursor = conn.cursor()
+    create_tables(cursor)
+    cursor.execute("DELETE FROM species WHERE archived = 0")
+    cursor.execute("UPDATE species SET detections = archived")
+    cursor.execute("""
+        INSERT INTO species (scientific_name, common_name, detections, last_detected)
+        SELECT COALESCE(scientific_name, ''), COALESCE(common_name, ''), COUNT(*), MAX(detected_at)
+        FROM vocalizations
+        GROUP BY 1, 2
+        ON CONFLICT (scientific_name, common_name) DO UPDATE SET
+            detections = detections + excluded.detections,
+            last_detected = MAX(COALESCE(last_detected, ''), COALESCE(excluded.last_detected, ''))
+    """)
+    cursor.execute("INSERT INTO species_fts (species_fts) VALUES ('rebuild')")
+    if commit:
+        conn.commit()
+
+    cursor.execute("SELECT COUNT(*) FROM species")
+    total = cursor.fetchone()[0]
+    logger.info(f"Species directory rebuilt: {total} entries")
+    return total
+
+
+def search(conn: sqlite3.Connection, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> list[dict]:
+    """Species whose common or scientific name contains query (case-insensitive).
+
+    Names starting with the query rank first, then by number of detections.
+    """
+    query = query.strip()
+    limit = min(max(limit, 1), MAX_SEARCH_LIMIT)
+    if not query:
+        return []
+
+    prefix = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    order = """
+        ORDER BY (s.common_name LIKE :prefix ESCAPE '\\' OR s.scientific_name LIKE :prefix ESCAPE '\\') DESC,
+                 s.detections DESC, s.common_name
+        LIMIT :limit
+    """
+    if len(query) >= MIN_TRIGRAM_QUERY:
+        # Quoted as one FTS phrase: user input is never FTS syntax
+        sql = f"""
+            SELECT s.common_name, s.scientific_name, s.detections, s.last_detected
+            FROM species_fts JOIN species s ON s.id = species_fts.rowid
+            WHERE species_fts MATCH :match AND s.detections > 0
+            {order}
+        """
+        params = {"match": '"' + query.replace('"', '""') + '"', "prefix": prefix, "limit": limit}
+    else:
+        sql = f"""
+            SELECT s.common_name, s.scientific_name, s.detections, s.last_detected
+            FROM species s
+            WHERE (s.common_name LIKE :prefix ESCAPE '\\' OR s.scientific_name LIKE :prefix ESCAPE '\\')
+              AND s.detections > 0
+            {order}
+        """
+        params = {"prefix": prefix, "limit": limit}
+
+    columns = ("common_name", "scientific_name", "detections", "last_detected")
+    return [dict(zip(columns, row)) for row in conn.execute(sql, params)]
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Spectrogram Images
+
+Renders the 128x128 mel spectrogram a species model saw for a clip as a
+small PNG, through the classifier's own decode and spectrogram code
+(VocalizationClassifier.model_input), so a questionable result can be
+checked against its actual input. Images are cached on disk:
+
+    data/spectrograms/<key>.png   key = hash of the audio fingerprint and
+                                  the spectrogram parameters of the tier
+
+The cache is an LRU bounded by total size (file mtimes record use).
+Renders run in a small worker pool: a request for an image that is not
+cached starts the render and returns at once, so the web viewer's HTTP
+threads never wait on audio decode.
+
+Usage:
+    renderer = SpectrogramRenderer(classifier, data_dir / CACHE_DIR)
+    state, png_path = renderer.request(audio_path, tier)   # 'ready', 'pending' or 'failed'
+"""
+
+import hashlib
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from result_cache import audio_fingerprint
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "spectrograms"
+DEFAULT_CACHE_MB = 64
+RENDER_WORKERS = 1         # decode + mel is CPU heavy; BirdNET-Pi shares the CPU
+FAILURE_TTL = 300          # seconds before a failed render is retried
+TOUCH_INTERVAL = 3600      # refresh a cached file's mtime at most this often
+FINGERPRINT_MEMO = 4096    # audio fingerprints kept by (path, size, mtime)
+IMAGE_VERSION = "viridis-v1"
+
+# Anchor colours of the viridis colour map, interpolated to 256 entries
+VIRIDIS_ANCHORS = [(68, 1, 84), (59, 82, 139), (33, 145, 140), (94, 201, 98), (253, 231, 37)]
+
+
+def palette() -> bytes:
+    """256-entry RGB palette for the PNG PLTE chunk."""
+    anchors = np.array(VIRIDIS_ANCHORS, dtype=np.float64)
+    positions = np.linspace(0, 255, len(anchors))
+    levels = np.arange(256)
+    colors = np.stack([np.interp(levels, positions, anchors[:, c]) for c in range(3)], axis=1)
+    return colors.round().astype(np.uint8).tobytes()
+
+
+PALETTE = palette()
+
+
+def encode_png(spectrogram: np.ndarray) -> bytes:
+    """8-bit palette PNG of a [0, 1] spectrogram, low frequencies at the bottom."""
+    pixels = np.clip(spectrogram[::-1] * 255, 0, 255).round().astype(np.uint8)
+    height, width = pixels.shape
+    # Each scanline starts with filter type 0 (none)
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), pixels]).tobytes()
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0))
+        + chunk(b"PLTE", PALETTE)
+        + chunk(b"IDAT", zlib.compress(raw, 9))
+        + chunk(b"IEND", b"")
+    )
+
+
+class SpectrogramRenderer:
+    """Disk-cached model-input spectrogram PNGs, rendered in a worker pool."""
+
+    def __init__(self, classifier, cache_dir: Path, max_bytes: int = DEFAULT_CACHE_MB * 1_000_000):
+        self.classifier = classifier
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.pool = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="spectrogram")
+        self.lock = threading.Lock()
+        self.pending = set()
+        self.failed = {}                   # key -> time of the failure
+        self.fingerprints = OrderedDict()  # (path, size, mtime_ns) -> fingerprint
+        self.stats = {'hits': 0, 'renders': 0, 'failures': 0, 'evictions': 0}
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.total_bytes = sum(entry.stat().st_size for entry in os.scandir(self.cache_dir)
+                               if entry.name.endswith(".png"))
+
+    def _fingerprint(self, audio_path: Path) -> str:
+        st = audio_path.stat()
+        memo_key = (str(audio_path), st.st_size, st.st_mtime_ns)
+        with self.lock:
+            fingerprint = self.fingerprints.get(memo_key)
+            if fingerprint is not None:
+                self.fingerprints.move_to_end(memo_key)
+                return fingerprint
+        fingerprint = audio_fingerprint(audio_path)
+        with self.lock:
+            self.fingerprints[memo_key] = fingerprint
+            while len(self.fingerprints) > FINGERPRINT_MEMO:
+                self.fingerprints.popitem(last=False)
+        return fingerprint
+
+    def make_key(self, audio_path: Path, tier: str) -> str:
+        """Cache key of a clip's image under a tier's spectrogram parameters."""
+        signature = f"{self._fingerprint(audio_path)}|{self.classifier.spectrogram_signature(tier)}|{IMAGE_VERSION}"
+        return hashlib.blake2b(signature.encode(), digest_size=16).hexdigest()
+
+    def request(self, audio_path: Path, tier: str) -> tuple[str, Path | None]:
+        """('ready', png path), or ('pending', None) after starting a render, or ('failed', None)."""
+        key = self.make_key(audio_path, tier)
+        path = self.cache_dir / f"{key}.png"
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime is not None:
+            if time.time() - mtime > TOUCH_INTERVAL:
+                os.utime(path)  # LRU: mark as recently used
+            self.stats['hits'] += 1
+            return 'ready', path
+
+        with self.lock:
+            failed_at = self.failed.get(key)
+            if failed_at is not None and time.monotonic() - failed_at < FAILURE_TTL:
+                return 'failed', None
+            if key not in self.pending:
+                self.pending.add(key)
+                self.pool.submit(self._render, key, audio_path, tier)
+        return 'pending', None
+
+    def _render(self, key: str, audio_path: Path, tier: str):
+        try:
+            spectrogram = self.classifier.model_input(audio_path, tier)
+            if spectrogram is None:
+                raise ValueError("could not decode audio")
+            png = encode_png(spectrogram)
+            path = self.cache_dir / f"{key}.png"
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(png)
+            os.replace(tmp, path)
+            with self.lock:
+                self.total_bytes += len(png)
+                self.failed.pop(key, None)
+            self.stats['renders'] += 1
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+        except Exception as e:
+            logger.warning(f"Spectrogram render failed for {audio_path.name}: {e}")
+            self.stats['failures'] += 1
+            with self.lock:
+                self.failed[key] = time.monotonic()
+        finally:
+            with self.lock:
+                self.pending.discard(key)
+
+    def _evict(self):
+        """Delete least recently used images until the cache is at 90% of its limit."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".png"):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.stats['evictions'] += 1
+        with self.lock:
+            self.total_bytes = total
@@ -0,0 +1,619 @@
+// All code in global scope for onclick handlers
+var updateInfo = null;
+var timeChart = null;
+var speciesChart = null;
+var hourlyChart = null;
+var initialized = false;
+var behaviorLoaded = false;
+
+// Tab switching
+function switchTab(tabName) {
+    // Update tab buttons
+    document.querySelectorAll('.tab-btn').forEach(btn => {
+        btn.classList.toggle('active', btn.textContent.toLowerCase().includes(tabName));
+    });
+    // Update tab content
+    document.querySelectorAll('.tab-content').forEach(content => {
+        content.classList.toggle('active', content.id === 'tab-' + tabName);
+    });
+    // Load behavior data on first switch
+    if (tabName === 'behavior' && !behaviorLoaded) {
+        loadBehaviorData();
+        behaviorLoaded = true;
+    }
+}
+
+// Behavior Insights
+async function loadBehaviorData() {
+    try {
+        const res = await fetch('/api/behavior');
+        const data = await res.json();
+        renderTrends(data.trends);
+        renderAlerts(data.alerts);
+        renderSpeciesBreakdown(data.species_breakdown);
+        renderHourlyChart(data.hourly_patterns);
+    } catch (e) {
+        console.error('Behavior data error:', e);
+    }
+}
+
+function renderTrends(trends) {
+    const container = document.getElementById('trends-container');
+    if (!trends || trends.length === 0) {
+        container.innerHTML = '<p style="color: var(--text-secondary)">Not enough data yet</p>';
+        return;
+    }
+    container.innerHTML = trends.map(t => {
+        const arrow = t.change_pct > 0 ? '↑' : (t.change_pct < 0 ? '↓' : '→');
+        const cls = t.change_pct > 0 ? 'up' : (t.change_pct < 0 ? 'down' : 'neutral');
+        return `
+            <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
+                <span class="type-${t.type}" style="text-transform: capitalize; font-weight: bold;">${t.type}</span>
+                <span class="trend-badge ${cls}">${arrow} ${Math.abs(t.change_pct)}% (${t.this_week} vs ${t.last_week})</span>
+            </div>
+        `;
+    }).join('');
+}
+
+function renderAlerts(alerts) {
+    const container = document.getElementById('alerts-container');
+    if (!alerts || alerts.length === 0) {
+        container.innerHTML = '<li style="color: var(--text-secondary); padding: 10px;">No alerts - all normal</li>';
+        return;
+    }
+    container.innerHTML = alerts.map(a => `
+        <li class="alert-item ${a.severity}">
+            <span class="alert-icon">${a.type === 'alarm_spike' ? '⚠️' : 'ℹ️'}</span>
+            <span>${a.message}</span>
+        </li>
+    `).join('');
+}
+
+function renderSpeciesBreakdown(species) {
+    const container = document.getElementById('species-breakdown');
+    if (!species || species.length === 0) {
+        container.innerHTML = '<p style="color: var(--text-secondary)">Not enough data yet</p>';
+        return;
+    }
+    container.innerHTML = species.map(s => `
+        <div class="species-row">
+            <div class="species-row-header">
+                <span class="species-row-name">${s.species}</span>
+                <span class="species-row-total">${s.total} total</span>
+            </div>
+            <div class="species-bar">
+                <div class="species-bar-segment song" style="width: ${s.song_pct}%"></div>
+                <div class="species-bar-segment call" style="width: ${s.call_pct}%"></div>
+                <div class="species-bar-segment alarm" style="width: ${s.alarm_pct}%"></div>
+            </div>
+        </div>
+    `).join('');
+}
+
+function renderHourlyChart(data) {
+    if (!data || !data.labels) return;
+    const colors = getChartColors();
+    const ctx = document.getElementById('hourlyChart').getContext('2d');
+    if (hourlyChart) hourlyChart.destroy();
+    hourlyChart = new Chart(ctx, {
+        type: 'line',
+        data: {
+            labels: data.labels,
+            datasets: [
+                { label: 'Song', data: data.song, borderColor: colors.song, backgroundColor: 'transparent', tension: 0.3 },
+                { label: 'Call', data: data.call, borderColor: colors.call, backgroundColor: 'transparent', tension: 0.3 },
+                { label: 'Alarm', data: data.alarm, borderColor: colors.alarm, backgroundColor: 'transparent', tension: 0.3 }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: { legend: { labels: { color: colors.text } } },
+            scales: {
+                x: { ticks: { color: colors.text }, grid: { color: colors.grid } },
+                y: { ticks: { color: colors.text }, grid: { color: colors.grid }, beginAtZero: true }
+            }
+        }
+    });
+}
+
+// Theme management - must be global for onclick
+function toggleTheme() {
+    const body = document.body;
+    const btn = document.getElementById('theme-toggle');
+    if (body.dataset.theme === 'light') {
+        body.dataset.theme = 'dark';
+        btn.textContent = '🌙';
+        localStorage.setItem('theme', 'dark');
+    } else {
+        body.dataset.theme = 'light';
+        btn.textContent = '☀️';
+        localStorage.setItem('theme', 'light');
+    }
+    updateChartColors();
+}
+
+function initTheme() {
+    const saved = localStorage.getItem('theme') || 'dark';
+    document.body.dataset.theme = saved;
+    document.getElementById('theme-toggle').textContent = saved === 'light' ? '☀️' : '🌙';
+}
+
+function getChartColors() {
+    const isDark = document.body.dataset.theme !== 'light';
+    return {
+        text: isDark ? '#eee' : '#333',
+        grid: isDark ? 'rgba(255,255,255,0.1)' : 'rgba(0,0,0,0.1)',
+        song: '#4ecca3',
+        call: '#f9ed69',
+        alarm: '#f38181'
+    };
+}
+
+function updateChartColors() {
+    const colors = getChartColors();
+    if (timeChart) {
+        timeChart.options.scales.x.ticks.color = colors.text;
+        timeChart.options.scales.y.ticks.color = colors.text;
+        timeChart.options.scales.x.grid.color = colors.grid;
+        timeChart.options.scales.y.grid.color = colors.grid;
+        timeChart.update();
+    }
+    if (speciesChart) {
+        speciesChart.options.scales.x.ticks.color = colors.text;
+        speciesChart.options.scales.y.ticks.color = colors.text;
+        speciesChart.options.scales.x.grid.color = colors.grid;
+        speciesChart.options.scales.y.grid.color = colors.grid;
+        speciesChart.update();
+    }
+    if (hourlyChart) {
+        hourlyChart.options.scales.x.ticks.color = colors.text;
+        hourlyChart.options.scales.y.ticks.color = colors.text;
+        hourlyChart.options.scales.x.grid.color = colors.grid;
+        hourlyChart.options.scales.y.grid.color = colors.grid;
+        hourlyChart.options.plugins.legend.labels.color = colors.text;
+        hourlyChart.update();
+    }
+}
+
+// Update check
+async function checkUpdate() {
+    const dot = document.getElementById('update-dot');
+    const btn = document.getElementById('update-btn');
+    const versionInfo = document.getElementById('version-info');
+
+    dot.className = 'update-dot checking';
+    try {
+        const res = await fetch('/api/update/check');
+        const data = await res.json();
+        updateInfo = data;
+        versionInfo.textContent = 'v' + data.local_commit.substring(0, 7);
+        if (data.update_available) {
+            dot.className = 'update-dot available';
+            dot.title = 'Update available!';
+            btn.classList.add('visible');
+        } else {
+            dot.className = 'update-dot';
+            dot.style.background = '#4ecca3';
+            dot.title = 'Up to date';
+            btn.classList.remove('visible');
+        }
+    } catch (e) {
+        dot.className = 'update-dot';
+        dot.style.background = '#f38181';
+        dot.title = 'Could not check for updates';
+    }
+}
+
+function showUpdateModal() {
+    if (!updateInfo) return;
+    document.getElementById('update-message').textContent =
+        `New version available: ${updateInfo.remote_commit.substring(0, 7)}`;
+    document.getElementById('update-details').textContent =
+        updateInfo.commit_message || 'No commit message';
+    document.getElementById('update-modal').classList.add('visible');
+}
+
+function hideUpdateModal() {
+    document.getElementById('update-modal').classList.remove('visible');
+}
+
+async function applyUpdate() {
+    const btn = document.getElementById('apply-update-btn');
+    const details = document.getElementById('update-details');
+    btn.disabled = true;
+    btn.textContent = 'Updating...';
+    details.textContent = 'Pulling latest changes...';
+    try {
+        const res = await fetch('/api/update/apply', { method: 'POST' });
+        const data = await res.json();
+        if (data.success) {
+            details.textContent = data.output + '\n\nReloading...';
+            setTimeout(() => window.location.reload(), 3000);
+        } else {
+            details.textContent = 'Failed: ' + data.error;
+            btn.disabled = false;
+            btn.textContent = 'Retry';
+        }
+    } catch (e) {
+        details.textContent = 'Error: ' + e.message;
+        btn.disabled = false;
+        btn.textContent = 'Retry';
+    }
+}
+
+// Stats and coverage
+var currentStats = null;
+async function loadStats() {
+    try {
+        const res = await fetch('/api/stats');
+        renderStats(await res.json());
+    } catch (e) {
+        console.error('Stats error:', e);
+    }
+}
+
+// Apply an event stream delta ({total: +n, song: +n, ..., species: +n})
+function applyStatsDelta(delta) {
+    if (!currentStats) return;
+    for (const key of ['total', 'song', 'call', 'alarm']) {
+        if (delta[key]) currentStats[key] = (currentStats[key] || 0) + delta[key];
+    }
+    const coverage = currentStats.coverage;
+    if (coverage && delta.species) {
+        coverage.covered += delta.species;
+        coverage.percent = coverage.total > 0 ? Math.round(coverage.covered / coverage.total * 100) : 0;
+    }
+    renderStats(currentStats);
+}
+
+function renderStats(stats) {
+    currentStats = stats;
+    const coverage = stats.coverage || { covered: 0, total: 0, percent: 0 };
+    document.getElementById('stats').innerHTML = `
+        <div class="stat-card"><h3>${stats.total}</h3><p>Total</p></div>
+        <div class="stat-card"><h3>${stats.song || 0}</h3><p>Songs</p></div>
+        <div class="stat-card"><h3>${stats.call || 0}</h3><p>Calls</p></div>
+        <div class="stat-card"><h3>${stats.alarm || 0}</h3><p>Alarms</p></div>
+        <div class="stat-card coverage"><h3>${coverage.covered}/${coverage.total} (${coverage.percent}%)</h3><p>Model Coverage</p></div>
+    `;
+}
+
+// Charts
+async function loadCharts() {
+    try {
+        const res = await fetch('/api/charts');
+        const data = await res.json();
+        const colors = getChartColors();
+
+        // Time chart
+        const timeCtx = document.getElementById('timeChart').getContext('2d');
+        if (timeChart) timeChart.destroy();
+        timeChart = new Chart(timeCtx, {
+            type: 'bar',
+            data: {
+                labels: data.daily.labels,
+                datasets: [
+                    { label: 'Song', data: data.daily.song, backgroundColor: colors.song },
+                    { label: 'Call', data: data.daily.call, backgroundColor: colors.call },
+                    { label: 'Alarm', data: data.daily.alarm, backgroundColor: colors.alarm }
+                ]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: { legend: { labels: { color: colors.text } } },
+                scales: {
+                    x: { stacked: true, ticks: { color: colors.text }, grid: { color: colors.grid } },
+                    y: { stacked: true, ticks: { color: colors.text }, grid: { color: colors.grid } }
+                }
+            }
+        });
+
+        // Species chart
+        const speciesCtx = document.getElementById('speciesChart').getContext('2d');
+        if (speciesChart) speciesChart.destroy();
+        speciesChart = new Chart(speciesCtx, {
+            type: 'bar',
+            data: {
+                labels: data.top_species.labels,
+                datasets: [{
+                    label: 'Count',
+                    data: data.top_species.values,
+                    backgroundColor: colors.song
+                }]
+            },
+            options: {
+                indexAxis: 'y',
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: { legend: { display: false } },
+                scales: {
+                    x: { ticks: { color: colors.text }, grid: { color: colors.grid } },
+                    y: { ticks: { color: colors.text }, grid: { display: false } }
+                }
+            }
+        });
+    } catch (e) { console.error('Charts error:', e); }
+}
+
+// Database timestamps are UTC ('YYYY-MM-DD HH:MM:SS'); show in local time
+function formatTime(ts) {
+    return new Date(ts.replace(' ', 'T') + 'Z').toLocaleString();
+}
+
+// Species autocomplete (common or scientific name, any part of it)
+var suggestTimer = null;
+function onSpeciesInput() {
+    clearTimeout(suggestTimer);
+    suggestTimer = setTimeout(async () => {
+        const q = document.getElementById('filter-species').value.trim();
+        const list = document.getElementById('species-suggestions');
+        if (q.length > 0) {
+            try {
+                const res = await fetch('/api/species/search?limit=10&q=' + encodeURIComponent(q));
+                const matches = await res.json();
+                list.innerHTML = matches.map(m =>
+                    `<option value="${escapeHtml(m.common_name)}">${escapeHtml(m.scientific_name)}</option>`
+                ).join('');
+            } catch (e) {
+                list.innerHTML = '';
+            }
+        } else {
+            list.innerHTML = '';
+        }
+        loadData();
+    }, 200);
+}
+
+function escapeHtml(text) {
+    return String(text).replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c]));
+}
+
+// Data table
+async function loadData() {
+    const type = document.getElementById('filter-type').value;
+    const species = document.getElementById('filter-species').value;
+    let url = '/api/vocalizations?limit=100';
+    if (type) url += '&type=' + type;
+    if (species) url += '&species=' + encodeURIComponent(species);
+
+    try {
+        const res = await fetch(url);
+        const data = await res.json();
+        const tbody = document.getElementById('results');
+
+        if (data.length === 0) {
+            tbody.innerHTML = '<tr><td colspan="6" class="empty">No vocalizations yet. Waiting for BirdNET-Pi detections...</td></tr>';
+            return;
+        }
+
+        tbody.innerHTML = data.map(renderRow).join('');
+        for (const row of data) lastRowId = Math.max(lastRowId, row.id);
+        loadPeaks(data.map(row => row.id));
+    } catch (e) {
+        document.getElementById('results').innerHTML = '<tr><td colspan="6" class="empty">Error loading data</td></tr>';
+    }
+}
+
+function renderRow(row) {
+    return `
+            <tr class="clickable">
+                <td>${formatTime(row.detected_at || row.classified_at)}</td>
+                <td>${row.common_name}</td>
+                <td class="type-${row.vocalization_type}">${(row.vocalization_type_display || row.vocalization_type).toUpperCase()}</td>
+                <td><span class="confidence">${Math.round(row.confidence * 100)}%</span></td>
+                <td><button class="play-btn" onclick="playAudio('${row.file_name}', '${row.common_name}')" ${row.file_name ? '' : 'disabled'}>▶ Play</button><canvas class="waveform" id="wave-${row.id}" width="100" height="24"></canvas></td>
+                <td class="feedback-btns" id="feedback-${row.id}">
+                    <button class="feedback-btn" onclick="sendFeedback(${row.id}, true, this)" title="Correct">👍</button>
+                    <button class="feedback-btn" onclick="sendFeedback(${row.id}, false, this)" title="Incorrect">👎</button>
+                    <button class="feedback-btn" onclick="toggleSpectrogram(${row.id}, this)" title="Show what the model saw" ${row.file_name ? '' : 'disabled'}>🔍</button>
+                </td>
+            </tr>
+        `;
+}
+
+// Live updates: the server pushes new classifications and stat deltas
+var stream = null;
+var lastRowId = 0;
+var chartsDirty = false;
+var reloadTimer = null;
+
+function startStream() {
+    if (!window.EventSource) {
+        // Old browsers: fall back to polling
+        setInterval(loadData, 30000);
+        setInterval(loadStats, 60000);
+        return;
+    }
+    let opened = false;
+    stream = new EventSource('/api/stream' + (lastRowId ? '?last_id=' + lastRowId : ''));
+    stream.addEventListener('open', () => {
+        // Stat deltas sent while disconnected are lost: refresh once on reconnect
+        if (opened) loadStats();
+        opened = true;
+    });
+    stream.addEventListener('vocalization', e => addRow(JSON.parse(e.data)));
+    stream.addEventListener('stats', e => {
+        applyStatsDelta(JSON.parse(e.data));
+        chartsDirty = true;
+    });
+    stream.addEventListener('reset', () => {
+        loadData();
+        loadStats();
+        chartsDirty = true;
+    });
+    stream.addEventListener('error', () => {
+        // The browser retries by itself unless the server refused us
+        if (stream.readyState === EventSource.CLOSED) {
+            stream = null;
+            setTimeout(startStream, 30000);
+        }
+    });
+}
+
+function addRow(row) {
+    lastRowId = Math.max(lastRowId, row.id);
+    const type = document.getElementById('filter-type').value;
+    const species = document.getElementById('filter-species').value;
+    if (type && row.vocalization_type !== type) return;
+    if (species) {
+        // Name matching happens server side; reload the filtered page once
+        clearTimeout(reloadTimer);
+        reloadTimer = setTimeout(loadData, 1000);
+        return;
+    }
+    const tbody = document.getElementById('results');
+    const empty = tbody.querySelector('td.empty');
+    if (empty) tbody.innerHTML = '';
+    tbody.insertAdjacentHTML('afterbegin', renderRow(row));
+    while (tbody.rows.length > 100) tbody.deleteRow(-1);
+    loadPeaks([row.id]);
+}
+
+// Waveform previews: min/max peaks of a whole page in one small request
+async function loadPeaks(ids) {
+    if (!ids.length) return;
+    try {
+        const res = await fetch('/api/peaks?ids=' + ids.join(','));
+        const data = await res.json();
+        for (const [id, encoded] of Object.entries(data.peaks || {})) {
+            const canvas = document.getElementById('wave-' + id);
+            if (canvas) drawPeaks(canvas, encoded);
+        }
+    } catch (e) {
+        console.error('Peaks error:', e);
+    }
+}
+
+function drawPeaks(canvas, encoded) {
+    // Interleaved (min, max) int8 pairs, scaled to +-127
+    const peaks = new Int8Array(Uint8Array.from(atob(encoded), c => c.charCodeAt(0)).buffer);
+    const buckets = peaks.length / 2;
+    const ctx = canvas.getContext('2d');
+    const mid = canvas.height / 2;
+    const step = canvas.width / buckets;
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    ctx.fillStyle = getComputedStyle(canvas).color;
+    for (let i = 0; i < buckets; i++) {
+        const top = mid - peaks[2 * i + 1] / 127 * mid;
+        const bottom = mid - peaks[2 * i] / 127 * mid;
+        ctx.fillRect(i * step, top, Math.max(step - 0.5, 1), Math.max(bottom - top, 1));
+    }
+}
+
+// Charts only change with new data
+function refreshCharts() {
+    if (chartsDirty || !stream) {
+        chartsDirty = false;
+        loadCharts();
+    }
+}
+
+// Feedback
+async function sendFeedback(id, correct, btn) {
+    try {
+        const res = await fetch('/api/feedback', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ id: id, correct: correct })
+        });
+        const data = await res.json();
+        if (data.success) {
+            // Update button appearance
+            const container = document.getElementById('feedback-' + id);
+            const btns = container.querySelectorAll('.feedback-btn');
+            btns.forEach(b => {
+                b.classList.remove('selected', 'faded');
+                if (b === btn) {
+                    b.classList.add('selected');
+                    b.classList.add(correct ? 'correct' : 'incorrect');
+                } else {
+                    b.classList.add('faded');
+                }
+            });
+        }
+    } catch (e) {
+        console.error('Feedback error:', e);
+    }
+}
+
+// Spectrogram: the 128x128 model input, rendered by the server (202 while rendering)
+async function toggleSpectrogram(id, btn) {
+    const container = document.getElementById('feedback-' + id);
+    const shown = container.querySelector('.spectrogram');
+    if (shown) {
+        shown.remove();
+        return;
+    }
+    btn.disabled = true;
+    try {
+        for (let attempt = 0; attempt < 30; attempt++) {
+            const res = await fetch('/api/spectrogram?id=' + id);
+            if (res.status === 202) {
+                const wait = parseInt(res.headers.get('Retry-After') || '1', 10);
+                await new Promise(resolve => setTimeout(resolve, wait * 1000));
+                continue;
+            }
+            if (res.ok) {
+                const img = document.createElement('img');
+                img.className = 'spectrogram';
+                img.alt = 'Mel spectrogram';
+                img.src = URL.createObjectURL(await res.blob());
+                container.appendChild(img);
+            }
+            break;
+        }
+    } catch (e) {
+        console.error('Spectrogram error:', e);
+    }
+    btn.disabled = false;
+}
+
+// Audio player
+function playAudio(filename, species) {
+    if (!filename) return;
+    const player = document.getElementById('audio-player');
+    const audio = document.getElementById('audio-element');
+    const speciesName = document.getElementById('player-species');
+
+    audio.src = '/api/audio?file=' + encodeURIComponent(filename);
+    speciesName.textContent = species;
+    player.classList.add('visible');
+    audio.play().catch(e => console.log('Playback error:', e));
+}
+
+function closePlayer() {
+    const player = document.getElementById('audio-player');
+    const audio = document.getElementById('audio-element');
+    audio.pause();
+    player.classList.remove('visible');
+}
+
+// Initialize after page load
+function init() {
+    if (initialized) return;
+    initialized = true;
+
+    try {
+        // Event listeners
+        document.getElementById('filter-type').addEventListener('change', loadData);
+        document.getElementById('filter-species').addEventListener('input', onSpeciesInput);
+
+        initTheme();
+        checkUpdate();
+        loadStats();
+        loadData().then(startStream);
+
+        // Chart.js loads asynchronously after init
+        // Charts will be loaded when Chart.js script completes
+
+        setInterval(checkUpdate, 300000);
+    } catch (e) {
+        console.error('Init error:', e);
+    }
+}
+
+// Initialize when DOM is ready
+document.addEventListener('DOMContentLoaded', init);
+if (document.readyState !== 'loading') init();
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Timing Trace Log
+
+Opt-in structured trace of where the service spends its time: one JSON
+line per processed detection with the service's stages (file resolution,
+result cache lookup, throttling, database write) and, for clips that were
+classified, the classifier's own stages from its profiling mode:
+
+    {"at": "2025-05-01 05:12:03", "birdnet_id": 1234, "species": "Turdus merula",
+     "common_name": "Blackbird", "tier": "full", "cache": "miss",
+     "outcome": "classified", "model_cache": "hit",
+     "timings": {"file_resolution": 0.0004, "cache_lookup": 0.0011, "decode": 0.2112,
+                 "mel": 0.0183, "resize": 0.0031, "inference": 0.0224, ...}}
+
+Timings are seconds. The file rotates at TRACE_MAX_BYTES and keeps
+TRACE_BACKUPS older files (trace.jsonl.1, .2, ...), so tracing can stay on
+for days without filling the SD card. scripts/analyze_trace.py prints
+percentiles per stage and per species.
+
+Usage:
+    trace = TraceLog(data_dir / TRACE_FILE)
+    trace.write({"birdnet_id": 1234, "timings": {"decode": 0.21}})
+"""
+
+import json
+import logging
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+import database
+
+TRACE_FILE = "trace.jsonl"
+TRACE_MAX_BYTES = 5_000_000
+TRACE_BACKUPS = 3
+
+
+class TraceLog:
+    """Append-only JSON lines file with size-based rotation."""
+
+    def __init__(self, path: Path, max_bytes: int = TRACE_MAX_BYTES, backups: int = TRACE_BACKUPS):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        # Own logger, not propagated: trace lines stay out of service.log
+        self.logger = logging.getLogger(f"{__name__}.{path}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.handlers = [handler]
+
+    def write(self, record: dict):
+        """Append one record; float timings are rounded to microseconds."""
+        timings = {
+            stage: round(value, 6) if isinstance(value, float) else value
+            for stage, value in record.get("timings", {}).items()
+        }
+        self.logger.info(json.dumps({"at": database.utc_now(), **record, "timings": timings}))
+
+    def close(self):
+        for handler in self.logger.handlers:
+            handler.close()
+        self.logger.handlers = []
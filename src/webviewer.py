@@ -10,20 +10,246 @@ Usage:
 """
 
 import argparse
+import base64
+import binascii
+import hashlib
 import json
 import os
 import sqlite3
 import subprocess
+import threading
+import time
 import urllib.request
-from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from collections import OrderedDict
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 
+import database
+import export
+import insights
+import model_manifest
+import retention
+import rollups
+from event_stream import RETRY_MS, EventStream
+import species
+import spectrograms
+from audio_files import AUDIO_TYPES, AudioIndex, audio_roots, is_within
+from assets import STATIC_PREFIX, StaticAssets, choose_encoding, compress
+from classifier import PEAK_BUCKETS, SEGMENT_DURATION, TIER_FULL, VocalizationClassifier
+
 DEFAULT_PORT = 8088
 DEFAULT_DATA_DIR = Path("/opt/birdnet-vocalization/data")
 INSTALL_DIR = Path("/opt/birdnet-vocalization")
 GITHUB_API_URL = "https://api.github.com/repos/RonnyCHL/birdnet-vocalization/commits/master"
+DEFAULT_WORKERS = 8
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Columns returned by /api/vocalizations (audio_path stays server-side)
+VOCALIZATION_COLUMNS = (
+    "id", "birdnet_id", "file_name", "common_name", "scientific_name",
+    "vocalization_type", "vocalization_type_display", "confidence", "probabilities",
+    "p_song", "p_call", "p_alarm", "tier", "classified_at", "detected_at",
+)
+# Parquet column types of /api/export (the other columns are text)
+EXPORT_COLUMN_TYPES = {
+    "id": "int", "birdnet_id": "int", "confidence": "float",
+    "p_song": "float", "p_call": "float", "p_alarm": "float",
+}
+EXPORT_SLOTS = threading.BoundedSemaphore(2)  # concurrent exports, each holds a worker
+EXPORT_SEND_TIMEOUT = 60  # seconds a client may stop reading before the export is dropped
+RESPONSE_CACHE_ENTRIES = 256
+# Windows like "today" and "last 24 hours" move even without new rows
+RESPONSE_CACHE_TTL = 60
+
+# Per-worker-thread read-only database connections
+_thread_local = threading.local()
+
+
+def encode_cursor(detected_at: str, row_id: int) -> str:
+    """Opaque pagination cursor for the row after which the next page starts."""
+    return base64.urlsafe_b64encode(f"{detected_at}|{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    """Inverse of encode_cursor(). Raises ValueError on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        detected_at, row_id = raw.rsplit("|", 1)
+        return detected_at, int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def parse_timestamp(value: str, name: str, end_of_day: bool = False) -> str:
+    """Normalise a date or timestamp parameter to a database timestamp.
+
+    A bare date means the start of that day, or with end_of_day (for
+    exclusive upper bounds) the start of the next day.
+    """
+    value = value.strip().replace("T", " ").rstrip("Z")
+    for fmt in (database.TIMESTAMP_FORMAT, "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if fmt == "%Y-%m-%d" and end_of_day:
+            parsed += timedelta(days=1)
+        return parsed.strftime(database.TIMESTAMP_FORMAT)
+    raise ValueError(f"Invalid {name}: expected YYYY-MM-DD or YYYY-MM-DD HH:MM:SS")
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | tuple | None:
+    """Parse a single-range 'bytes=' Range header into (start, end) inclusive.
+
+    Returns None to ignore the header (malformed or multi-range: send the
+    whole file) and () if the range cannot be satisfied (416).
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if first == "":
+            # Suffix range: the last N bytes
+            suffix = int(last)
+            if suffix <= 0:
+                return ()
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return ()
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+class ResponseCache:
+    """Encoded API responses keyed by route and query string.
+
+    An entry is valid while the database's data generation (bumped by the
+    service on every write) is unchanged and it is younger than the TTL.
+    Shared by all worker threads.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_ENTRIES, ttl: float = RESPONSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'not_modified': 0,
+            'compute_seconds': 0.0,
+            'compute_seconds_saved': 0.0,
+        }
+
+    def get(self, key: str, generation: int) -> dict | None:
+        """Return the current entry (body, etag, variants) for key, if any."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['generation'] != generation or time.monotonic() - entry['stored'] > self.ttl:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            self.stats['compute_seconds_saved'] += entry['compute_seconds']
+            return entry
+
+    def put(self, key: str, generation: int, body: bytes, compute_seconds: float,
+            headers: dict | None = None) -> dict:
+        """Store an encoded response, compressed once for all later hits."""
+        entry = {
+            'generation': generation,
+            'stored': time.monotonic(),
+            'body': body,
+            'headers': headers or {},
+            'variants': compress(body, level=6, use_brotli=False),
+            'etag': f'"{generation}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"',
+            'compute_seconds': compute_seconds,
+        }
+        with self._lock:
+            self.stats['compute_seconds'] += compute_seconds
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def record_not_modified(self):
+        with self._lock:
+            self.stats['not_modified'] += 1
+
+    def report(self) -> dict:
+        """Counters for /api/metrics."""
+        with self._lock:
+            s = dict(self.stats)
+            entries = len(self._entries)
+        lookups = s['hits'] + s['misses']
+        return {
+            **s,
+            'entries': entries,
+            'hit_ratio': round(s['hits'] / lookups, 3) if lookups else 0.0,
+            'compute_seconds': round(s['compute_seconds'], 3),
+            'compute_seconds_saved': round(s['compute_seconds_saved'], 3),
+        }
+
+
+RESPONSE_CACHE = ResponseCache()
+
+
+class BoundedThreadingHTTPServer(ThreadingHTTPServer):
+    """HTTP server that handles requests on a fixed-size worker pool.
+
+    A slow audio download or heavy query no longer blocks other dashboard
+    clients, while the worker count (and so the number of open database
+    connections) stays bounded on a Raspberry Pi.
+    """
+
+    daemon_threads = True
+    # Default backlog of 5 makes concurrent dashboards wait on SYN retries
+    request_queue_size = 64
+
+    def __init__(self, server_address, handler_class, workers: int = DEFAULT_WORKERS,
+                 stream: EventStream | None = None):
+        # Created first: a failed bind calls server_close() from the base __init__
+        self.workers = workers
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="viewer")
+        self.stream = stream
+        super().__init__(server_address, handler_class)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        # Event stream sockets now belong to the broadcaster, not this worker
+        if self.stream is None or not self.stream.owns(request):
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        if self.stream is not None:
+            self.stream.stop()
 
 
 class VocalizationHandler(BaseHTTPRequestHandler):
@@ -31,22 +257,67 @@ class VocalizationHandler(BaseHTTPRequestHandler):
 
     # Class variables set by main()
     data_dir = DEFAULT_DATA_DIR
+    assets = None
+    audio_index = None
     birdnet_dir = None
     models_dir = None
+    spectrograms = None
+
+    def get_db(self) -> sqlite3.Connection | None:
+        """Return this worker thread's read-only connection to vocalization.db.
+
+        Connections are opened once per worker and reused across requests.
+        Returns None while the service has not created the database yet.
+        """
+        db_path = self.data_dir / "vocalization.db"
+        conn = getattr(_thread_local, "conn", None)
+        if conn is not None and getattr(_thread_local, "db_path", None) == db_path:
+            return conn
+
+        if not db_path.exists():
+            return None
+
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        conn.execute("PRAGMA query_only = ON")
+        _thread_local.conn = conn
+        _thread_local.db_path = db_path
+        return conn
 
     def do_GET(self):
         parsed = urlparse(self.path)
 
         if parsed.path == "/" or parsed.path == "/index.html":
-            self.send_html_page()
+            self.send_asset(self.assets.index)
+        elif parsed.path.startswith(STATIC_PREFIX):
+            asset = self.assets.get(parsed.path)
+            if asset is None:
+                self.send_error(404, "Not Found")
+            else:
+                self.send_asset(asset)
         elif parsed.path == "/api/vocalizations":
-            self.send_vocalizations(parsed.query)
+            self.send_cached_body(parsed, lambda: self.get_vocalizations(parsed.query))
         elif parsed.path == "/api/stats":
-            self.send_stats()
+            self.send_cached_json(parsed, self.get_stats)
         elif parsed.path == "/api/charts":
-            self.send_charts()
+            self.send_cached_json(parsed, self.get_charts)
         elif parsed.path == "/api/behavior":
-            self.send_behavior_insights(parsed.query)
+            self.send_cached_json(parsed, lambda: self.get_behavior_insights(parsed.query))
+        elif parsed.path == "/api/peaks":
+            self.send_cached_json(parsed, lambda: self.get_peaks(parsed.query))
+        elif parsed.path == "/api/species/search":
+            self.send_cached_json(parsed, lambda: self.get_species_search(parsed.query))
+        elif parsed.path == "/api/export":
+            self.send_export(parsed.query)
+        elif parsed.path == "/api/stream":
+            self.send_stream(parsed.query)
+        elif parsed.path == "/api/metrics":
+            stream = self.server.stream
+            self.send_json({
+                "response_cache": RESPONSE_CACHE.report(),
+                "event_stream": stream.report() if stream is not None else None,
+            })
+        elif parsed.path == "/api/spectrogram":
+            self.send_spectrogram(parsed.query)
         elif parsed.path == "/api/audio":
             self.send_audio(parsed.query)
         elif parsed.path == "/api/update/check":
@@ -64,987 +335,30 @@ class VocalizationHandler(BaseHTTPRequestHandler):
         else:
             self.send_error(404, "Not Found")
 
-    def send_html_page(self):
-        """Send the main HTML page."""
-        html = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>BirdNET Vocalization Viewer</title>
-    <style>
-        :root {
-            --bg-primary: #1a1a2e;
-            --bg-secondary: #16213e;
-            --bg-tertiary: #0f3460;
-            --text-primary: #eee;
-            --text-secondary: #888;
-            --accent: #4ecca3;
-            --accent-hover: #3db892;
-            --warning: #f9ed69;
-            --danger: #f38181;
-        }
-        [data-theme="light"] {
-            --bg-primary: #f5f5f5;
-            --bg-secondary: #ffffff;
-            --bg-tertiary: #e8e8e8;
-            --text-primary: #333;
-            --text-secondary: #666;
-            --accent: #2d9a78;
-            --accent-hover: #238565;
-        }
-        * { box-sizing: border-box; margin: 0; padding: 0; }
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: var(--bg-primary);
-            color: var(--text-primary);
-            min-height: 100vh;
-            padding: 20px;
-            transition: background 0.3s, color 0.3s;
-        }
-        .container { max-width: 1400px; margin: 0 auto; }
-        .header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 20px;
-            flex-wrap: wrap;
-            gap: 15px;
-        }
-        .header-left { display: flex; align-items: center; gap: 15px; }
-        h1 { color: var(--accent); }
-        .header-right { display: flex; align-items: center; gap: 15px; }
-        .theme-toggle {
-            background: var(--bg-secondary);
-            border: none;
-            padding: 8px 12px;
-            border-radius: 20px;
-            cursor: pointer;
-            font-size: 1.2em;
-            transition: background 0.3s;
-        }
-        .theme-toggle:hover { background: var(--bg-tertiary); }
-        .update-indicator { display: flex; align-items: center; gap: 10px; }
-        .update-dot {
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            background: #666;
-        }
-        .update-dot.available {
-            background: var(--warning);
-            animation: pulse 2s infinite;
-        }
-        .update-dot.checking {
-            background: var(--accent);
-            animation: pulse 0.5s infinite;
-        }
-        @keyframes pulse {
-            0%, 100% { opacity: 1; }
-            50% { opacity: 0.5; }
-        }
-        .update-btn {
-            background: var(--warning);
-            color: #1a1a2e;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 5px;
-            cursor: pointer;
-            font-weight: bold;
-            display: none;
-        }
-        .update-btn:hover { opacity: 0.9; }
-        .update-btn.visible { display: inline-block; }
-        .version-info { font-size: 0.8em; color: var(--text-secondary); }
-
-        /* Stats cards */
-        .stats {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(140px, 1fr));
-            gap: 15px;
-            margin-bottom: 20px;
-        }
-        .stat-card {
-            background: var(--bg-secondary);
-            padding: 20px;
-            border-radius: 10px;
-            text-align: center;
-            transition: background 0.3s;
-        }
-        .stat-card h3 { color: var(--accent); font-size: 2em; }
-        .stat-card p { color: var(--text-secondary); margin-top: 5px; }
-        .stat-card.coverage { border: 2px solid var(--accent); }
-        .stat-card.coverage h3 { font-size: 1.5em; }
-
-        /* Charts section */
-        .charts-section {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
-            gap: 20px;
-            margin-bottom: 20px;
-        }
-        .chart-card {
-            background: var(--bg-secondary);
-            padding: 20px;
-            border-radius: 10px;
-        }
-        .chart-card h3 {
-            color: var(--accent);
-            margin-bottom: 15px;
-            font-size: 1em;
-        }
-        .chart-container { position: relative; height: 200px; }
-
-        /* Filters */
-        .filters {
-            background: var(--bg-secondary);
-            padding: 15px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            display: flex;
-            gap: 15px;
-            flex-wrap: wrap;
-            align-items: center;
-        }
-        .filters select, .filters input {
-            padding: 10px;
-            border-radius: 5px;
-            border: none;
-            background: var(--bg-primary);
-            color: var(--text-primary);
-        }
-        .refresh-btn {
-            background: var(--accent);
-            color: #1a1a2e;
-            border: none;
-            padding: 10px 20px;
-            border-radius: 5px;
-            cursor: pointer;
-            font-weight: bold;
-        }
-        .refresh-btn:hover { background: var(--accent-hover); }
-
-        /* Table */
-        table {
-            width: 100%;
-            border-collapse: collapse;
-            background: var(--bg-secondary);
-            border-radius: 10px;
-            overflow: hidden;
-        }
-        th, td {
-            padding: 15px;
-            text-align: left;
-            border-bottom: 1px solid var(--bg-primary);
-        }
-        th { background: var(--bg-tertiary); color: var(--accent); }
-        tr:hover { background: var(--bg-primary); }
-        tr.clickable { cursor: pointer; }
-        .type-song { color: var(--accent); }
-        .type-call { color: var(--warning); }
-        .type-alarm { color: var(--danger); }
-        .confidence {
-            background: var(--bg-tertiary);
-            border-radius: 20px;
-            padding: 5px 12px;
-            font-size: 0.9em;
-        }
-        .play-btn {
-            background: var(--accent);
-            color: #1a1a2e;
-            border: none;
-            padding: 5px 10px;
-            border-radius: 5px;
-            cursor: pointer;
-            font-size: 0.8em;
-        }
-        .play-btn:hover { background: var(--accent-hover); }
-        .play-btn:disabled { background: var(--text-secondary); cursor: not-allowed; }
-        .empty { text-align: center; padding: 50px; color: var(--text-secondary); }
-        .feedback-btns { display: flex; gap: 5px; }
-        .feedback-btn {
-            background: var(--bg-tertiary);
-            border: none;
-            padding: 5px 10px;
-            border-radius: 5px;
-            cursor: pointer;
-            font-size: 1em;
-            transition: all 0.2s;
-        }
-        .feedback-btn:hover { transform: scale(1.1); }
-        .feedback-btn.correct { background: var(--accent); }
-        .feedback-btn.incorrect { background: var(--danger); }
-        .feedback-btn.selected { opacity: 1; transform: scale(1.2); }
-        .feedback-btn.faded { opacity: 0.3; }
-
-        /* Tabs */
-        .tabs {
-            display: flex;
-            gap: 5px;
-            margin-bottom: 20px;
-            border-bottom: 2px solid var(--bg-tertiary);
-            padding-bottom: 10px;
-        }
-        .tab-btn {
-            background: var(--bg-secondary);
-            border: none;
-            padding: 10px 20px;
-            border-radius: 5px 5px 0 0;
-            cursor: pointer;
-            color: var(--text-secondary);
-            font-weight: bold;
-            transition: all 0.3s;
-        }
-        .tab-btn:hover { background: var(--bg-tertiary); }
-        .tab-btn.active {
-            background: var(--accent);
-            color: #1a1a2e;
-        }
-        .tab-content { display: none; }
-        .tab-content.active { display: block; }
-
-        /* Behavior Insights */
-        .insights-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 20px;
-            margin-bottom: 20px;
-        }
-        .insight-card {
-            background: var(--bg-secondary);
-            padding: 20px;
-            border-radius: 10px;
-        }
-        .insight-card h3 {
-            color: var(--accent);
-            margin-bottom: 15px;
-            font-size: 1em;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }
-        .trend-badge {
-            display: inline-flex;
-            align-items: center;
-            gap: 5px;
-            padding: 5px 10px;
-            border-radius: 15px;
-            font-size: 0.85em;
-            font-weight: bold;
-        }
-        .trend-badge.up { background: rgba(78, 204, 163, 0.2); color: var(--accent); }
-        .trend-badge.down { background: rgba(243, 129, 129, 0.2); color: var(--danger); }
-        .trend-badge.neutral { background: var(--bg-tertiary); color: var(--text-secondary); }
-
-        .alert-list { list-style: none; }
-        .alert-item {
-            padding: 10px;
-            margin-bottom: 8px;
-            border-radius: 5px;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }
-        .alert-item.warning { background: rgba(249, 237, 105, 0.2); border-left: 3px solid var(--warning); }
-        .alert-item.info { background: rgba(78, 204, 163, 0.1); border-left: 3px solid var(--accent); }
-        .alert-icon { font-size: 1.2em; }
-
-        .species-bar {
-            display: flex;
-            height: 20px;
-            border-radius: 10px;
-            overflow: hidden;
-            margin: 5px 0;
-        }
-        .species-bar-segment {
-            transition: width 0.3s;
-        }
-        .species-bar-segment.song { background: var(--accent); }
-        .species-bar-segment.call { background: var(--warning); }
-        .species-bar-segment.alarm { background: var(--danger); }
-        .species-row {
-            margin-bottom: 15px;
-        }
-        .species-row-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 5px;
-        }
-        .species-row-name { font-weight: bold; }
-        .species-row-total { color: var(--text-secondary); font-size: 0.9em; }
-        .species-legend {
-            display: flex;
-            gap: 15px;
-            font-size: 0.8em;
-            color: var(--text-secondary);
-            margin-top: 5px;
-        }
-        .legend-item { display: flex; align-items: center; gap: 5px; }
-        .legend-dot {
-            width: 10px;
-            height: 10px;
-            border-radius: 50%;
-        }
-        .legend-dot.song { background: var(--accent); }
-        .legend-dot.call { background: var(--warning); }
-        .legend-dot.alarm { background: var(--danger); }
-
-        /* Audio player */
-        .audio-player {
-            display: none;
-            position: fixed;
-            bottom: 20px;
-            left: 50%;
-            transform: translateX(-50%);
-            background: var(--bg-secondary);
-            padding: 15px 25px;
-            border-radius: 10px;
-            box-shadow: 0 4px 20px rgba(0,0,0,0.3);
-            z-index: 100;
-            align-items: center;
-            gap: 15px;
-        }
-        .audio-player.visible { display: flex; }
-        .audio-player .species-name { color: var(--accent); font-weight: bold; }
-        .audio-player audio { height: 30px; }
-        .audio-player .close-btn {
-            background: none;
-            border: none;
-            color: var(--text-secondary);
-            cursor: pointer;
-            font-size: 1.2em;
-        }
-
-        /* Modal */
-        .update-modal {
-            display: none;
-            position: fixed;
-            top: 0; left: 0;
-            width: 100%; height: 100%;
-            background: rgba(0,0,0,0.8);
-            justify-content: center;
-            align-items: center;
-            z-index: 1000;
-        }
-        .update-modal.visible { display: flex; }
-        .update-modal-content {
-            background: var(--bg-secondary);
-            padding: 30px;
-            border-radius: 10px;
-            max-width: 500px;
-            text-align: center;
-        }
-        .update-modal h2 { color: var(--accent); margin-bottom: 15px; }
-        .update-modal p { margin-bottom: 20px; color: var(--text-secondary); }
-        .update-modal pre {
-            background: var(--bg-primary);
-            padding: 15px;
-            border-radius: 5px;
-            text-align: left;
-            font-size: 0.9em;
-            max-height: 200px;
-            overflow-y: auto;
-            margin-bottom: 20px;
-        }
-        .modal-buttons { display: flex; gap: 10px; justify-content: center; }
-        .modal-btn {
-            padding: 10px 20px;
-            border-radius: 5px;
-            border: none;
-            cursor: pointer;
-            font-weight: bold;
-        }
-        .modal-btn.primary { background: var(--accent); color: #1a1a2e; }
-        .modal-btn.secondary { background: var(--text-secondary); color: #eee; }
-
-        @media (max-width: 600px) {
-            .filters { flex-direction: column; }
-            th, td { padding: 10px; font-size: 0.9em; }
-            .header { flex-direction: column; }
-            .charts-section { grid-template-columns: 1fr; }
-            .chart-card { min-width: 0; }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <div class="header-left">
-                <h1>BirdNET Vocalization</h1>
-            </div>
-            <div class="header-right">
-                <button class="theme-toggle" id="theme-toggle" onclick="toggleTheme()" title="Toggle theme">🌙</button>
-                <div class="update-indicator">
-                    <span class="version-info" id="version-info"></span>
-                    <div class="update-dot" id="update-dot" title="Checking for updates..."></div>
-                    <button class="update-btn" id="update-btn" onclick="showUpdateModal()">Update Available</button>
-                </div>
-            </div>
-        </div>
-
-        <div class="stats" id="stats">
-            <div class="stat-card"><h3>-</h3><p>Total</p></div>
-            <div class="stat-card"><h3>-</h3><p>Songs</p></div>
-            <div class="stat-card"><h3>-</h3><p>Calls</p></div>
-            <div class="stat-card"><h3>-</h3><p>Alarms</p></div>
-            <div class="stat-card coverage"><h3>-</h3><p>Model Coverage</p></div>
-        </div>
-
-        <div class="tabs">
-            <button class="tab-btn active" onclick="switchTab('overview')">Overview</button>
-            <button class="tab-btn" onclick="switchTab('behavior')">Behavior Insights</button>
-        </div>
-
-        <div id="tab-overview" class="tab-content active">
-        <div class="charts-section">
-            <div class="chart-card">
-                <h3>Vocalizations Over Time (Last 7 Days)</h3>
-                <div class="chart-container">
-                    <canvas id="timeChart"></canvas>
-                </div>
-            </div>
-            <div class="chart-card">
-                <h3>Top 10 Species</h3>
-                <div class="chart-container">
-                    <canvas id="speciesChart"></canvas>
-                </div>
-            </div>
-        </div>
-
-        <div class="filters">
-            <select id="filter-type">
-                <option value="">All types</option>
-                <option value="song">Song</option>
-                <option value="call">Call</option>
-                <option value="alarm">Alarm</option>
-            </select>
-            <input type="text" id="filter-species" placeholder="Filter species...">
-            <button class="refresh-btn" onclick="loadData()">Refresh</button>
-        </div>
-
-        <table>
-            <thead>
-                <tr>
-                    <th>Time</th>
-                    <th>Species</th>
-                    <th>Type</th>
-                    <th>Confidence</th>
-                    <th>Audio</th>
-                    <th>Feedback</th>
-                </tr>
-            </thead>
-            <tbody id="results"></tbody>
-        </table>
-        </div>
-
-        <div id="tab-behavior" class="tab-content">
-            <div class="insights-grid">
-                <div class="insight-card">
-                    <h3>Weekly Trends</h3>
-                    <div id="trends-container">Loading...</div>
-                </div>
-                <div class="insight-card">
-                    <h3>Alerts</h3>
-                    <ul class="alert-list" id="alerts-container">Loading...</ul>
-                </div>
-            </div>
-
-            <div class="insights-grid">
-                <div class="insight-card" style="grid-column: span 2;">
-                    <h3>Activity by Hour (Last 7 Days)</h3>
-                    <div class="chart-container" style="height: 200px;">
-                        <canvas id="hourlyChart"></canvas>
-                    </div>
-                </div>
-            </div>
-
-            <div class="insight-card">
-                <h3>Species Behavior Breakdown (Last 30 Days)</h3>
-                <div class="species-legend">
-                    <span class="legend-item"><span class="legend-dot song"></span> Song</span>
-                    <span class="legend-item"><span class="legend-dot call"></span> Call</span>
-                    <span class="legend-item"><span class="legend-dot alarm"></span> Alarm</span>
-                </div>
-                <div id="species-breakdown" style="margin-top: 15px;">Loading...</div>
-            </div>
-        </div>
-    </div>
-
-    <div class="audio-player" id="audio-player">
-        <span class="species-name" id="player-species"></span>
-        <audio id="audio-element" controls></audio>
-        <button class="close-btn" onclick="closePlayer()">×</button>
-    </div>
-
-    <div class="update-modal" id="update-modal">
-        <div class="update-modal-content">
-            <h2>Update Available</h2>
-            <p id="update-message">A new version is available.</p>
-            <pre id="update-details"></pre>
-            <div class="modal-buttons">
-                <button class="modal-btn secondary" onclick="hideUpdateModal()">Later</button>
-                <button class="modal-btn primary" id="apply-update-btn" onclick="applyUpdate()">Update Now</button>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        // All code in global scope for onclick handlers
-        var updateInfo = null;
-        var timeChart = null;
-        var speciesChart = null;
-        var hourlyChart = null;
-        var initialized = false;
-        var behaviorLoaded = false;
-
-        // Tab switching
-        function switchTab(tabName) {
-            // Update tab buttons
-            document.querySelectorAll('.tab-btn').forEach(btn => {
-                btn.classList.toggle('active', btn.textContent.toLowerCase().includes(tabName));
-            });
-            // Update tab content
-            document.querySelectorAll('.tab-content').forEach(content => {
-                content.classList.toggle('active', content.id === 'tab-' + tabName);
-            });
-            // Load behavior data on first switch
-            if (tabName === 'behavior' && !behaviorLoaded) {
-                loadBehaviorData();
-                behaviorLoaded = true;
-            }
-        }
-
-        // Behavior Insights
-        async function loadBehaviorData() {
-            try {
-                const res = await fetch('/api/behavior');
-                const data = await res.json();
-                renderTrends(data.trends);
-                renderAlerts(data.alerts);
-                renderSpeciesBreakdown(data.species_breakdown);
-                renderHourlyChart(data.hourly_patterns);
-            } catch (e) {
-                console.error('Behavior data error:', e);
-            }
-        }
-
-        function renderTrends(trends) {
-            const container = document.getElementById('trends-container');
-            if (!trends || trends.length === 0) {
-                container.innerHTML = '<p style="color: var(--text-secondary)">Not enough data yet</p>';
-                return;
-            }
-            container.innerHTML = trends.map(t => {
-                const arrow = t.change_pct > 0 ? '↑' : (t.change_pct < 0 ? '↓' : '→');
-                const cls = t.change_pct > 0 ? 'up' : (t.change_pct < 0 ? 'down' : 'neutral');
-                return `
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                        <span class="type-${t.type}" style="text-transform: capitalize; font-weight: bold;">${t.type}</span>
-                        <span class="trend-badge ${cls}">${arrow} ${Math.abs(t.change_pct)}% (${t.this_week} vs ${t.last_week})</span>
-                    </div>
-                `;
-            }).join('');
-        }
-
-        function renderAlerts(alerts) {
-            const container = document.getElementById('alerts-container');
-            if (!alerts || alerts.length === 0) {
-                container.innerHTML = '<li style="color: var(--text-secondary); padding: 10px;">No alerts - all normal</li>';
-                return;
-            }
-            container.innerHTML = alerts.map(a => `
-                <li class="alert-item ${a.severity}">
-                    <span class="alert-icon">${a.type === 'alarm_spike' ? '⚠️' : 'ℹ️'}</span>
-                    <span>${a.message}</span>
-                </li>
-            `).join('');
-        }
-
-        function renderSpeciesBreakdown(species) {
-            const container = document.getElementById('species-breakdown');
-            if (!species || species.length === 0) {
-                container.innerHTML = '<p style="color: var(--text-secondary)">Not enough data yet</p>';
-                return;
-            }
-            container.innerHTML = species.map(s => `
-                <div class="species-row">
-                    <div class="species-row-header">
-                        <span class="species-row-name">${s.species}</span>
-                        <span class="species-row-total">${s.total} total</span>
-                    </div>
-                    <div class="species-bar">
-                        <div class="species-bar-segment song" style="width: ${s.song_pct}%"></div>
-                        <div class="species-bar-segment call" style="width: ${s.call_pct}%"></div>
-                        <div class="species-bar-segment alarm" style="width: ${s.alarm_pct}%"></div>
-                    </div>
-                </div>
-            `).join('');
-        }
-
-        function renderHourlyChart(data) {
-            if (!data || !data.labels) return;
-            const colors = getChartColors();
-            const ctx = document.getElementById('hourlyChart').getContext('2d');
-            if (hourlyChart) hourlyChart.destroy();
-            hourlyChart = new Chart(ctx, {
-                type: 'line',
-                data: {
-                    labels: data.labels,
-                    datasets: [
-                        { label: 'Song', data: data.song, borderColor: colors.song, backgroundColor: 'transparent', tension: 0.3 },
-                        { label: 'Call', data: data.call, borderColor: colors.call, backgroundColor: 'transparent', tension: 0.3 },
-                        { label: 'Alarm', data: data.alarm, borderColor: colors.alarm, backgroundColor: 'transparent', tension: 0.3 }
-                    ]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    plugins: { legend: { labels: { color: colors.text } } },
-                    scales: {
-                        x: { ticks: { color: colors.text }, grid: { color: colors.grid } },
-                        y: { ticks: { color: colors.text }, grid: { color: colors.grid }, beginAtZero: true }
-                    }
-                }
-            });
-        }
-
-        // Theme management - must be global for onclick
-        function toggleTheme() {
-            const body = document.body;
-            const btn = document.getElementById('theme-toggle');
-            if (body.dataset.theme === 'light') {
-                body.dataset.theme = 'dark';
-                btn.textContent = '🌙';
-                localStorage.setItem('theme', 'dark');
-            } else {
-                body.dataset.theme = 'light';
-                btn.textContent = '☀️';
-                localStorage.setItem('theme', 'light');
-            }
-            updateChartColors();
-        }
-
-        function initTheme() {
-            const saved = localStorage.getItem('theme') || 'dark';
-            document.body.dataset.theme = saved;
-            document.getElementById('theme-toggle').textContent = saved === 'light' ? '☀️' : '🌙';
-        }
-
-        function getChartColors() {
-            const isDark = document.body.dataset.theme !== 'light';
-            return {
-                text: isDark ? '#eee' : '#333',
-                grid: isDark ? 'rgba(255,255,255,0.1)' : 'rgba(0,0,0,0.1)',
-                song: '#4ecca3',
-                call: '#f9ed69',
-                alarm: '#f38181'
-            };
-        }
-
-        function updateChartColors() {
-            const colors = getChartColors();
-            if (timeChart) {
-                timeChart.options.scales.x.ticks.color = colors.text;
-                timeChart.options.scales.y.ticks.color = colors.text;
-                timeChart.options.scales.x.grid.color = colors.grid;
-                timeChart.options.scales.y.grid.color = colors.grid;
-                timeChart.update();
-            }
-            if (speciesChart) {
-                speciesChart.options.scales.x.ticks.color = colors.text;
-                speciesChart.options.scales.y.ticks.color = colors.text;
-                speciesChart.options.scales.x.grid.color = colors.grid;
-                speciesChart.options.scales.y.grid.color = colors.grid;
-                speciesChart.update();
-            }
-            if (hourlyChart) {
-                hourlyChart.options.scales.x.ticks.color = colors.text;
-                hourlyChart.options.scales.y.ticks.color = colors.text;
-                hourlyChart.options.scales.x.grid.color = colors.grid;
-                hourlyChart.options.scales.y.grid.color = colors.grid;
-                hourlyChart.options.plugins.legend.labels.color = colors.text;
-                hourlyChart.update();
-            }
-        }
-
-        // Update check
-        async function checkUpdate() {
-            const dot = document.getElementById('update-dot');
-            const btn = document.getElementById('update-btn');
-            const versionInfo = document.getElementById('version-info');
-
-            dot.className = 'update-dot checking';
-            try {
-                const res = await fetch('/api/update/check');
-                const data = await res.json();
-                updateInfo = data;
-                versionInfo.textContent = 'v' + data.local_commit.substring(0, 7);
-                if (data.update_available) {
-                    dot.className = 'update-dot available';
-                    dot.title = 'Update available!';
-                    btn.classList.add('visible');
-                } else {
-                    dot.className = 'update-dot';
-                    dot.style.background = '#4ecca3';
-                    dot.title = 'Up to date';
-                    btn.classList.remove('visible');
-                }
-            } catch (e) {
-                dot.className = 'update-dot';
-                dot.style.background = '#f38181';
-                dot.title = 'Could not check for updates';
-            }
-        }
-
-        function showUpdateModal() {
-            if (!updateInfo) return;
-            document.getElementById('update-message').textContent =
-                `New version available: ${updateInfo.remote_commit.substring(0, 7)}`;
-            document.getElementById('update-details').textContent =
-                updateInfo.commit_message || 'No commit message';
-            document.getElementById('update-modal').classList.add('visible');
-        }
-
-        function hideUpdateModal() {
-            document.getElementById('update-modal').classList.remove('visible');
-        }
-
-        async function applyUpdate() {
-            const btn = document.getElementById('apply-update-btn');
-            const details = document.getElementById('update-details');
-            btn.disabled = true;
-            btn.textContent = 'Updating...';
-            details.textContent = 'Pulling latest changes...';
-            try {
-                const res = await fetch('/api/update/apply', { method: 'POST' });
-                const data = await res.json();
-                if (data.success) {
-                    details.textContent = data.output + '\\n\\nReloading...';
-                    setTimeout(() => window.location.reload(), 3000);
-                } else {
-                    details.textContent = 'Failed: ' + data.error;
-                    btn.disabled = false;
-                    btn.textContent = 'Retry';
-                }
-            } catch (e) {
-                details.textContent = 'Error: ' + e.message;
-                btn.disabled = false;
-                btn.textContent = 'Retry';
-            }
-        }
-
-        // Stats and coverage
-        async function loadStats() {
-            try {
-                const res = await fetch('/api/stats');
-                const stats = await res.json();
-                const coverage = stats.coverage || { covered: 0, total: 0, percent: 0 };
-                document.getElementById('stats').innerHTML = `
-                    <div class="stat-card"><h3>${stats.total}</h3><p>Total</p></div>
-                    <div class="stat-card"><h3>${stats.song || 0}</h3><p>Songs</p></div>
-                    <div class="stat-card"><h3>${stats.call || 0}</h3><p>Calls</p></div>
-                    <div class="stat-card"><h3>${stats.alarm || 0}</h3><p>Alarms</p></div>
-                    <div class="stat-card coverage"><h3>${coverage.covered}/${coverage.total} (${coverage.percent}%)</h3><p>Model Coverage</p></div>
-                `;
-            } catch (e) {
-                console.error('Stats error:', e);
-            }
-        }
-
-        // Charts
-        async function loadCharts() {
-            try {
-                const res = await fetch('/api/charts');
-                const data = await res.json();
-                const colors = getChartColors();
-
-                // Time chart
-                const timeCtx = document.getElementById('timeChart').getContext('2d');
-                if (timeChart) timeChart.destroy();
-                timeChart = new Chart(timeCtx, {
-                    type: 'bar',
-                    data: {
-                        labels: data.daily.labels,
-                        datasets: [
-                            { label: 'Song', data: data.daily.song, backgroundColor: colors.song },
-                            { label: 'Call', data: data.daily.call, backgroundColor: colors.call },
-                            { label: 'Alarm', data: data.daily.alarm, backgroundColor: colors.alarm }
-                        ]
-                    },
-                    options: {
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        plugins: { legend: { labels: { color: colors.text } } },
-                        scales: {
-                            x: { stacked: true, ticks: { color: colors.text }, grid: { color: colors.grid } },
-                            y: { stacked: true, ticks: { color: colors.text }, grid: { color: colors.grid } }
-                        }
-                    }
-                });
-
-                // Species chart
-                const speciesCtx = document.getElementById('speciesChart').getContext('2d');
-                if (speciesChart) speciesChart.destroy();
-                speciesChart = new Chart(speciesCtx, {
-                    type: 'bar',
-                    data: {
-                        labels: data.top_species.labels,
-                        datasets: [{
-                            label: 'Count',
-                            data: data.top_species.values,
-                            backgroundColor: colors.song
-                        }]
-                    },
-                    options: {
-                        indexAxis: 'y',
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        plugins: { legend: { display: false } },
-                        scales: {
-                            x: { ticks: { color: colors.text }, grid: { color: colors.grid } },
-                            y: { ticks: { color: colors.text }, grid: { display: false } }
-                        }
-                    }
-                });
-            } catch (e) { console.error('Charts error:', e); }
-        }
-
-        // Data table
-        async function loadData() {
-            const type = document.getElementById('filter-type').value;
-            const species = document.getElementById('filter-species').value;
-            let url = '/api/vocalizations?limit=100';
-            if (type) url += '&type=' + type;
-            if (species) url += '&species=' + encodeURIComponent(species);
-
-            try {
-                const res = await fetch(url);
-                const data = await res.json();
-                const tbody = document.getElementById('results');
-
-                if (data.length === 0) {
-                    tbody.innerHTML = '<tr><td colspan="6" class="empty">No vocalizations yet. Waiting for BirdNET-Pi detections...</td></tr>';
-                    return;
-                }
-
-                tbody.innerHTML = data.map(row => `
-                    <tr class="clickable">
-                        <td>${new Date(row.classified_at).toLocaleString()}</td>
-                        <td>${row.common_name}</td>
-                        <td class="type-${row.vocalization_type}">${(row.vocalization_type_display || row.vocalization_type).toUpperCase()}</td>
-                        <td><span class="confidence">${Math.round(row.confidence * 100)}%</span></td>
-                        <td><button class="play-btn" onclick="playAudio('${row.file_name}', '${row.common_name}')" ${row.file_name ? '' : 'disabled'}>▶ Play</button></td>
-                        <td class="feedback-btns" id="feedback-${row.id}">
-                            <button class="feedback-btn" onclick="sendFeedback(${row.id}, true, this)" title="Correct">👍</button>
-                            <button class="feedback-btn" onclick="sendFeedback(${row.id}, false, this)" title="Incorrect">👎</button>
-                        </td>
-                    </tr>
-                `).join('');
-            } catch (e) {
-                document.getElementById('results').innerHTML = '<tr><td colspan="6" class="empty">Error loading data</td></tr>';
-            }
-        }
-
-        // Feedback
-        async function sendFeedback(id, correct, btn) {
-            try {
-                const res = await fetch('/api/feedback', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ id: id, correct: correct })
-                });
-                const data = await res.json();
-                if (data.success) {
-                    // Update button appearance
-                    const container = document.getElementById('feedback-' + id);
-                    const btns = container.querySelectorAll('.feedback-btn');
-                    btns.forEach(b => {
-                        b.classList.remove('selected', 'faded');
-                        if (b === btn) {
-                            b.classList.add('selected');
-                            b.classList.add(correct ? 'correct' : 'incorrect');
-                        } else {
-                            b.classList.add('faded');
-                        }
-                    });
-                }
-            } catch (e) {
-                console.error('Feedback error:', e);
-            }
-        }
-
-        // Audio player
-        function playAudio(filename, species) {
-            if (!filename) return;
-            const player = document.getElementById('audio-player');
-            const audio = document.getElementById('audio-element');
-            const speciesName = document.getElementById('player-species');
-
-            audio.src = '/api/audio?file=' + encodeURIComponent(filename);
-            speciesName.textContent = species;
-            player.classList.add('visible');
-            audio.play().catch(e => console.log('Playback error:', e));
-        }
-
-        function closePlayer() {
-            const player = document.getElementById('audio-player');
-            const audio = document.getElementById('audio-element');
-            audio.pause();
-            player.classList.remove('visible');
-        }
-
-        // Initialize after page load
-        function init() {
-            if (initialized) return;
-            initialized = true;
-
-            try {
-                // Event listeners
-                document.getElementById('filter-type').addEventListener('change', loadData);
-                document.getElementById('filter-species').addEventListener('input', loadData);
-
-                initTheme();
-                checkUpdate();
-                loadStats();
-                loadData();
-
-                // Chart.js loads asynchronously after init
-                // Charts will be loaded when Chart.js script completes
-
-                // Periodic refresh
-                setInterval(loadData, 30000);
-                setInterval(loadStats, 60000);
-                setInterval(checkUpdate, 300000);
-            } catch (e) {
-                console.error('Init error:', e);
-            }
-        }
+    def send_asset(self, asset):
+        """Send a static asset, precompressed when the client accepts it."""
+        if asset.etag in (self.headers.get("If-None-Match") or ""):
+            self.send_response(304)
+            self.send_header("ETag", asset.etag)
+            self.send_header("Cache-Control", asset.cache_control)
+            self.end_headers()
+            return
 
-        // Initialize when DOM is ready
-        document.addEventListener('DOMContentLoaded', init);
-        if (document.readyState !== 'loading') init();
-    </script>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js"></script>
-    <script>
-        if (typeof Chart !== 'undefined' && typeof loadCharts === 'function') {
-            loadCharts();
-            setInterval(loadCharts, 60000);
-        }
-    </script>
-</body>
-</html>"""
+        body, encoding = asset.negotiate(self.headers.get("Accept-Encoding"))
         self.send_response(200)
-        self.send_header("Content-Type", "text/html")
-        self.send_header("Content-Length", len(html))
-        self.send_header("Cache-Control", "no-cache, no-store, must-revalidate")
-        self.send_header("Pragma", "no-cache")
-        self.send_header("Expires", "0")
+        self.send_header("Content-Type", asset.content_type)
+        self.send_header("Content-Length", len(body))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if asset.variants:
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("ETag", asset.etag)
+        self.send_header("Cache-Control", asset.cache_control)
         # Headers for Edge Local Network Access compatibility
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Private-Network", "true")
         self.end_headers()
-        self.wfile.write(html.encode())
+        self.wfile.write(body)
 
     def check_update(self):
         """Check if an update is available."""
@@ -1159,6 +473,7 @@ class VocalizationHandler(BaseHTTPRequestHandler):
                 INSERT INTO feedback (vocalization_id, is_correct, correct_type)
                 VALUES (?, ?, ?)
             """, (vocalization_id, is_correct, correct_type))
+            database.bump_generation(cursor)
 
             conn.commit()
             conn.close()
@@ -1167,70 +482,278 @@ class VocalizationHandler(BaseHTTPRequestHandler):
         except Exception as e:
             self.send_json({"success": False, "error": str(e)})
 
-    def send_vocalizations(self, query_string):
-        """Send vocalizations as JSON."""
-        params = parse_qs(query_string)
-        limit = int(params.get("limit", [100])[0])
-        voc_type = params.get("type", [None])[0]
-        species = params.get("species", [None])[0]
+    def species_names(self, conn: sqlite3.Connection, text: str) -> list[str]:
+        """Common names of the species whose common or scientific name contains text."""
+        return sorted({m["common_name"] for m in species.search(conn, text, species.MAX_SEARCH_LIMIT)})
+
+    def vocalization_filters(self, conn: sqlite3.Connection, params: dict) -> tuple[list, list] | None:
+        """WHERE clauses and arguments for the vocalization filter parameters.
+
+        Returns None if nothing can match (no species matches the search).
+        Raises ValueError on invalid parameters.
+        """
+        where, args = [], []
+        if params.get("type"):
+            where.append("vocalization_type = ?")
+            args.append(params["type"])
+        for column, exact, prefix in (("common_name", "common", "common_prefix"),
+                                      ("scientific_name", "scientific", "scientific_prefix")):
+            if params.get(exact):
+                where.append(f"{column} = ? COLLATE NOCASE")
+                args.append(params[exact])
+            if params.get(prefix):
+                # LIKE 'x%' on a NOCASE-indexed column is an index range scan
+                where.append(f"{column} LIKE ? ESCAPE '\\'")
+                args.append(escape_like(params[prefix]) + "%")
+        if params.get("species"):
+            names = self.species_names(conn, params["species"])
+            if not names:
+                return None
+            where.append(f"common_name COLLATE NOCASE IN ({', '.join('?' * len(names))})")
+            args.extend(names)
+        if params.get("since"):
+            where.append("detected_at >= ?")
+            args.append(parse_timestamp(params["since"], "since"))
+        if params.get("until"):
+            where.append("detected_at < ?")
+            args.append(parse_timestamp(params["until"], "until", end_of_day=True))
+        if params.get("min_confidence"):
+            where.append("confidence >= ?")
+            args.append(float(params["min_confidence"]))
+        return where, args
+
+    def get_vocalizations(self, query_string) -> tuple[bytes, dict]:
+        """One page of /api/vocalizations, newest detection first, as encoded JSON.
+
+        Keyset pagination on (detected_at, id): pass the X-Next-Cursor
+        response header back as ?cursor= for the next page. Filters:
+        type, common / common_prefix, scientific / scientific_prefix
+        (case-insensitive), species (substring of either name, through
+        the species search index),
+        since / until (UTC timestamps, until exclusive; a bare date covers
+        the whole day) and min_confidence. Raises ValueError on invalid parameters.
+        """
+        params = {key: values[0] for key, values in parse_qs(query_string).items()}
+        limit = min(max(int(params.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+
+        conn = self.get_db()
+        if conn is None:
+            return b"[]", {}
+
+        names = None
+        if params.get("species"):
+            names = self.species_names(conn, params["species"])
+            if not names:
+                return b"[]", {}
+            params = {key: value for key, value in params.items() if key != "species"}
+        filters = self.vocalization_filters(conn, params)
+        if filters is None:
+            return b"[]", {}
+        where, args = filters
+        if params.get("cursor"):
+            where.append("(detected_at, id) < (?, ?)")
+            args.extend(decode_cursor(params["cursor"]))
+
+        order = " ORDER BY detected_at DESC, id DESC LIMIT ?"
+        query = f"SELECT {database.select_columns(VOCALIZATION_COLUMNS)} FROM vocalizations"
+        if names:
+            # One keyset search per species on its (common_name NOCASE, detected_at)
+            # index, then the newest of those: a rare species never walks the
+            # whole detected_at index looking for its rows
+            branches = []
+            branch_args = []
+            for name in names:
+                conditions = " AND ".join(["common_name = ? COLLATE NOCASE", *where])
+                branches.append(f"SELECT id FROM (SELECT id FROM vocalizations WHERE {conditions}{order})")
+                branch_args.extend([name, *args, limit])
+            query += f" WHERE id IN ({' UNION ALL '.join(branches)})"
+            args = branch_args
+        elif where:
+            query += " WHERE " + " AND ".join(where)
+        query += order
+        args.append(limit)
 
-        db_path = self.data_dir / "vocalization.db"
-        if not db_path.exists():
-            self.send_json([])
+        # Encode row by row instead of building a list of dicts first
+        parts = []
+        last = None
+        for row in conn.execute(query, args):
+            parts.append(json.dumps(dict(zip(VOCALIZATION_COLUMNS, row))))
+            last = row
+        body = ("[" + ", ".join(parts) + "]").encode()
+
+        headers = {}
+        if len(parts) == limit:
+            headers["X-Next-Cursor"] = encode_cursor(last[-1], last[0])
+        return body, headers
+
+    def send_export(self, query_string):
+        """Stream the full (filtered) vocalization history for /api/export.
+
+        format=csv|ndjson|parquet, the /api/vocalizations filters, and
+        gzip=1 for a .gz download (CSV and NDJSON are also gzipped in
+        transit when the client accepts it). Oldest detection first:
+        archived days (retention.py) merged with the raw table by
+        (detected_at, id), both read as of one snapshot. Rows go from
+        the database cursor to the socket in batches, so memory use does
+        not grow with the size of the export.
+        """
+        params = {key: values[0] for key, values in parse_qs(query_string).items()}
+        fmt = params.get("format", "csv")
+        if fmt not in export.FORMATS:
+            self.send_error(400, f"format must be one of: {', '.join(export.FORMATS)}")
             return
+        if fmt == "parquet" and not export.parquet_available():
+            self.send_error(501, "Parquet export needs the optional pyarrow package")
+            return
+        conn = self.get_db()
+        if conn is None:
+            self.send_error(404, "Not Found")
+            return
+        try:
+            filters = self.vocalization_filters(conn, params)
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+        # No matching species: still a valid (empty) export
+        where, args = filters if filters is not None else (["0"], [])
+
+        select = database.select_columns(VOCALIZATION_COLUMNS)
+        query = f"SELECT {select} FROM vocalizations"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY detected_at, id"
+        detected_at, row_id = VOCALIZATION_COLUMNS.index("detected_at"), VOCALIZATION_COLUMNS.index("id")
+
+        if not EXPORT_SLOTS.acquire(blocking=False):
+            self.send_error(503, "Too many exports in progress")
+            return
+        try:
+            content_type, extension = export.FORMATS[fmt]
+            gzip_file = params.get("gzip") in ("1", "true") and fmt != "parquet"
+            gzip_transfer = (not gzip_file and fmt != "parquet"
+                             and choose_encoding(self.headers.get("Accept-Encoding"), {"gzip"}) == "gzip")
+            filename = f"vocalizations-{datetime.now():%Y%m%d}{extension}" + (".gz" if gzip_file else "")
+            chunked = self.request_version == "HTTP/1.1"
+            if chunked:
+                # Chunked transfer needs an HTTP/1.1 status line (the server default is 1.0)
+                self.protocol_version = "HTTP/1.1"
 
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        query = "SELECT * FROM vocalizations WHERE 1=1"
-        args = []
-
-        if voc_type:
-            query += " AND vocalization_type = ?"
-            args.append(voc_type)
-        if species:
-            query += " AND common_name LIKE ?"
-            args.append(f"%{species}%")
-
-        query += " ORDER BY classified_at DESC LIMIT ?"
-        args.append(limit)
-
-        cursor.execute(query, args)
-        rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/gzip" if gzip_file else content_type)
+            self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+            if gzip_transfer:
+                self.send_header("Content-Encoding", "gzip")
+                self.send_header("Vary", "Accept-Encoding")
+            if chunked:
+                self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            # A client that stops reading must not hold this worker forever
+            self.connection.settimeout(EXPORT_SEND_TIMEOUT)
+
+            out = export.ChunkedWriter(self.wfile, chunked)
+            if gzip_file or gzip_transfer:
+                out = export.GzipWriter(out)
+            # One read snapshot for the archive cutoff and the live rows: days archived
+            # during the export are read from the live table, not from their new files
+            conn.execute("BEGIN")
+            try:
+                archived = retention.iter_archive(
+                    self.data_dir / retention.ARCHIVE_DIR, select, where, args, VOCALIZATION_COLUMNS,
+                    since=params.get("since", "").strip() or None, until=params.get("until", "").strip() or None,
+                    before=retention.archived_before(conn)
+                )
+                cursor = conn.execute(query, args)
+                try:
+                    writer = export.open_writer(fmt, out, VOCALIZATION_COLUMNS, EXPORT_COLUMN_TYPES)
+                    # Late results of archived days are still raw: merge instead of appending
+                    for batch in export.merge_batches(
+                        [archived, export.iter_batches(cursor)], key=lambda row: (row[detected_at] or "", row[row_id])
+                    ):
+                        writer.write_rows(batch)
+                    writer.close()
+                except OSError:
+                    pass  # client went away (broken pipe, reset or send timeout)
+                finally:
+                    cursor.close()
+                    archived.close()
+            finally:
+                conn.rollback()
+        finally:
+            EXPORT_SLOTS.release()
+
+    def get_peaks(self, query_string) -> dict:
+        """Waveform previews of up to MAX_PAGE_SIZE vocalizations (/api/peaks?ids=1,2,3).
+
+        Each preview is base64 of PEAK_BUCKETS interleaved (min, max) int8
+        pairs over the first SEGMENT_DURATION seconds of the clip, computed
+        by the service from the decode it classified. Ids without a
+        preview are left out.
+        """
+        params = parse_qs(query_string)
+        try:
+            ids = [int(i) for i in params.get("ids", [""])[0].split(",") if i.strip()]
+        except ValueError:
+            raise ValueError("ids must be comma-separated vocalization ids")
+        if len(ids) > MAX_PAGE_SIZE:
+            raise ValueError(f"At most {MAX_PAGE_SIZE} ids per request")
+
+        result = {"buckets": PEAK_BUCKETS, "seconds": SEGMENT_DURATION, "peaks": {}}
+        conn = self.get_db()
+        if conn is None or not ids:
+            return result
+        rows = conn.execute(
+            f"SELECT id, peaks FROM vocalizations WHERE id IN ({', '.join('?' * len(ids))}) AND peaks IS NOT NULL",
+            ids
+        )
+        result["peaks"] = {str(row_id): base64.b64encode(peaks).decode() for row_id, peaks in rows}
+        return result
+
+    def get_species_search(self, query_string) -> list[dict]:
+        """Species name autocomplete for /api/species/search?q=...&limit=10."""
+        params = parse_qs(query_string)
+        query = params.get("q", [""])[0]
+        limit = int(params.get("limit", [species.DEFAULT_SEARCH_LIMIT])[0])
 
-        self.send_json(rows)
+        conn = self.get_db()
+        if conn is None:
+            return []
+        try:
+            return species.search(conn, query, limit)
+        except sqlite3.OperationalError:
+            return []  # database not migrated yet
 
-    def send_stats(self):
-        """Send statistics as JSON including model coverage."""
-        db_path = self.data_dir / "vocalization.db"
-        if not db_path.exists():
-            self.send_json({"total": 0, "coverage": {"covered": 0, "total": 0, "percent": 0}})
-            return
+    def get_stats(self) -> dict:
+        """Statistics including model coverage for /api/stats."""
+        conn = self.get_db()
+        if conn is None:
+            return {"total": 0, "coverage": {"covered": 0, "total": 0, "percent": 0}}
 
-        conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
 
-        cursor.execute("SELECT COUNT(*) FROM vocalizations")
-        total = cursor.fetchone()[0]
-
+        # All-time counts come from the rollup maintained by the service
         cursor.execute("""
-            SELECT vocalization_type, COUNT(*) as count
-            FROM vocalizations
+            SELECT vocalization_type, SUM(count) as count
+            FROM rollup_totals
             GROUP BY vocalization_type
         """)
         by_type = {row[0]: row[1] for row in cursor.fetchall()}
-
-        # Get unique species from vocalizations
-        cursor.execute("SELECT COUNT(DISTINCT common_name) FROM vocalizations")
-        species_with_models = cursor.fetchone()[0]
-        conn.close()
-
-        # Count available models
-        model_count = 0
-        if self.models_dir and self.models_dir.exists():
-            model_count = len(list(self.models_dir.glob("*.pt")))
+        total = sum(by_type.values())
+
+        # Species with results: counter kept by triggers on rollup_totals
+        species_with_models = rollups.species_count(conn)
+
+        # Installed models: counted by the service from its model manifest
+        model_count = database.read_state(conn, 'model_count')
+        if model_count is None:
+            # Service too old to publish it: its manifest, else list the directory
+            manifest = model_manifest.load(self.data_dir / model_manifest.MANIFEST_FILE)
+            if manifest:
+                model_count = len(manifest["models"])
+            elif self.models_dir and self.models_dir.is_dir():
+                model_count = len(model_manifest.scan(self.models_dir))
+        model_count = int(model_count or 0)
 
         # Calculate coverage (species classified vs models available)
         coverage = {
@@ -1239,26 +762,24 @@ class VocalizationHandler(BaseHTTPRequestHandler):
             "percent": round(species_with_models / model_count * 100) if model_count > 0 else 0
         }
 
-        self.send_json({"total": total, "coverage": coverage, **by_type})
+        return {"total": total, "coverage": coverage, **by_type}
 
-    def send_charts(self):
-        """Send chart data for visualizations."""
-        db_path = self.data_dir / "vocalization.db"
-        if not db_path.exists():
-            self.send_json({
+    def get_charts(self) -> dict:
+        """Chart data for visualizations (/api/charts)."""
+        conn = self.get_db()
+        if conn is None:
+            return {
                 "daily": {"labels": [], "song": [], "call": [], "alarm": []},
                 "top_species": {"labels": [], "values": []}
-            })
-            return
+            }
 
-        conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
 
         # Daily counts for last 7 days
         cursor.execute("""
-            SELECT date(classified_at) as day, vocalization_type, COUNT(*) as count
-            FROM vocalizations
-            WHERE classified_at >= date('now', '-7 days')
+            SELECT day, vocalization_type, SUM(count) as count
+            FROM rollup_daily
+            WHERE day >= date('now', '-7 days')
             GROUP BY day, vocalization_type
             ORDER BY day
         """)
@@ -1285,16 +806,15 @@ class VocalizationHandler(BaseHTTPRequestHandler):
 
         # Top 10 species
         cursor.execute("""
-            SELECT common_name, COUNT(*) as count
-            FROM vocalizations
+            SELECT common_name, SUM(count) as total
+            FROM rollup_totals
             GROUP BY common_name
-            ORDER BY count DESC
+            ORDER BY total DESC
             LIMIT 10
         """)
         top_species = cursor.fetchall()
-        conn.close()
 
-        self.send_json({
+        return {
             "daily": {
                 "labels": labels,
                 "song": song_data,
@@ -1305,191 +825,40 @@ class VocalizationHandler(BaseHTTPRequestHandler):
                 "labels": [row[0] for row in top_species],
                 "values": [row[1] for row in top_species]
             }
-        })
-
-    def send_behavior_insights(self, query_string):
-        """Send behavior insights data for species analysis."""
-        params = parse_qs(query_string)
-        species_filter = params.get("species", [None])[0]
-
-        db_path = self.data_dir / "vocalization.db"
-        if not db_path.exists():
-            self.send_json({
-                "species_breakdown": [],
-                "hourly_patterns": [],
-                "alerts": [],
-                "trends": []
-            })
-            return
-
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # 1. Species breakdown: % song/call/alarm per species (last 30 days)
-        cursor.execute("""
-            SELECT common_name, vocalization_type, COUNT(*) as count
-            FROM vocalizations
-            WHERE classified_at >= date('now', '-30 days')
-            GROUP BY common_name, vocalization_type
-            ORDER BY common_name
-        """)
-        species_data = {}
-        for row in cursor.fetchall():
-            name, vtype, count = row
-            if name not in species_data:
-                species_data[name] = {"song": 0, "call": 0, "alarm": 0, "total": 0}
-            species_data[name][vtype] = count
-            species_data[name]["total"] += count
-
-        species_breakdown = []
-        for name, data in sorted(species_data.items(), key=lambda x: x[1]["total"], reverse=True)[:15]:
-            total = data["total"]
-            if total > 0:
-                species_breakdown.append({
-                    "species": name,
-                    "total": total,
-                    "song_pct": round(data["song"] / total * 100),
-                    "call_pct": round(data["call"] / total * 100),
-                    "alarm_pct": round(data["alarm"] / total * 100)
-                })
-
-        # 2. Hourly patterns (when are birds most active?)
-        cursor.execute("""
-            SELECT strftime('%H', classified_at) as hour, vocalization_type, COUNT(*) as count
-            FROM vocalizations
-            WHERE classified_at >= date('now', '-7 days')
-            GROUP BY hour, vocalization_type
-            ORDER BY hour
-        """)
-        hourly_data = {str(h).zfill(2): {"song": 0, "call": 0, "alarm": 0} for h in range(24)}
-        for row in cursor.fetchall():
-            hour, vtype, count = row
-            if hour in hourly_data:
-                hourly_data[hour][vtype] = count
-
-        hourly_patterns = {
-            "labels": [f"{h}:00" for h in range(24)],
-            "song": [hourly_data[str(h).zfill(2)]["song"] for h in range(24)],
-            "call": [hourly_data[str(h).zfill(2)]["call"] for h in range(24)],
-            "alarm": [hourly_data[str(h).zfill(2)]["alarm"] for h in range(24)]
         }
 
-        # 3. Anomaly detection: unusual alarm activity
-        alerts = []
-
-        # Check for alarm spikes in last 24h vs previous week average
-        cursor.execute("""
-            SELECT common_name, COUNT(*) as recent_count
-            FROM vocalizations
-            WHERE vocalization_type = 'alarm'
-            AND classified_at >= datetime('now', '-24 hours')
-            GROUP BY common_name
-        """)
-        recent_alarms = {row[0]: row[1] for row in cursor.fetchall()}
-
-        cursor.execute("""
-            SELECT common_name, COUNT(*) * 1.0 / 7 as avg_daily
-            FROM vocalizations
-            WHERE vocalization_type = 'alarm'
-            AND classified_at >= date('now', '-8 days')
-            AND classified_at < date('now', '-1 days')
-            GROUP BY common_name
-        """)
-        avg_alarms = {row[0]: row[1] for row in cursor.fetchall()}
-
-        for species, count in recent_alarms.items():
-            avg = avg_alarms.get(species, 0)
-            if avg > 0 and count > avg * 3:  # 3x more than usual
-                increase_pct = round((count - avg) / avg * 100)
-                alerts.append({
-                    "type": "alarm_spike",
-                    "species": species,
-                    "message": f"{species}: {count} alarm calls in 24h (+{increase_pct}% vs normal)",
-                    "severity": "warning" if count > avg * 5 else "info"
-                })
-
-        # Check for unusual silence (species normally active but not heard)
-        cursor.execute("""
-            SELECT common_name, COUNT(*) as count
-            FROM vocalizations
-            WHERE classified_at >= date('now', '-8 days')
-            AND classified_at < date('now', '-1 days')
-            GROUP BY common_name
-            HAVING count >= 7
-        """)
-        normally_active = {row[0]: row[1] / 7 for row in cursor.fetchall()}
-
-        cursor.execute("""
-            SELECT common_name, COUNT(*) as count
-            FROM vocalizations
-            WHERE classified_at >= date('now', '-1 days')
-            GROUP BY common_name
-        """)
-        today_active = {row[0]: row[1] for row in cursor.fetchall()}
-
-        for species, avg in normally_active.items():
-            today = today_active.get(species, 0)
-            if avg >= 3 and today == 0:  # Usually 3+/day, but 0 today
-                alerts.append({
-                    "type": "silence",
-                    "species": species,
-                    "message": f"{species}: No detections today (usually ~{round(avg)}/day)",
-                    "severity": "info"
-                })
-
-        # 4. Trends: weekly comparison
-        cursor.execute("""
-            SELECT vocalization_type, COUNT(*) as count
-            FROM vocalizations
-            WHERE classified_at >= date('now', '-7 days')
-            GROUP BY vocalization_type
-        """)
-        this_week = {row[0]: row[1] for row in cursor.fetchall()}
-
-        cursor.execute("""
-            SELECT vocalization_type, COUNT(*) as count
-            FROM vocalizations
-            WHERE classified_at >= date('now', '-14 days')
-            AND classified_at < date('now', '-7 days')
-            GROUP BY vocalization_type
-        """)
-        last_week = {row[0]: row[1] for row in cursor.fetchall()}
-
-        trends = []
-        for vtype in ["song", "call", "alarm"]:
-            this_count = this_week.get(vtype, 0)
-            last_count = last_week.get(vtype, 0)
-            if last_count > 0:
-                change = round((this_count - last_count) / last_count * 100)
-                trends.append({
-                    "type": vtype,
-                    "this_week": this_count,
-                    "last_week": last_count,
-                    "change_pct": change
-                })
-            else:
-                trends.append({
-                    "type": vtype,
-                    "this_week": this_count,
-                    "last_week": 0,
-                    "change_pct": 0
-                })
-
-        conn.close()
-
-        self.send_json({
-            "species_breakdown": species_breakdown,
-            "hourly_patterns": hourly_patterns,
-            "alerts": alerts,
-            "trends": trends
-        })
+    def get_behavior_insights(self, query_string) -> dict:
+        """Behavior insights data for species analysis (/api/behavior)."""
+        conn = self.get_db()
+        if conn is None:
+            return insights.empty_result()
+        return insights.compute(conn)
+
+    def find_audio(self, filename: str) -> Path | None:
+        """Locate a clip: the path the service stored, else the filename index."""
+        roots = self.audio_index.roots
+        conn = self.get_db()
+        if conn is not None:
+            try:
+                row = conn.execute(
+                    "SELECT audio_path FROM vocalizations WHERE file_name = ? AND audio_path IS NOT NULL LIMIT 1",
+                    (filename,)
+                ).fetchone()
+            except sqlite3.OperationalError:
+                row = None  # database not migrated yet
+            if row:
+                path = Path(row[0])
+                if path.is_file() and is_within(path, roots + [self.birdnet_dir]):
+                    return path
+
+        return self.audio_index.resolve(Path(filename).name)
 
     def send_audio(self, query_string):
-        """Send audio file from BirdNET-Pi extracted folder."""
+        """Stream an audio clip, with Range, ETag and Last-Modified support."""
         params = parse_qs(query_string)
         filename = params.get("file", [None])[0]
 
-        if not filename or not self.birdnet_dir:
+        if not filename or not self.birdnet_dir or self.audio_index is None:
             self.send_error(404, "File not found")
             return
 
@@ -1498,44 +867,220 @@ class VocalizationHandler(BaseHTTPRequestHandler):
             self.send_error(403, "Forbidden")
             return
 
-        # Search for the file in BirdNET-Pi extracted folder
-        extracted_dir = self.birdnet_dir / "extracted" / "By_Date"
-        audio_path = None
+        audio_path = self.find_audio(filename)
+        if audio_path is None:
+            self.send_error(404, "Audio file not found")
+            return
 
-        # Try direct path first
-        direct_path = self.birdnet_dir / filename
-        if direct_path.exists():
-            audio_path = direct_path
-        else:
-            # Search in extracted directory
-            for f in extracted_dir.rglob(filename):
-                audio_path = f
-                break
+        try:
+            f = open(audio_path, "rb")
+        except OSError:
+            self.send_error(404, "Audio file not found")
+            return
+
+        with f:
+            st = os.fstat(f.fileno())
+            size = st.st_size
+            etag = f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+            last_modified = formatdate(st.st_mtime, usegmt=True)
+
+            if self.not_modified(etag, st.st_mtime):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+                self.end_headers()
+                return
+
+            byte_range = None
+            if_range = self.headers.get("If-Range")
+            if self.headers.get("Range") and (not if_range or if_range in (etag, last_modified)):
+                byte_range = parse_range(self.headers.get("Range"), size)
+                if byte_range == ():
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", 0)
+                    self.end_headers()
+                    return
+
+            start, end = byte_range or (0, size - 1)
+            length = end - start + 1 if size else 0
+            self.send_response(206 if byte_range else 200)
+            self.send_header("Content-Type", AUDIO_TYPES.get(audio_path.suffix.lower(), "application/octet-stream"))
+            self.send_header("Content-Length", length)
+            if byte_range:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            # Extracted clips never change once written
+            self.send_header("Cache-Control", "public, max-age=86400")
+            self.end_headers()
+
+            if length:
+                try:
+                    # os.sendfile where available: no copy through Python
+                    self.connection.sendfile(f, start, length)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # player seeked or closed
+
+    def send_spectrogram(self, query_string):
+        """PNG of the 128x128 mel spectrogram the model saw for a vocalization (?id=).
 
-        if not audio_path or not audio_path.exists():
+        Rendering happens in the renderer's worker pool: until the image is
+        cached the response is 202 with Retry-After, and the client asks again.
+        """
+        params = parse_qs(query_string)
+        try:
+            vocalization_id = int(params.get("id", [""])[0])
+        except ValueError:
+            self.send_error(400, "id must be a vocalization id")
+            return
+        if self.spectrograms is None or self.audio_index is None:
+            self.send_error(404, "Spectrograms not available")
+            return
+        conn = self.get_db()
+        row = conn.execute(
+            "SELECT file_name, tier FROM vocalizations WHERE id = ?", (vocalization_id,)
+        ).fetchone() if conn is not None else None
+        audio_path = self.find_audio(row[0]) if row and row[0] else None
+        if audio_path is None:
+            self.send_error(404, "Audio file not found")
+            return
+
+        try:
+            state, png_path = self.spectrograms.request(audio_path, row[1] or TIER_FULL)
+        except OSError:
             self.send_error(404, "Audio file not found")
             return
+        if state == 'pending':
+            self.send_response(202)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", 0)
+            self.end_headers()
+            return
+        if state == 'failed':
+            self.send_error(422, "Could not decode audio")
+            return
+
+        etag = f'"{png_path.stem}"'  # content-addressed file name
+        if self.not_modified(etag, png_path.stat().st_mtime):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = png_path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", len(body))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "public, max-age=86400")
+        self.end_headers()
+        self.wfile.write(body)
 
-        # Determine content type
-        content_type = "audio/mpeg" if filename.endswith(".mp3") else "audio/wav"
+    def not_modified(self, etag: str, mtime: float) -> bool:
+        """Evaluate If-None-Match / If-Modified-Since against a file."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            return etag in if_none_match or if_none_match.strip() == "*"
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def send_stream(self, query_string):
+        """Open a Server-Sent Events stream of new vocalizations.
+
+        Resumes after the Last-Event-ID header (sent by the browser on
+        reconnect) or ?last_id=; otherwise starts at the newest row.
+        """
+        stream = self.server.stream
+        conn = self.get_db()
+        if stream is None or conn is None:
+            self.send_error(404, "Not Found")
+            return
+        if stream.is_full():
+            self.send_error(503, "Too many event stream clients")
+            return
 
+        last_id = self.headers.get("Last-Event-ID") or parse_qs(query_string).get("last_id", [None])[0]
         try:
-            with open(audio_path, "rb") as f:
-                data = f.read()
-            self.send_response(200)
-            self.send_header("Content-Type", content_type)
-            self.send_header("Content-Length", len(data))
+            last_id = int(last_id)
+        except (TypeError, ValueError):
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM vocalizations").fetchone()[0]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("X-Accel-Buffering", "no")
+        self.end_headers()
+        self.wfile.write(f"retry: {RETRY_MS}\n\n".encode())
+        self.wfile.flush()
+
+        self.close_connection = True
+        stream.add_client(self.connection, last_id)
+
+    def send_cached_json(self, parsed, compute):
+        """Send compute()'s result as JSON, from the response cache when current."""
+        self.send_cached_body(parsed, lambda: (json.dumps(compute()).encode(), {}))
+
+    def send_cached_body(self, parsed, compute):
+        """Send pre-encoded JSON from compute() -> (body, headers), cached per data generation.
+
+        Answers a matching If-None-Match with 304 so polling dashboards
+        skip the body too. A ValueError from compute() is a bad request.
+        """
+        conn = self.get_db()
+        generation = database.read_generation(conn) if conn is not None else None
+
+        key = f"{parsed.path}?{parsed.query}"
+        entry = RESPONSE_CACHE.get(key, generation) if generation is not None else None
+        if entry is None:
+            started = time.perf_counter()
+            try:
+                body, headers = compute()
+            except ValueError as e:
+                self.send_error(400, str(e))
+                return
+            if generation is None:
+                # No database yet (or one the service has not migrated): don't cache
+                self.send_json_body(body, compress(body, level=6, use_brotli=False), headers)
+                return
+            entry = RESPONSE_CACHE.put(key, generation, body, time.perf_counter() - started, headers)
+
+        etag = entry['etag']
+        if etag in (self.headers.get("If-None-Match") or ""):
+            RESPONSE_CACHE.record_not_modified()
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
             self.end_headers()
-            self.wfile.write(data)
-        except Exception as e:
-            self.send_error(500, str(e))
+            return
+
+        self.send_json_body(entry['body'], entry['variants'],
+                            {**entry['headers'], "ETag": etag, "Cache-Control": "no-cache"})
 
     def send_json(self, data):
         """Send JSON response."""
         body = json.dumps(data).encode()
+        self.send_json_body(body, compress(body, level=6, use_brotli=False))
+
+    def send_json_body(self, body: bytes, variants: dict[str, bytes], headers: dict | None = None):
+        """Send encoded JSON, gzipped if the client accepts it."""
+        encoding = choose_encoding(self.headers.get("Accept-Encoding"), variants)
+        if encoding:
+            body = variants[encoding]
         self.send_response(200)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", len(body))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if variants:
+            self.send_header("Vary", "Accept-Encoding")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
         self.wfile.write(body)
 
@@ -1551,24 +1096,40 @@ def main():
     parser.add_argument("--birdnet-dir", type=Path, default=Path("/home/pi/BirdNET-Pi"),
                         help="BirdNET-Pi installation directory (for audio playback)")
     parser.add_argument("--models-dir", type=Path, default=INSTALL_DIR / "models",
-                        help="Models directory (for coverage stats)")
+                        help="Models directory (coverage stats fallback when the service has not published a model count)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Concurrent request workers (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--spectrogram-cache-mb", type=int, default=spectrograms.DEFAULT_CACHE_MB,
+                        help=f"Disk space for cached spectrogram images in MB "
+                             f"(default: {spectrograms.DEFAULT_CACHE_MB})")
     args = parser.parse_args()
 
     VocalizationHandler.data_dir = args.data_dir
     VocalizationHandler.birdnet_dir = args.birdnet_dir
     VocalizationHandler.models_dir = args.models_dir
-
-    server = HTTPServer(("0.0.0.0", args.port), VocalizationHandler)
+    VocalizationHandler.assets = StaticAssets()
+    VocalizationHandler.audio_index = AudioIndex(audio_roots(args.birdnet_dir))
+    VocalizationHandler.spectrograms = spectrograms.SpectrogramRenderer(
+        VocalizationClassifier(args.models_dir), args.data_dir / spectrograms.CACHE_DIR,
+        max_bytes=args.spectrogram_cache_mb * 1_000_000
+    )
+
+    stream = EventStream(args.data_dir, VOCALIZATION_COLUMNS)
+    server = BoundedThreadingHTTPServer(("0.0.0.0", args.port), VocalizationHandler,
+                                        workers=args.workers, stream=stream)
+    stream.start()
     print(f"Vocalization viewer running at http://localhost:{args.port}")
     print(f"Data directory: {args.data_dir}")
     print(f"BirdNET-Pi directory: {args.birdnet_dir}")
     print(f"Models directory: {args.models_dir}")
+    print(f"Workers: {args.workers}")
 
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down...")
         server.shutdown()
+        server.server_close()
 
 
 if __name__ == "__main__":